@@ -1,10 +1,55 @@
+import crypto from 'crypto';
 import Redis from 'ioredis';
 
+/**
+ * Keys per UNLINK/SCAN batch, so no single command holds Redis for long
+ */
+const BATCH_SIZE = 500;
+
+/**
+ * SETEX the entry and add it to every tag set, a sorted set scored by the
+ * entry's expiry (server time, ms). Members that have expired are pruned on
+ * each write, so a set only holds live entries however often its TTL is
+ * extended; the set itself lives at least as long as its newest entry.
+ * KEYS[1] = entry, KEYS[2..] = tag sets; ARGV[1] = ttl, ARGV[2] = value
+ */
+const SET_TAGGED_SCRIPT = `
+local time = redis.call('TIME')
+local now = tonumber(time[1]) * 1000 + math.floor(tonumber(time[2]) / 1000)
+local ttl = tonumber(ARGV[1])
+redis.call('SETEX', KEYS[1], ttl, ARGV[2])
+for i = 2, #KEYS do
+  redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+  redis.call('ZADD', KEYS[i], now + ttl * 1000, KEYS[1])
+  if redis.call('TTL', KEYS[i]) < ttl then
+    redis.call('EXPIRE', KEYS[i], ttl)
+  end
+end
+return 1
+`;
+
+/**
+ * Delete a lock only if it still holds our token
+ * KEYS[1] = lock; ARGV[1] = token
+ */
+const RELEASE_LOCK_SCRIPT = `
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+`;
+
+type ScriptedRedis = Redis & {
+  setTagged(numKeys: number, ...args: (string | number | Buffer)[]): Promise<number>;
+  releaseLock(numKeys: number, key: string, token: string): Promise<number>;
+};
+
 /**
  * Redis client configuration for caching
  */
 class RedisClient {
   private client: Redis | null = null;
+  private subscriber: Redis | null = null;
   private isConnected: boolean = false;
 
   constructor() {
@@ -36,6 +81,9 @@ class RedisClient {
         },
       });
 
+      this.client.defineCommand('setTagged', { lua: SET_TAGGED_SCRIPT });
+      this.client.defineCommand('releaseLock', { lua: RELEASE_LOCK_SCRIPT });
+
       // Connection event handlers
       this.client.on('connect', () => {
         console.log('[Redis] Connected successfully');
@@ -82,6 +130,24 @@ class RedisClient {
     }
   }
 
+  /**
+   * Get a raw (binary) value and its remaining TTL in milliseconds, in one round-trip
+   */
+  async getWithTtl(key: string): Promise<{ value: Buffer; ttlMs: number } | null> {
+    if (!this.client || !this.isConnected) {
+      return null;
+    }
+
+    try {
+      const replies = await this.client.pipeline().getBuffer(key).pttl(key).exec();
+      const value = replies?.[0]?.[1];
+      return Buffer.isBuffer(value) ? { value, ttlMs: replies?.[1]?.[1] as number } : null;
+    } catch (error) {
+      console.error('[Redis] Get error:', error);
+      return null;
+    }
+  }
+
   /**
    * Set a value in cache with TTL (in seconds)
    */
@@ -99,6 +165,22 @@ class RedisClient {
     }
   }
 
+  /**
+   * Increment a counter, returning the new value (null if Redis is unavailable)
+   */
+  async incr(key: string): Promise<number | null> {
+    if (!this.client || !this.isConnected) {
+      return null;
+    }
+
+    try {
+      return await this.client.incr(key);
+    } catch (error) {
+      console.error('[Redis] Incr error:', error);
+      return null;
+    }
+  }
+
   /**
    * Delete a key from cache
    */
@@ -117,7 +199,59 @@ class RedisClient {
   }
 
   /**
-   * Delete all keys matching a pattern
+   * Set a value with TTL (in seconds) and register it under tag sets,
+   * so it can later be dropped with delTags instead of a pattern scan
+   */
+  async setTagged(key: string, value: string | Buffer, ttl: number, tags: string[]): Promise<boolean> {
+    if (!this.client || !this.isConnected) {
+      return false;
+    }
+
+    try {
+      await (this.client as ScriptedRedis).setTagged(1 + tags.length, key, ...tags, ttl, value);
+      return true;
+    } catch (error) {
+      console.error('[Redis] Tagged set error:', error);
+      return false;
+    }
+  }
+
+  /**
+   * Delete every key registered under the given tag sets, and the sets.
+   * Cost is O(tagged keys): members are read and the sets dropped in one
+   * transaction, then the keys are unlinked in pipelined batches.
+   * Returns the number of keys that actually existed.
+   */
+  async delTags(tags: string[]): Promise<number> {
+    if (!this.client || !this.isConnected || tags.length === 0) {
+      return 0;
+    }
+
+    try {
+      const transaction = this.client.multi();
+      for (const tag of tags) {
+        transaction.zrange(tag, 0, -1);
+      }
+      transaction.del(...tags);
+      const replies = (await transaction.exec()) || [];
+
+      const keys = new Set<string>();
+      for (const [error, members] of replies.slice(0, tags.length)) {
+        if (!error) {
+          (members as string[]).forEach((key) => keys.add(key));
+        }
+      }
+      return await this.unlink([...keys]);
+    } catch (error) {
+      console.error('[Redis] Delete tags error:', error);
+      return 0;
+    }
+  }
+
+  /**
+   * Delete all keys matching a pattern.
+   * Walks the keyspace with SCAN rather than KEYS, so Redis keeps serving
+   * other clients; slow on large keyspaces, prefer delTags.
    */
   async delPattern(pattern: string): Promise<number> {
     if (!this.client || !this.isConnected) {
@@ -125,18 +259,112 @@ class RedisClient {
     }
 
     try {
-      const keys = await this.client.keys(pattern);
-      if (keys.length === 0) {
-        return 0;
+      let deleted = 0;
+      const stream = this.client.scanStream({ match: pattern, count: BATCH_SIZE });
+      for await (const keys of stream) {
+        deleted += await this.unlink(keys as string[]);
       }
-      await this.client.del(...keys);
-      return keys.length;
+      return deleted;
     } catch (error) {
       console.error('[Redis] Delete pattern error:', error);
       return 0;
     }
   }
 
+  /**
+   * UNLINK keys in pipelined batches; memory is reclaimed off the main thread
+   */
+  private async unlink(keys: string[]): Promise<number> {
+    if (!this.client || keys.length === 0) {
+      return 0;
+    }
+
+    const pipeline = this.client.pipeline();
+    for (let i = 0; i < keys.length; i += BATCH_SIZE) {
+      pipeline.unlink(...keys.slice(i, i + BATCH_SIZE));
+    }
+    const replies = (await pipeline.exec()) || [];
+    return replies.reduce((total, [error, count]) => total + (error ? 0 : (count as number)), 0);
+  }
+
+  /**
+   * Try to take a short-lived lock (SET NX PX). Returns the token to release
+   * it with, or null when someone else holds it. Fails open: on a Redis
+   * error a token is returned as if the lock had been taken.
+   */
+  async acquireLock(key: string, ttlMs: number): Promise<string | null> {
+    const token = crypto.randomBytes(8).toString('hex');
+    if (!this.client || !this.isConnected) {
+      return token;
+    }
+
+    try {
+      const reply = await this.client.set(key, token, 'PX', ttlMs, 'NX');
+      return reply === 'OK' ? token : null;
+    } catch (error) {
+      console.error('[Redis] Lock error:', error);
+      return token;
+    }
+  }
+
+  /**
+   * Release a lock taken with acquireLock, unless it expired and was re-taken
+   */
+  async releaseLock(key: string, token: string): Promise<boolean> {
+    if (!this.client || !this.isConnected) {
+      return false;
+    }
+
+    try {
+      return (await (this.client as ScriptedRedis).releaseLock(1, key, token)) === 1;
+    } catch (error) {
+      console.error('[Redis] Unlock error:', error);
+      return false;
+    }
+  }
+
+  /**
+   * Publish a message to every subscriber of a channel
+   */
+  async publish(channel: string, message: string): Promise<boolean> {
+    if (!this.client || !this.isConnected) {
+      return false;
+    }
+
+    try {
+      await this.client.publish(channel, message);
+      return true;
+    } catch (error) {
+      console.error('[Redis] Publish error:', error);
+      return false;
+    }
+  }
+
+  /**
+   * Receive the messages of a channel on a dedicated subscriber connection
+   * (a subscribed connection cannot run other commands)
+   */
+  subscribe(channel: string, handler: (message: string) => void): void {
+    if (!this.client) {
+      return;
+    }
+
+    if (!this.subscriber) {
+      this.subscriber = this.client.duplicate();
+      this.subscriber.on('error', (err) => {
+        console.error('[Redis] Subscriber error:', err.message);
+      });
+    }
+    this.subscriber.on('message', (received: string, message: string) => {
+      if (received === channel) {
+        handler(message);
+      }
+    });
+    this.subscriber.subscribe(channel).catch((error) => {
+      console.error('[Redis] Subscribe error:', error);
+    });
+  }
+
   /**
    * Check if Redis is available
    */
@@ -148,6 +376,10 @@ class RedisClient {
    * Close Redis connection
    */
   async disconnect(): Promise<void> {
+    if (this.subscriber) {
+      await this.subscriber.quit();
+      this.subscriber = null;
+    }
     if (this.client) {
       await this.client.quit();
       this.client = null;
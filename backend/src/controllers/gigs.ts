@@ -2,6 +2,7 @@ import { Request, Response } from 'express';
 import Gig from '../models/Gig';
 import Payment from '../models/Payment';
 import { logActivity } from '../utils/activityLogger';
+import { bumpCacheVersion } from '../middleware/cache';
 import { isValidCategory, ALLOWED_CATEGORIES } from '../constants/categories';
 
 // Get all gigs with ranking-based sorting (like Upwork/Fiverr)
@@ -26,10 +27,23 @@ export const getGigs = async (req: Request, res: Response) => {
     }
 
     // Check and clear expired promotions (promotedUntil < now)
-    await Gig.updateMany(
+    const expired = await Gig.updateMany(
       { isPromoted: true, promotedUntil: { $lt: new Date() } },
       { $set: { isPromoted: false, promotedUntil: null } }
     );
+    if (expired.modifiedCount > 0) {
+      await bumpCacheVersion('gigs');
+    }
+
+    // This runs only when the catalogue cache misses, so a cached page must
+    // not outlive the next promotion to expire
+    const nextExpiry = await Gig.findOne({ isPromoted: true, promotedUntil: { $gt: new Date() } })
+      .sort({ promotedUntil: 1 })
+      .select('promotedUntil')
+      .lean();
+    if ((nextExpiry as any)?.promotedUntil) {
+      res.locals.cacheTtl = Math.floor((new Date((nextExpiry as any).promotedUntil).getTime() - Date.now()) / 1000);
+    }
 
     // Default sort: Featured first, then Promoted, then by rankingScore, then by rating
     let sortOption: any = {
@@ -144,6 +158,7 @@ export const createGig = async (req: Request, res: Response) => {
     if (thumbnailUrl) payload.thumbnailUrl = thumbnailUrl;
 
     const gig = await Gig.create(payload);
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
@@ -204,6 +219,7 @@ export const updateGig = async (req: Request, res: Response) => {
       new: true,
       runValidators: true,
     });
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
@@ -249,6 +265,7 @@ export const deleteGig = async (req: Request, res: Response) => {
     }
 
     await gig.deleteOne();
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
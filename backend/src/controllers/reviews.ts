@@ -5,6 +5,7 @@ import Gig from '../models/Gig';
 import Booking from '../models/Booking';
 import User from '../models/User';
 import { logActivity } from '../utils/activityLogger';
+import { bumpCacheVersion } from '../middleware/cache';
 
 const toObjectId = (id: string) => new mongoose.Types.ObjectId(id);
 
@@ -247,6 +248,8 @@ export const createReview = async (req: Request, res: Response) => {
       recomputeGigRatings(String(gig._id)),
       incTeacherRating(String(gig.teacher), ratingNum, 1),
     ]);
+    // The catalogue shows both gig and teacher ratings
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
@@ -299,6 +302,7 @@ export const updateReview = async (req: Request, res: Response) => {
     if (delta !== 0) {
       await incTeacherRating((doc as any).teacher, delta, 0);
     }
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
@@ -382,6 +386,7 @@ export const deleteReview = async (req: Request, res: Response) => {
       recomputeGigRatings(String(doc.gig)),
       incTeacherRating((doc as any).teacher, -((doc as any).rating || 0), -1),
     ]);
+    await bumpCacheVersion('gigs');
 
     try {
       await logActivity({
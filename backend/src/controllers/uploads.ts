@@ -1,6 +1,7 @@
 import { Request, Response } from 'express';
 import cloudinary from '../utils/cloudinary';
 import Gig from '../models/Gig';
+import { bumpCacheVersion } from '../middleware/cache';
 
 export const uploadImage = async (req: Request, res: Response) => {
   try {
@@ -94,6 +95,7 @@ export const deleteGigThumbnail = async (req: Request, res: Response) => {
     (gig as any).thumbnailUrl = undefined;
     (gig as any).thumbnailPublicId = undefined;
     await gig.save();
+    await bumpCacheVersion('gigs');
 
     return res.json({ success: true, message: 'Thumbnail removed', gig });
   } catch (err: any) {
@@ -148,6 +150,7 @@ export const uploadGigThumbnail = async (req: Request, res: Response) => {
     gig.thumbnailUrl = result.secure_url;
     (gig as any).thumbnailPublicId = result.public_id;
     await gig.save();
+    await bumpCacheVersion('gigs');
     if (oldPublicId && oldPublicId !== result.public_id) {
       try {
         await cloudinary.uploader.destroy(oldPublicId, { resource_type: 'image' });
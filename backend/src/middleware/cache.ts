@@ -1,6 +1,300 @@
 import { Request, Response, NextFunction } from 'express';
+import { promisify } from 'util';
+import zlib from 'zlib';
 import { redisClient } from '../config/redis';
 
+const gzip = promisify(zlib.gzip);
+const brotli = promisify(zlib.brotliCompress);
+
+/**
+ * A cached response, serialized and compressed once when it is stored so
+ * that a hit only picks a buffer and writes it
+ */
+export interface EncodedBody {
+  identity: Buffer;
+  gzip: Buffer;
+  br: Buffer;
+}
+
+type Encoding = keyof EncodedBody;
+
+// Redis value layout: version byte, uint32 lengths of identity and gzip,
+// then the three bodies. Entries from before this format start with '{'.
+const FORMAT_VERSION = 1;
+const HEADER_BYTES = 9;
+
+export const pack = (body: EncodedBody): Buffer => {
+  const header = Buffer.alloc(HEADER_BYTES);
+  header.writeUInt8(FORMAT_VERSION, 0);
+  header.writeUInt32BE(body.identity.length, 1);
+  header.writeUInt32BE(body.gzip.length, 5);
+  return Buffer.concat([header, body.identity, body.gzip, body.br]);
+};
+
+export const unpack = (value: Buffer): EncodedBody | null => {
+  if (value.length < HEADER_BYTES || value.readUInt8(0) !== FORMAT_VERSION) {
+    return null;
+  }
+  const gzipStart = HEADER_BYTES + value.readUInt32BE(1);
+  const brStart = gzipStart + value.readUInt32BE(5);
+  return {
+    identity: value.subarray(HEADER_BYTES, gzipStart),
+    gzip: value.subarray(gzipStart, brStart),
+    br: value.subarray(brStart),
+  };
+};
+
+/**
+ * Serialize a response body, marked as cached at fill time, and compress it
+ */
+export const encodeBody = async (body: any): Promise<EncodedBody> => {
+  const identity = Buffer.from(
+    JSON.stringify({ ...body, cached: true, cacheTimestamp: new Date().toISOString() })
+  );
+  const [gzipped, brotlied] = await Promise.all([
+    gzip(identity),
+    brotli(identity, {
+      params: {
+        [zlib.constants.BROTLI_PARAM_QUALITY]: 9,
+        [zlib.constants.BROTLI_PARAM_SIZE_HINT]: identity.length,
+      },
+    }),
+  ]);
+  return { identity, gzip: gzipped, br: brotlied };
+};
+
+/**
+ * Best encoding the client accepts: br, then gzip, else identity
+ */
+export const negotiate = (acceptEncoding: string | undefined): Encoding => {
+  const accepted = new Set<string>();
+  for (const part of (acceptEncoding || '').split(',')) {
+    const [coding, ...params] = part.trim().toLowerCase().split(';');
+    const q = params.find((p) => p.trim().startsWith('q='));
+    if (!q || parseFloat(q.trim().slice(2)) > 0) {
+      accepted.add(coding);
+    }
+  }
+  if (accepted.has('br')) {
+    return 'br';
+  }
+  if (accepted.has('gzip') || accepted.has('*')) {
+    return 'gzip';
+  }
+  return 'identity';
+};
+
+/**
+ * In-process LRU (L1) in front of Redis (L2), bounded by the bytes of the
+ * cached bodies. Each PM2 worker has its own L1; invalidations
+ * are broadcast on INVALIDATION_CHANNEL so every worker drops its copies.
+ */
+export interface L1Entry {
+  body: EncodedBody;
+  bytes: number;
+  staleAt: number;
+  expiresAt: number;
+  tags: string[];
+}
+
+export class LruCache {
+  // Map iteration follows insertion order, so the first key is the LRU one
+  private entries = new Map<string, L1Entry>();
+  private tagIndex = new Map<string, Set<string>>();
+  private totalBytes = 0;
+  private evictions = 0;
+
+  constructor(private maxBytes: number) {}
+
+  get(key: string): L1Entry | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return undefined;
+    }
+    if (entry.expiresAt <= Date.now()) {
+      this.delete(key);
+      return undefined;
+    }
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry;
+  }
+
+  set(key: string, entry: L1Entry): void {
+    this.delete(key);
+    if (entry.bytes > this.maxBytes) {
+      return;
+    }
+    this.entries.set(key, entry);
+    this.totalBytes += entry.bytes;
+    for (const tag of entry.tags) {
+      let keys = this.tagIndex.get(tag);
+      if (!keys) {
+        keys = new Set();
+        this.tagIndex.set(tag, keys);
+      }
+      keys.add(key);
+    }
+    while (this.totalBytes > this.maxBytes) {
+      this.delete(this.entries.keys().next().value as string);
+      this.evictions++;
+    }
+  }
+
+  delete(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) {
+      return false;
+    }
+    this.entries.delete(key);
+    this.totalBytes -= entry.bytes;
+    for (const tag of entry.tags) {
+      const keys = this.tagIndex.get(tag);
+      keys?.delete(key);
+      if (keys?.size === 0) {
+        this.tagIndex.delete(tag);
+      }
+    }
+    return true;
+  }
+
+  deleteTags(tags: string[]): number {
+    let deleted = 0;
+    for (const tag of tags) {
+      for (const key of [...(this.tagIndex.get(tag) || [])]) {
+        deleted += this.delete(key) ? 1 : 0;
+      }
+    }
+    return deleted;
+  }
+
+  stats() {
+    return {
+      entries: this.entries.size,
+      bytes: this.totalBytes,
+      maxBytes: this.maxBytes,
+      evictions: this.evictions,
+    };
+  }
+}
+
+const INVALIDATION_CHANNEL = 'cache:invalidate';
+
+// CACHE_L1_MAX_BYTES=0 disables the in-process tier
+const l1MaxBytes = Number(process.env.CACHE_L1_MAX_BYTES ?? 32 * 1024 * 1024);
+const l1 = l1MaxBytes > 0 ? new LruCache(l1MaxBytes) : null;
+
+// Bumped on every invalidation; a response that was computed while one
+// happened is still written to Redis (whose tags were already dropped) but
+// not to L1, where it could otherwise outlive the broadcast
+let l1Generation = 0;
+
+const counters = {
+  l1: { hits: 0, misses: 0 },
+  l2: { hits: 0, misses: 0 },
+  // Requests that did not run the handler: waited for another request's
+  // fill (coalesced, lockWaits) or got the previous entry (stale)
+  stampede: { coalesced: 0, lockWaits: 0, stale: 0 },
+};
+
+const dropLocal = (tags: string[]): number => {
+  l1Generation++;
+  return l1 ? l1.deleteTags(tags) : 0;
+};
+
+// Versions of public prefixes as last seen by this worker. Bumps arrive over
+// pub/sub; re-reading after VERSION_REFRESH_MS bounds staleness if one is missed.
+const VERSION_REFRESH_MS = 5000;
+const versions = new Map<string, { value: number; readAt: number }>();
+
+// Never goes backwards, e.g. when a bump arrives while Redis is being read
+const setVersion = (prefix: string, value: number): number => {
+  const known = versions.get(prefix);
+  const latest = known ? Math.max(known.value, value) : value;
+  versions.set(prefix, { value: latest, readAt: Date.now() });
+  return latest;
+};
+
+const currentVersion = async (prefix: string): Promise<number> => {
+  const known = versions.get(prefix);
+  if (known && Date.now() - known.readAt < VERSION_REFRESH_MS) {
+    return known.value;
+  }
+  return setVersion(prefix, Number(await redisClient.get(`version:${prefix}`)) || 0);
+};
+
+redisClient.subscribe(INVALIDATION_CHANNEL, (message) => {
+  try {
+    // Our own broadcasts come back too; dropping twice is harmless
+    const { tags, versions: bumped = {} } = JSON.parse(message);
+    for (const [prefix, value] of Object.entries(bumped)) {
+      setVersion(prefix, Number(value));
+    }
+    dropLocal(tags);
+  } catch (error) {
+    console.error('[Cache] Bad invalidation message:', error);
+  }
+});
+
+// Fills in progress in this worker, by cache key; resolve to the stored
+// body, or null when the response turned out not to be cacheable
+const flights = new Map<string, Promise<EncodedBody | null>>();
+
+const LOCK_POLL_MS = 50;
+
+const sleep = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms));
+
+/**
+ * Hit/miss counters per tier and L1 occupancy of this worker
+ */
+export const getCacheStats = () => {
+  const ratio = ({ hits, misses }: { hits: number; misses: number }) =>
+    hits + misses > 0 ? Number((hits / (hits + misses)).toFixed(3)) : 0;
+  return {
+    pid: process.pid,
+    l1: { ...counters.l1, hitRatio: ratio(counters.l1), ...(l1 ? l1.stats() : { disabled: true }) },
+    l2: { ...counters.l2, hitRatio: ratio(counters.l2) },
+    stampede: { ...counters.stampede, inFlight: flights.size },
+  };
+};
+
+export interface PublicCacheOptions {
+  /** Query parameters that make up the key; all others are ignored */
+  params: string[];
+  /** Values that equal a parameter's default are left out of the key */
+  defaults?: Record<string, string>;
+  /**
+   * How the handler reads a parameter (e.g. trimmed and case-insensitive),
+   * so that values it treats alike share an entry
+   */
+  normalize?: Record<string, (value: string) => string>;
+}
+
+/**
+ * Key of a response shared by every visitor: the whitelisted query
+ * parameters in sorted order, plus the prefix's current version. Only
+ * single string values count (the handlers ignore arrays and objects),
+ * integers are written canonically (as Number() reads them) so `page=01`
+ * and `page=1` share an entry, and `normalize` applies per parameter.
+ */
+export const generatePublicCacheKey = (req: Request, prefix: string, options: PublicCacheOptions, version: number): string => {
+  const defaults = options.defaults || {};
+  const normalize = options.normalize || {};
+  const parts: string[] = [];
+  for (const name of [...options.params].sort()) {
+    const raw = req.query[name];
+    if (typeof raw !== 'string') {
+      continue;
+    }
+    const read = normalize[name] ? normalize[name](raw) : raw;
+    const value = /^\s*\d+\s*$/.test(read) ? String(Number(read)) : read;
+    if (value !== '' && value !== defaults[name]) {
+      parts.push(`${name}=${encodeURIComponent(value)}`);
+    }
+  }
+  return `${prefix}:public:v${version}:${parts.join('&')}`;
+};
+
 /**
  * Generate cache key based on request parameters
  */
@@ -12,12 +306,94 @@ const generateCacheKey = (req: Request, prefix: string): string => {
   return `${prefix}:user:${userId}:role:${role}:query:${queryString}`;
 };
 
+/**
+ * Tag set that indexes cache entries of a prefix, optionally narrowed to a
+ * user and role; entries are registered under all three levels. The sets
+ * are sorted by expiry (`tags:`; the unbounded `tag:` sets of earlier
+ * releases are left to expire).
+ */
+const cacheTag = (prefix: string, userId?: string, role?: string): string => {
+  let tag = `tags:${prefix}`;
+  if (userId) {
+    tag += `:user:${userId}`;
+    if (role) {
+      tag += `:role:${role}`;
+    }
+  }
+  return tag;
+};
+
+const entryTags = (req: Request, prefix: string): string[] => {
+  const userId = (req.user as any)?._id?.toString() || 'anonymous';
+  const role = (req.user as any)?.role || 'guest';
+  return [cacheTag(prefix), cacheTag(prefix, userId), cacheTag(prefix, userId, role)];
+};
+
+/**
+ * Entries written before tagging existed, or whose tag sets were evicted,
+ * are only reachable by pattern; CACHE_SCAN_FALLBACK=true also runs a
+ * (non-blocking) SCAN on every invalidation
+ */
+const scanFallback = (): boolean => process.env.CACHE_SCAN_FALLBACK === 'true';
+
+/**
+ * Drop the entries under `tags`, plus the `patterns` when the SCAN fallback
+ * is enabled, and log how many keys went. Redis goes first: if the L1 copies
+ * were dropped before, a request in between could re-promote the old entry
+ * from Redis and keep it after the broadcast.
+ */
+const invalidate = async (tags: string[], patterns: string[]): Promise<number> => {
+  let deletedCount = await redisClient.delTags(tags);
+  if (scanFallback()) {
+    for (const pattern of patterns) {
+      deletedCount += await redisClient.delPattern(pattern);
+    }
+  }
+  dropLocal(tags);
+  if (l1) {
+    await redisClient.publish(INVALIDATION_CHANNEL, JSON.stringify({ tags }));
+  }
+  console.log(`[Cache] Invalidated ${deletedCount} keys for: ${tags.join(', ')}`);
+  return deletedCount;
+};
+
+export interface CacheOptions {
+  /** Let concurrent misses of a key in this worker wait for one fill (default: true) */
+  coalesce?: boolean;
+  /** Redis lock so only one worker fills a key; 0 disables (default: 3000 ms) */
+  lockMs?: number;
+  /** How long a worker without the lock polls Redis for the fill (default: lockMs) */
+  lockWaitMs?: number;
+  /**
+   * Seconds after `ttl` during which the expired entry is still served
+   * while a single request refreshes it (default: 0, off)
+   */
+  staleWhileRevalidate?: number;
+  /**
+   * Share entries between all users (no user in the key). Invalidate with
+   * bumpCacheVersion(prefix) rather than the per-user helpers.
+   */
+  public?: PublicCacheOptions;
+}
+
 /**
  * Cache middleware factory
  * @param prefix - Cache key prefix (e.g., 'bookings', 'gigs')
  * @param ttl - Time to live in seconds (default: 600 = 10 minutes)
+ * @param opts - Stampede protection, see CacheOptions
+ *
+ * A handler whose response goes out of date at a known time sets
+ * `res.locals.cacheTtl` (seconds) to cap that entry's lifetime, stale
+ * window included; 0 or less leaves the response uncached.
  */
-export const cacheMiddleware = (prefix: string, ttl: number = 600) => {
+export const cacheMiddleware = (prefix: string, ttl: number = 600, opts: CacheOptions = {}) => {
+  const coalesce = opts.coalesce ?? true;
+  const lockMs = opts.lockMs ?? 3000;
+  const lockWaitMs = opts.lockWaitMs ?? lockMs;
+  const swrMs = (opts.staleWhileRevalidate ?? 0) * 1000;
+  // Entries live `ttl` fresh plus the stale window; the PTTL tells which part
+  const storeTtl = ttl + (opts.staleWhileRevalidate ?? 0);
+
   return async (req: Request, res: Response, next: NextFunction) => {
     // Skip caching if Redis is not available
     if (!redisClient.isAvailable()) {
@@ -29,36 +405,168 @@ export const cacheMiddleware = (prefix: string, ttl: number = 600) => {
       return next();
     }
 
-    const cacheKey = generateCacheKey(req, prefix);
+    const cacheKey = opts.public
+      ? generatePublicCacheKey(req, prefix, opts.public, await currentVersion(prefix))
+      : generateCacheKey(req, prefix);
+    const tags = opts.public ? [cacheTag(prefix)] : entryTags(req, prefix);
+
+    // No parse, stringify or compression: the stored bytes go out as they are
+    // (compression() leaves responses that already have a Content-Encoding alone)
+    const hit = (body: EncodedBody, tier: string) => {
+      console.log(`[Cache] HIT ${tier} - ${cacheKey}`);
+      const encoding = negotiate(req.headers['accept-encoding']);
+      const bytes = body[encoding];
+      res.setHeader('X-Cache', `HIT-${tier}`);
+      res.setHeader('Content-Type', 'application/json; charset=utf-8');
+      res.vary('Accept-Encoding');
+      if (encoding !== 'identity') {
+        res.setHeader('Content-Encoding', encoding);
+      }
+      res.setHeader('Content-Length', bytes.length);
+      res.status(200).end(bytes);
+    };
+
+    // Entries computed across an invalidation stay out of L1
+    const generation = l1Generation;
+    const promote = (body: EncodedBody, bytes: number, ttlMs: number) => {
+      if (l1 && ttlMs > 0 && generation === l1Generation) {
+        const now = Date.now();
+        l1.set(cacheKey, { body, bytes, staleAt: now + ttlMs - swrMs, expiresAt: now + ttlMs, tags });
+      }
+    };
+
+    // Serve a fresh entry from L1 or L2 if there is one; otherwise return
+    // the entry that is inside its stale window, if any
+    const lookup = async (): Promise<{ served: boolean; stale: EncodedBody | null }> => {
+      let stale: EncodedBody | null = null;
+      if (l1) {
+        const entry = l1.get(cacheKey);
+        if (entry && entry.staleAt > Date.now()) {
+          counters.l1.hits++;
+          hit(entry.body, 'L1');
+          return { served: true, stale: null };
+        }
+        stale = entry ? entry.body : null;
+        counters.l1.misses++;
+      }
+
+      const cached = await redisClient.getWithTtl(cacheKey);
+      const stored = cached && unpack(cached.value);
+      if (cached && stored) {
+        promote(stored, cached.value.length, cached.ttlMs);
+        if (cached.ttlMs > swrMs) {
+          counters.l2.hits++;
+          hit(stored, 'L2');
+          return { served: true, stale: null };
+        }
+        stale = stored;
+      }
+      counters.l2.misses++;
+      return { served: false, stale };
+    };
 
     try {
-      // Try to get cached data
-      const cachedData = await redisClient.get(cacheKey);
-
-      if (cachedData) {
-        // Cache hit - return cached data
-        const data = JSON.parse(cachedData);
-        console.log(`[Cache] HIT - ${cacheKey}`);
-        
-        return res.json({
-          ...data,
-          cached: true,
-          cacheTimestamp: new Date().toISOString(),
-        });
+      const { served, stale } = await lookup();
+      if (served) {
+        return;
+      }
+
+      // Another request in this worker is already filling the key
+      const flight = flights.get(cacheKey);
+      if (coalesce && flight) {
+        if (stale) {
+          counters.stampede.stale++;
+          return hit(stale, 'STALE');
+        }
+        const body = await flight;
+        if (body) {
+          counters.stampede.coalesced++;
+          return hit(body, 'COALESCED');
+        }
+        return next();
+      }
+
+      // This request fills the key; register before any await so that
+      // concurrent requests of this worker find the flight
+      let settle: (body: EncodedBody | null) => void = () => {};
+      let settled = false;
+      const ours = new Promise<EncodedBody | null>((resolve) => (settle = resolve));
+      const lockKey = `lock:${cacheKey}`;
+      let token: string | null = null;
+      const finish = (body: EncodedBody | null) => {
+        if (settled) {
+          return;
+        }
+        settled = true;
+        if (flights.get(cacheKey) === ours) {
+          flights.delete(cacheKey);
+        }
+        settle(body);
+        if (token) {
+          redisClient.releaseLock(lockKey, token);
+        }
+      };
+      if (coalesce) {
+        flights.set(cacheKey, ours);
+      }
+
+      // Waiters are released once the response is over, whether or not it
+      // went through res.json (and if anything below throws)
+      let filling = false;
+      res.on('close', () => {
+        if (!filling) {
+          finish(null);
+        }
+      });
+
+      // Another worker holds the lock: serve stale, or wait for its fill
+      if (lockMs > 0) {
+        token = await redisClient.acquireLock(lockKey, lockMs);
+        if (!token) {
+          if (stale) {
+            finish(null);
+            counters.stampede.stale++;
+            return hit(stale, 'STALE');
+          }
+          for (let waited = 0; waited < lockWaitMs; waited += LOCK_POLL_MS) {
+            await sleep(LOCK_POLL_MS);
+            const cached = await redisClient.getWithTtl(cacheKey);
+            const stored = cached && cached.ttlMs > swrMs && unpack(cached.value);
+            if (cached && stored) {
+              promote(stored, cached.value.length, cached.ttlMs);
+              finish(stored);
+              counters.stampede.lockWaits++;
+              return hit(stored, 'L2');
+            }
+          }
+          // The other worker is slow or gone; fill it ourselves
+        }
       }
 
       // Cache miss - store original json method
       console.log(`[Cache] MISS - ${cacheKey}`);
+      res.setHeader('X-Cache', stale ? 'REVALIDATE' : 'MISS');
       const originalJson = res.json.bind(res);
 
       // Override res.json to cache the response
       res.json = function (body: any) {
         // Only cache successful responses
-        if (res.statusCode >= 200 && res.statusCode < 300) {
-          // Store in cache asynchronously (don't wait)
-          redisClient.set(cacheKey, JSON.stringify(body), ttl).catch((err) => {
-            console.error('[Cache] Failed to store:', err);
-          });
+        const cap = res.locals.cacheTtl;
+        const entryTtl = typeof cap === 'number' ? Math.min(storeTtl, Math.floor(cap)) : storeTtl;
+        if (res.statusCode >= 200 && res.statusCode < 300 && entryTtl > 0) {
+          filling = true;
+          // Encode and store asynchronously, after the response (don't wait)
+          encodeBody(body)
+            .then(async (encoded) => {
+              const value = pack(encoded);
+              promote(encoded, value.length, entryTtl * 1000);
+              await redisClient.setTagged(cacheKey, value, entryTtl, tags);
+              finish(encoded);
+            })
+            .catch((err) => {
+              console.error('[Cache] Failed to store:', err);
+              finish(null);
+            });
         }
 
         // Call original json method
@@ -74,6 +582,33 @@ export const cacheMiddleware = (prefix: string, ttl: number = 600) => {
   };
 };
 
+/**
+ * Invalidate every public entry of a prefix in O(1): new requests use keys
+ * with the next version, old entries are left to expire. Workers learn the
+ * new version over pub/sub and drop their L1 copies.
+ */
+export const bumpCacheVersion = async (prefix: string): Promise<number> => {
+  if (!redisClient.isAvailable()) {
+    return 0;
+  }
+
+  try {
+    const version = await redisClient.incr(`version:${prefix}`);
+    if (version === null) {
+      return 0;
+    }
+    const tags = [cacheTag(prefix)];
+    setVersion(prefix, version);
+    dropLocal(tags);
+    await redisClient.publish(INVALIDATION_CHANNEL, JSON.stringify({ tags, versions: { [prefix]: version } }));
+    console.log(`[Cache] Bumped ${prefix} to version ${version}`);
+    return version;
+  } catch (error) {
+    console.error('[Cache] Version bump error:', error);
+    return 0;
+  }
+};
+
 /**
  * Invalidate cache for a specific prefix and user
  */
@@ -87,18 +622,12 @@ export const invalidateCache = async (
   }
 
   try {
-    // Build pattern to match all cache keys for this user and prefix
+    // Pattern for untagged entries of this user and prefix (SCAN fallback)
     const pattern = role 
       ? `${prefix}:user:${userId}:role:${role}:*`
       : `${prefix}:user:${userId}:*`;
-    
-    const deletedCount = await redisClient.delPattern(pattern);
-    
-    if (deletedCount > 0) {
-      console.log(`[Cache] Invalidated ${deletedCount} keys matching: ${pattern}`);
-    }
-    
-    return deletedCount;
+
+    return await invalidate([cacheTag(prefix, userId, role)], [pattern]);
   } catch (error) {
     console.error('[Cache] Invalidation error:', error);
     return 0;
@@ -114,14 +643,7 @@ export const invalidateAllCache = async (prefix: string): Promise<number> => {
   }
 
   try {
-    const pattern = `${prefix}:*`;
-    const deletedCount = await redisClient.delPattern(pattern);
-    
-    if (deletedCount > 0) {
-      console.log(`[Cache] Invalidated ALL ${deletedCount} keys for prefix: ${prefix}`);
-    }
-    
-    return deletedCount;
+    return await invalidate([cacheTag(prefix)], [`${prefix}:*`]);
   } catch (error) {
     console.error('[Cache] Full invalidation error:', error);
     return 0;
@@ -131,6 +653,7 @@ export const invalidateAllCache = async (prefix: string): Promise<number> => {
 /**
  * Invalidate cache for related entities
  * Example: When a booking is created, invalidate both student and teacher caches
+ * All users' tag sets are dropped in one round of pipelined deletes.
  */
 export const invalidateRelatedCache = async (
   userIds: string[],
@@ -140,12 +663,13 @@ export const invalidateRelatedCache = async (
     return 0;
   }
 
-  let totalDeleted = 0;
-
-  for (const userId of userIds) {
-    const deleted = await invalidateCache(userId, prefix);
-    totalDeleted += deleted;
+  try {
+    return await invalidate(
+      userIds.map((userId) => cacheTag(prefix, userId)),
+      userIds.map((userId) => `${prefix}:user:${userId}:*`)
+    );
+  } catch (error) {
+    console.error('[Cache] Related invalidation error:', error);
+    return 0;
   }
-
-  return totalDeleted;
 };
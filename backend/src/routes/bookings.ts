@@ -18,7 +18,7 @@ router.use(protect);
 
 router
   .route('/')
-  .get(cacheMiddleware('bookings', 600), getBookings)
+  .get(cacheMiddleware('bookings', 600, { staleWhileRevalidate: 60 }), getBookings)
   .post(authorize('student'), validateBookingCreation, createBooking);
 
 // Access a meeting by room id (student or teacher only)
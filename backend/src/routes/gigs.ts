@@ -7,13 +7,26 @@ import {
   deleteGig,
 } from '../controllers/gigs';
 import { protect, authorize } from '../middleware/auth';
+import { cacheMiddleware } from '../middleware/cache';
 import { getGigReviews, getMyReviewForGig, createReview } from '../controllers/reviews';
 
 const router = express.Router();
 
+// The catalogue is the same for every visitor, so it is cached publicly;
+// gig and rating changes bump the 'gigs' version (see bumpCacheVersion)
+const catalogueCache = cacheMiddleware('gigs', 300, {
+  public: {
+    params: ['category', 'sort', 'page', 'limit'],
+    defaults: { page: '1', limit: '50' },
+    // getGigs trims the category and matches it case-insensitively
+    normalize: { category: (value) => value.trim().toLowerCase() },
+  },
+  staleWhileRevalidate: 30,
+});
+
 router
   .route('/')
-  .get(getGigs)
+  .get(catalogueCache, getGigs)
   .post(protect, authorize('teacher'), createGig);
 
 router
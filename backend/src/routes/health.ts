@@ -1,5 +1,6 @@
 import express from 'express';
 import mongoose from 'mongoose';
+import { getCacheStats } from '../middleware/cache';
 
 const router = express.Router();
 
@@ -31,7 +32,9 @@ router.get('/detailed', async (req, res) => {
         external: process.memoryUsage().external
       },
       cpu: process.cpuUsage()
-    }
+    },
+    // Per worker: each PM2 instance answers with its own counters
+    cache: getCacheStats()
   };
 
   try {
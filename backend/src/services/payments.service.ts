@@ -141,8 +141,7 @@ export class PaymentsService {
 
     try {
       if (val_id) {
-        const isLive = (process.env.SSL_IS_LIVE || 'false') === 'true';
-        const base = isLive ? 'https://securepay.sslcommerz.com' : 'https://sandbox.sslcommerz.com';
+        const base = validatorBase();
         const store_id = process.env.SSL_STORE_ID;
         const store_passwd = process.env.SSL_STORE_PASS;
         const url = `${base}/validator/api/validationserverAPI.php?val_id=${encodeURIComponent(val_id)}&store_id=${encodeURIComponent(store_id || '')}&store_passwd=${encodeURIComponent(store_passwd || '')}&format=json`;
@@ -166,4 +165,29 @@ export class PaymentsService {
   }
 }
 
+/**
+ * SSLCommerz validation host. SSL_VALIDATOR_URL points validation at a local
+ * stand-in (see testsprite_tests/harness/ipn_replay.py) and is only honoured
+ * against the sandbox outside production, so it can never approve live payments.
+ * Resolved on first use, which is also the only time the override is logged.
+ */
+let validatorHost: string | undefined;
+
+function validatorBase(): string {
+  if (validatorHost) return validatorHost;
+  const isLive = (process.env.SSL_IS_LIVE || 'false') === 'true';
+  const override = process.env.SSL_VALIDATOR_URL;
+  validatorHost = isLive ? 'https://securepay.sslcommerz.com' : 'https://sandbox.sslcommerz.com';
+  if (override) {
+    if (!isLive && process.env.NODE_ENV !== 'production') {
+      validatorHost = override;
+      logPaymentEvent('validator-override', { base: override });
+      console.warn(`[payments] SSL_VALIDATOR_URL in effect: validating against ${override}`);
+    } else {
+      logPaymentEvent('validator-override-ignored', { isLive, env: process.env.NODE_ENV });
+    }
+  }
+  return validatorHost;
+}
+
 export default new PaymentsService();
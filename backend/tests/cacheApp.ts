@@ -0,0 +1,67 @@
+import express from 'express';
+import request from 'supertest';
+import zlib from 'zlib';
+import { redisClient as fake } from './fakeRedis';
+import { EncodedBody, cacheMiddleware } from '../src/middleware/cache';
+
+export const body = (text: string): EncodedBody => ({
+  identity: Buffer.from(text),
+  gzip: zlib.gzipSync(text),
+  br: zlib.brotliCompressSync(text),
+});
+
+// The fill is written after the response went out
+export const waitFor = async (condition: () => boolean) => {
+  for (let i = 0; i < 100 && !condition(); i++) {
+    await new Promise((resolve) => setTimeout(resolve, 10));
+  }
+  expect(condition()).toBe(true);
+};
+
+export const anonymousKey = (prefix: string) => `${prefix}:user:anonymous:role:guest:query:{}`;
+export const studentKey = (prefix: string, user: string) => `${prefix}:user:${user}:role:student:query:{}`;
+
+// Only the calls invalidation makes; a fill may still be finishing
+export const invalidationCalls = () => fake.calls.filter((call) => call !== 'setTagged');
+
+/**
+ * App with one cached route (60 s TTL); `handled` counts the requests that
+ * reached the handler. An X-User header signs the request in as that student.
+ */
+export const buildApp = (prefix: string, opts: Parameters<typeof cacheMiddleware>[2] = {}, delayMs = 0) => {
+  const app = express();
+  const state = { handled: 0 };
+  app.use((req, res, next) => {
+    res.vary('Origin');
+    if (req.headers['x-user']) {
+      (req as any).user = { _id: req.headers['x-user'], role: 'student' };
+    }
+    next();
+  });
+  app.get(`/${prefix}`, cacheMiddleware(prefix, 60, opts), async (req, res) => {
+    state.handled++;
+    if (delayMs) {
+      await new Promise((resolve) => setTimeout(resolve, delayMs));
+    }
+    res.json({ success: true, data: [1, 2, 3] });
+  });
+  return { app, state };
+};
+
+// Fill `prefix` for `user` and check the next request is an L1 hit
+export const fill = async (app: express.Application, prefix: string, user: string) => {
+  await request(app).get(`/${prefix}`).set('X-User', user);
+  await waitFor(() => fake.store.has(studentKey(prefix, user)));
+  const cached = await request(app).get(`/${prefix}`).set('X-User', user);
+  expect(cached.headers['x-cache']).toBe('HIT-L1');
+};
+
+// Hooks for every test file that imports these helpers
+beforeAll(() => {
+  jest.spyOn(console, 'log').mockImplementation(() => {});
+});
+
+beforeEach(() => {
+  fake.calls.length = 0;
+  delete process.env.CACHE_SCAN_FALLBACK;
+});
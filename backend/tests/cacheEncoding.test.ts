@@ -0,0 +1,66 @@
+import request from 'supertest';
+import zlib from 'zlib';
+
+jest.mock('../src/config/redis', () => require('./fakeRedis'));
+
+import { redisClient as fake } from './fakeRedis';
+import { anonymousKey, body, buildApp, waitFor } from './cacheApp';
+import { encodeBody, negotiate, pack, unpack } from '../src/middleware/cache';
+
+describe('Cache entry encoding', () => {
+  it('should round-trip all three bodies through pack/unpack', () => {
+    const original = body('{"data":"hello"}');
+    const restored = unpack(pack(original));
+    expect(restored).not.toBeNull();
+    expect(restored!.identity.equals(original.identity)).toBe(true);
+    expect(restored!.gzip.equals(original.gzip)).toBe(true);
+    expect(restored!.br.equals(original.br)).toBe(true);
+  });
+
+  it('should reject entries in the old JSON format and truncated values', () => {
+    expect(unpack(Buffer.from('{"data":"hello"}'))).toBeNull();
+    expect(unpack(Buffer.from([1, 0, 0]))).toBeNull();
+  });
+
+  it('should store the body marked as cached, with matching compressed copies', async () => {
+    const encoded = await encodeBody({ data: [1] });
+    const parsed = JSON.parse(encoded.identity.toString());
+    expect(parsed.cached).toBe(true);
+    expect(typeof parsed.cacheTimestamp).toBe('string');
+    expect(zlib.gunzipSync(encoded.gzip).equals(encoded.identity)).toBe(true);
+    expect(zlib.brotliDecompressSync(encoded.br).equals(encoded.identity)).toBe(true);
+  });
+});
+
+describe('Accept-Encoding negotiation', () => {
+  it('should prefer br, then gzip, else identity', () => {
+    expect(negotiate('gzip, deflate, br')).toBe('br');
+    expect(negotiate('gzip, deflate')).toBe('gzip');
+    expect(negotiate('*')).toBe('gzip');
+    expect(negotiate('deflate')).toBe('identity');
+    expect(negotiate(undefined)).toBe('identity');
+  });
+
+  it('should honour q values and ignore case', () => {
+    expect(negotiate('br;q=0, gzip;q=0.5')).toBe('gzip');
+    expect(negotiate('gzip;q=0')).toBe('identity');
+    expect(negotiate('BR')).toBe('br');
+  });
+
+  it('should serve hits with the negotiated encoding and keep Vary: Origin', async () => {
+    const { app } = buildApp('enc');
+    await request(app).get('/enc');
+    await waitFor(() => fake.store.has(anonymousKey('enc')));
+
+    const gzipped = await request(app).get('/enc').set('Accept-Encoding', 'gzip');
+    expect(gzipped.headers['x-cache']).toBe('HIT-L1');
+    expect(gzipped.headers['content-encoding']).toBe('gzip');
+    expect(gzipped.headers['vary']).toMatch(/Origin/);
+    expect(gzipped.headers['vary']).toMatch(/Accept-Encoding/);
+    expect(gzipped.body.data).toEqual([1, 2, 3]);
+
+    const plain = await request(app).get('/enc').set('Accept-Encoding', 'identity');
+    expect(plain.headers['content-encoding']).toBeUndefined();
+    expect(plain.body.cached).toBe(true);
+  });
+});
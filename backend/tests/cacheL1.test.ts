@@ -0,0 +1,86 @@
+import request from 'supertest';
+
+jest.mock('../src/config/redis', () => require('./fakeRedis'));
+
+import { broadcast } from './fakeRedis';
+import { body, buildApp, fill, invalidationCalls } from './cacheApp';
+import { LruCache, L1Entry, invalidateCache } from '../src/middleware/cache';
+
+const entry = (bytes: number, tags: string[] = [], ttlMs = 60000): L1Entry => ({
+  body: body('x'),
+  bytes,
+  staleAt: Date.now() + ttlMs,
+  expiresAt: Date.now() + ttlMs,
+  tags,
+});
+
+describe('LruCache', () => {
+  it('should stay within its byte bound by evicting the least recently used', () => {
+    const cache = new LruCache(100);
+    cache.set('a', entry(40));
+    cache.set('b', entry(40));
+    cache.get('a');
+    cache.set('c', entry(40));
+
+    expect(cache.get('b')).toBeUndefined();
+    expect(cache.get('a')).toBeDefined();
+    expect(cache.get('c')).toBeDefined();
+    expect(cache.stats()).toMatchObject({ entries: 2, bytes: 80, evictions: 1 });
+  });
+
+  it('should not store an entry larger than the bound', () => {
+    const cache = new LruCache(100);
+    cache.set('a', entry(40));
+    cache.set('huge', entry(101));
+    expect(cache.get('huge')).toBeUndefined();
+    expect(cache.stats()).toMatchObject({ entries: 1, bytes: 40 });
+  });
+
+  it('should count a replaced entry once', () => {
+    const cache = new LruCache(100);
+    cache.set('a', entry(40));
+    cache.set('a', entry(60));
+    expect(cache.stats()).toMatchObject({ entries: 1, bytes: 60, evictions: 0 });
+  });
+
+  it('should drop expired entries on read', () => {
+    const cache = new LruCache(100);
+    cache.set('a', entry(40, [], -1));
+    expect(cache.get('a')).toBeUndefined();
+    expect(cache.stats().bytes).toBe(0);
+  });
+
+  it('should delete every entry under a tag', () => {
+    const cache = new LruCache(100);
+    cache.set('a', entry(10, ['tags:x']));
+    cache.set('b', entry(10, ['tags:x', 'tags:y']));
+    cache.set('c', entry(10, ['tags:y']));
+    expect(cache.deleteTags(['tags:x'])).toBe(2);
+    expect(cache.get('c')).toBeDefined();
+    expect(cache.stats()).toMatchObject({ entries: 1, bytes: 10 });
+  });
+});
+
+describe('L1 invalidation', () => {
+  it('should delete in Redis before dropping L1 and broadcasting', async () => {
+    const { app, state } = buildApp('inv');
+    await fill(app, 'inv', 'u1');
+
+    expect(await invalidateCache('u1', 'inv')).toBe(1);
+    expect(invalidationCalls()).toEqual(['delTags', 'publish']);
+
+    const after = await request(app).get('/inv').set('X-User', 'u1');
+    expect(after.headers['x-cache']).toBe('MISS');
+    expect(state.handled).toBe(2);
+  });
+
+  it('should drop L1 copies when another worker broadcasts their tags', async () => {
+    const { app } = buildApp('remote');
+    await fill(app, 'remote', 'u2');
+
+    // Redis still holds the entry here, so an L2 hit shows the L1 copy went
+    broadcast({ tags: ['tags:remote:user:u2'] });
+    const after = await request(app).get('/remote').set('X-User', 'u2');
+    expect(after.headers['x-cache']).toBe('HIT-L2');
+  });
+});
@@ -0,0 +1,94 @@
+import request from 'supertest';
+import express from 'express';
+
+jest.mock('../src/config/redis', () => require('./fakeRedis'));
+
+import { broadcast, redisClient as fake } from './fakeRedis';
+import { buildApp, waitFor } from './cacheApp';
+import { bumpCacheVersion, generatePublicCacheKey } from '../src/middleware/cache';
+
+describe('generatePublicCacheKey', () => {
+  const options = {
+    params: ['sort', 'category', 'page', 'limit'],
+    defaults: { page: '1', limit: '50' },
+    normalize: { category: (value: string) => value.trim().toLowerCase() },
+  };
+  const key = (query: Record<string, unknown>, version = 0) =>
+    generatePublicCacheKey({ query } as unknown as express.Request, 'gigs', options, version);
+
+  it('should sort the whitelisted parameters and ignore the rest', () => {
+    expect(key({ sort: 'price', category: 'math', utm_source: 'ad', _: '123' })).toBe(
+      'gigs:public:v0:category=math&sort=price'
+    );
+  });
+
+  it('should leave out defaults and empty values', () => {
+    expect(key({ page: '1', limit: '50', category: '' })).toBe('gigs:public:v0:');
+    expect(key({ page: '2' })).toBe('gigs:public:v0:page=2');
+  });
+
+  it('should write integers canonically', () => {
+    expect(key({ page: '01', limit: '050' })).toBe('gigs:public:v0:');
+    expect(key({ page: '002' })).toBe(key({ page: '2' }));
+    expect(key({ page: ' 2 ' })).toBe(key({ page: '2' }));
+  });
+
+  it('should normalise values the way the handler reads them', () => {
+    expect(key({ category: ' Mathematics ' })).toBe(key({ category: 'mathematics' }));
+    expect(key({ category: '   ' })).toBe('gigs:public:v0:');
+    expect(key({ sort: 'Newest' })).not.toBe(key({ sort: 'newest' }));
+  });
+
+  it('should ignore repeated and nested parameters', () => {
+    expect(key({ category: ['a', 'b'], sort: { $gt: '' } })).toBe('gigs:public:v0:');
+  });
+
+  it('should encode values and include the version', () => {
+    expect(key({ category: 'web dev&design' }, 7)).toBe('gigs:public:v7:category=web%20dev%26design');
+  });
+});
+
+describe('Public cache versions', () => {
+  const publicKey = (prefix: string, version: number) => `${prefix}:public:v${version}:`;
+
+  // Fill the public entry and check the next request is an L1 hit
+  const fillPublic = async (app: express.Application, prefix: string, version: number) => {
+    await request(app).get(`/${prefix}`);
+    await waitFor(() => fake.store.has(publicKey(prefix, version)));
+    const cached = await request(app).get(`/${prefix}`);
+    expect(cached.headers['x-cache']).toBe('HIT-L1');
+  };
+
+  it('should move to the bumped version at once, without waiting for the version refresh', async () => {
+    const { app, state } = buildApp('pub', { public: { params: ['page'] } });
+    await fillPublic(app, 'pub', 0);
+
+    // The version is read from Redis only every few seconds, so a bump made
+    // elsewhere without a broadcast is not seen yet
+    await fake.incr('version:pub');
+    expect((await request(app).get('/pub')).headers['x-cache']).toBe('HIT-L1');
+
+    expect(await bumpCacheVersion('pub')).toBe(2);
+    expect(fake.publish).toHaveBeenLastCalledWith(
+      expect.any(String),
+      JSON.stringify({ tags: ['tags:pub'], versions: { pub: 2 } })
+    );
+    const after = await request(app).get('/pub');
+    expect(after.headers['x-cache']).toBe('MISS');
+    expect(state.handled).toBe(2);
+    await waitFor(() => fake.store.has(publicKey('pub', 2)));
+  });
+
+  it("should adopt other workers' bumps and never go back to an older version", async () => {
+    const { app, state } = buildApp('shared', { public: { params: ['page'] } });
+    await fillPublic(app, 'shared', 0);
+
+    broadcast({ tags: ['tags:shared'], versions: { shared: 3 } });
+    await fillPublic(app, 'shared', 3);
+
+    // A late message about an older bump
+    broadcast({ tags: [], versions: { shared: 1 } });
+    expect((await request(app).get('/shared')).headers['x-cache']).toBe('HIT-L1');
+    expect(state.handled).toBe(2);
+  });
+});
@@ -0,0 +1,81 @@
+import request from 'supertest';
+
+jest.mock('../src/config/redis', () => require('./fakeRedis'));
+
+import { redisClient as fake } from './fakeRedis';
+import { anonymousKey, buildApp, waitFor } from './cacheApp';
+import { encodeBody, getCacheStats, pack } from '../src/middleware/cache';
+
+// Put an entry in Redis as another worker would, `ttlMs` before it expires
+const storeEntry = async (prefix: string, data: unknown, ttlMs: number) => {
+  const value = pack(await encodeBody({ success: true, data }));
+  fake.store.set(anonymousKey(prefix), { value, expiresAt: Date.now() + ttlMs });
+};
+
+describe('Stampede protection', () => {
+  it('should run the handler once for concurrent misses in a worker', async () => {
+    const { app, state } = buildApp('flight', { lockMs: 0 }, 50);
+    const responses = await Promise.all([request(app).get('/flight'), request(app).get('/flight')]);
+
+    expect(state.handled).toBe(1);
+    expect(responses.map((r) => r.headers['x-cache']).sort()).toEqual(['HIT-COALESCED', 'MISS']);
+    for (const response of responses) {
+      expect(response.body.data).toEqual([1, 2, 3]);
+    }
+  });
+
+  it('should wait for the lock holder fill instead of running the handler', async () => {
+    const { app, state } = buildApp('locked', { lockMs: 1000 });
+    const before = getCacheStats().stampede.lockWaits;
+    fake.acquireLock.mockResolvedValueOnce(null);
+    // Another worker holds the lock and stores the entry a little later
+    setTimeout(() => storeEntry('locked', ['other worker'], 60000), 120);
+
+    const response = await request(app).get('/locked');
+    expect(state.handled).toBe(0);
+    expect(response.headers['x-cache']).toBe('HIT-L2');
+    expect(response.body.data).toEqual(['other worker']);
+    expect(getCacheStats().stampede.lockWaits).toBe(before + 1);
+  });
+
+  it('should fill the entry itself when the lock holder never does', async () => {
+    const { app, state } = buildApp('abandoned', { lockMs: 1000, lockWaitMs: 100 });
+    fake.acquireLock.mockResolvedValueOnce(null);
+
+    const response = await request(app).get('/abandoned');
+    expect(state.handled).toBe(1);
+    expect(response.headers['x-cache']).toBe('MISS');
+  });
+});
+
+describe('Stale-while-revalidate', () => {
+  // 60 s fresh plus 30 s stale; an entry 10 s from expiry is in its stale window
+  const swr = { staleWhileRevalidate: 30 };
+
+  it('should serve the stale entry while a single request revalidates it', async () => {
+    const { app, state } = buildApp('swr', swr, 50);
+    await storeEntry('swr', ['stale'], 10000);
+
+    const responses = await Promise.all([request(app).get('/swr'), request(app).get('/swr')]);
+    const byCache = Object.fromEntries(responses.map((r) => [r.headers['x-cache'], r.body.data]));
+    expect(state.handled).toBe(1);
+    expect(byCache).toEqual({ REVALIDATE: [1, 2, 3], 'HIT-STALE': ['stale'] });
+
+    // The revalidated entry is fresh again
+    await waitFor(() => fake.store.get(anonymousKey('swr'))!.expiresAt > Date.now() + 60000);
+    const after = await request(app).get('/swr');
+    expect(after.headers['x-cache']).toBe('HIT-L1');
+    expect(after.body.data).toEqual([1, 2, 3]);
+  });
+
+  it('should serve stale without running the handler while another worker revalidates', async () => {
+    const { app, state } = buildApp('swr-locked', swr);
+    await storeEntry('swr-locked', ['stale'], 10000);
+    fake.acquireLock.mockResolvedValueOnce(null);
+
+    const response = await request(app).get('/swr-locked');
+    expect(state.handled).toBe(0);
+    expect(response.headers['x-cache']).toBe('HIT-STALE');
+    expect(response.body.data).toEqual(['stale']);
+  });
+});
@@ -0,0 +1,40 @@
+import request from 'supertest';
+
+jest.mock('../src/config/redis', () => require('./fakeRedis'));
+
+import { redisClient as fake } from './fakeRedis';
+import { buildApp, fill, invalidationCalls } from './cacheApp';
+import { invalidateCache } from '../src/middleware/cache';
+
+describe('Tag invalidation', () => {
+  it("should delete a user's entries through the tag sets, without a SCAN", async () => {
+    const { app, state } = buildApp('tagged');
+    await fill(app, 'tagged', 'u1');
+
+    expect(await invalidateCache('u1', 'tagged')).toBe(1);
+    expect(invalidationCalls()).not.toContain('delPattern');
+    expect(fake.tagSets.has('tags:tagged:user:u1')).toBe(false);
+
+    const after = await request(app).get('/tagged').set('X-User', 'u1');
+    expect(after.headers['x-cache']).toBe('MISS');
+    expect(state.handled).toBe(2);
+  });
+
+  it('should run the SCAN fallback before broadcasting when enabled', async () => {
+    const { app } = buildApp('scan');
+    await fill(app, 'scan', 'u2');
+    process.env.CACHE_SCAN_FALLBACK = 'true';
+
+    await invalidateCache('u2', 'scan');
+    expect(invalidationCalls()).toEqual(['delTags', 'delPattern', 'publish']);
+  });
+
+  it('should leave other users entries alone', async () => {
+    const { app } = buildApp('others');
+    await fill(app, 'others', 'u3');
+    await invalidateCache('u4', 'others');
+
+    const response = await request(app).get('/others').set('X-User', 'u3');
+    expect(response.headers['x-cache']).toBe('HIT-L1');
+  });
+});
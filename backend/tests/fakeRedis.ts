@@ -0,0 +1,66 @@
+// In-memory stand-in for the Redis client, for the cache tests:
+//
+//   jest.mock('../src/config/redis', () => require('./fakeRedis'));
+//
+// It records the order of the calls that matter for invalidation.
+const store = new Map<string, { value: Buffer; expiresAt: number }>();
+const tagSets = new Map<string, Set<string>>();
+const calls: string[] = [];
+
+export const redisClient = {
+  store,
+  tagSets,
+  calls,
+  isAvailable: () => true,
+  get: async (key: string) => {
+    const entry = store.get(key);
+    return entry ? entry.value.toString() : null;
+  },
+  getWithTtl: async (key: string) => {
+    const entry = store.get(key);
+    return entry ? { value: entry.value, ttlMs: entry.expiresAt - Date.now() } : null;
+  },
+  incr: async (key: string) => {
+    const next = Number(store.get(key)?.value.toString() || 0) + 1;
+    store.set(key, { value: Buffer.from(String(next)), expiresAt: Infinity });
+    return next;
+  },
+  setTagged: async (key: string, value: Buffer, ttl: number, tags: string[]) => {
+    calls.push('setTagged');
+    store.set(key, { value, expiresAt: Date.now() + ttl * 1000 });
+    for (const tag of tags) {
+      tagSets.set(tag, (tagSets.get(tag) || new Set<string>()).add(key));
+    }
+    return true;
+  },
+  delTags: async (tags: string[]) => {
+    calls.push('delTags');
+    let deleted = 0;
+    for (const tag of tags) {
+      for (const key of tagSets.get(tag) || []) {
+        deleted += store.delete(key) ? 1 : 0;
+      }
+      tagSets.delete(tag);
+    }
+    return deleted;
+  },
+  delPattern: async () => {
+    calls.push('delPattern');
+    return 0;
+  },
+  acquireLock: jest.fn(async (): Promise<string | null> => 'token'),
+  releaseLock: jest.fn(async () => true),
+  publish: jest.fn(async () => {
+    calls.push('publish');
+    return true;
+  }),
+  subscribe: jest.fn(),
+};
+
+/**
+ * Deliver an invalidation message the way another worker's publish would
+ */
+export const broadcast = (message: object) => {
+  const [, handler] = redisClient.subscribe.mock.calls[0] as unknown as [string, (message: string) => void];
+  handler(JSON.stringify(message));
+};
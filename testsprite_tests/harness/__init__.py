@@ -0,0 +1,13 @@
+"""Shared execution harness for the generated TestSprite scenarios.
+
+The ``TC*.py`` scripts in the parent directory stay runnable on their own;
+this package loads their ``run_test`` coroutines and drives them from a
+single Playwright browser instead of one cold start per script.
+
+Run from ``testsprite_tests/``::
+
+    python -m harness.runner --concurrency 6
+
+Modules are imported individually so the HTTP-only tools do not require
+Playwright to be installed.
+"""
@@ -0,0 +1,112 @@
+"""Thin aiohttp client for the backend that records per-route latency."""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, Container, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from .config import API_URL, bearer
+from .metrics import LatencyRecorder
+
+_OBJECT_ID = re.compile(r"/[0-9a-fA-F]{24}(?=/|$)")
+
+
+def route_of(method: str, url: str) -> str:
+    """``GET /api/bookings/64f.../join?x=1`` -> ``GET /api/bookings/:id/join``."""
+    path = urlsplit(url).path or url.split("?", 1)[0]
+    return f"{method.upper()} {_OBJECT_ID.sub('/:id', path)}"
+
+
+@dataclass
+class ApiResponse:
+    status: int
+    body: Any
+    elapsed: float
+
+    @property
+    def data(self) -> Any:
+        return self.body.get("data") if isinstance(self.body, dict) else None
+
+
+class ApiClient:
+    """Async JSON client; every call is recorded under its normalized route."""
+
+    def __init__(
+        self,
+        recorder: Optional[LatencyRecorder] = None,
+        base_url: str = API_URL,
+        *,
+        timeout: float = 30.0,
+        connections: int = 0,
+    ):
+        self.recorder = recorder or LatencyRecorder()
+        self.base_url = base_url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._connections = connections
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "ApiClient":
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            connector=aiohttp.TCPConnector(limit=self._connections),
+        )
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        token: Optional[str] = None,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        expect: Container[int] = (),
+        name: Optional[str] = None,
+        allow_redirects: bool = True,
+    ) -> ApiResponse:
+        """Send a request; 4xx/5xx count as errors unless listed in ``expect``."""
+        assert self._session is not None, "use 'async with ApiClient()'"
+        all_headers = {**(bearer(token) if token else {}), **(headers or {})}
+        endpoint = name or route_of(method, path)
+        started = time.perf_counter()
+        try:
+            async with self._session.request(
+                method,
+                f"{self.base_url}{path}",
+                json=json,
+                params=params,
+                headers=all_headers,
+                allow_redirects=allow_redirects,
+            ) as resp:
+                try:
+                    body = await resp.json(content_type=None)
+                except ValueError:
+                    body = None
+                status = resp.status
+        except (aiohttp.ClientError, TimeoutError) as exc:
+            elapsed = time.perf_counter() - started
+            self.recorder.record(endpoint, elapsed, ok=False)
+            return ApiResponse(status=0, body={"error": str(exc)}, elapsed=elapsed)
+        elapsed = time.perf_counter() - started
+        self.recorder.record(endpoint, elapsed, ok=status < 400 or status in expect)
+        return ApiResponse(status=status, body=body, elapsed=elapsed)
+
+    async def get(self, path: str, **kwargs: Any) -> ApiResponse:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs: Any) -> ApiResponse:
+        return await self.request("POST", path, **kwargs)
+
+    async def put(self, path: str, **kwargs: Any) -> ApiResponse:
+        return await self.request("PUT", path, **kwargs)
@@ -0,0 +1,47 @@
+"""Endpoints and credentials shared by the harness tools.
+
+Everything can be overridden from the environment so the same tools work
+against a local stack, docker-compose or a staging deployment.
+"""
+
+from __future__ import annotations
+
+import base64
+import os
+from typing import Dict, Optional, Tuple
+
+FRONTEND_URL = os.environ.get("TESTSPRITE_FRONTEND_URL", "http://localhost:3000").rstrip("/")
+API_URL = os.environ.get("TESTSPRITE_API_URL", "http://localhost:5000").rstrip("/")
+
+ROLES = ("student", "teacher", "admin")
+
+# The frontend signs in through Clerk; the harness needs the instance's keys
+# (the same values as frontend/.env) to sign fixture accounts in.
+CLERK_SECRET_KEY = os.environ.get("CLERK_SECRET_KEY")
+CLERK_PUBLISHABLE_KEY = os.environ.get("NEXT_PUBLIC_CLERK_PUBLISHABLE_KEY") or os.environ.get("CLERK_PUBLISHABLE_KEY")
+CLERK_API_URL = os.environ.get("CLERK_API_URL", "https://api.clerk.com/v1").rstrip("/")
+
+
+def credentials(role: str) -> Tuple[str, str]:
+    """E-mail and password of the fixture account for ``role``.
+
+    Defaults to ``e2e.<role>@educonnect.test``; override with
+    ``TESTSPRITE_<ROLE>_EMAIL`` / ``TESTSPRITE_<ROLE>_PASSWORD``.
+    """
+    prefix = f"TESTSPRITE_{role.upper()}"
+    email = os.environ.get(f"{prefix}_EMAIL", f"e2e.{role}@educonnect.test")
+    password = os.environ.get(f"{prefix}_PASSWORD", "E2e-Passw0rd!")
+    return email, password
+
+
+def bearer(token: str) -> Dict[str, str]:
+    return {"Authorization": f"Bearer {token}"}
+
+
+def clerk_frontend_api() -> Optional[str]:
+    """Host of the Clerk Frontend API, decoded from the publishable key."""
+    if not CLERK_PUBLISHABLE_KEY:
+        return None
+    encoded = CLERK_PUBLISHABLE_KEY.split("_", 2)[-1]
+    host = base64.b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+    return host.rstrip("$")
@@ -0,0 +1,163 @@
+"""Fan scenarios out over a device matrix on one browser.
+
+The TC019 scripts claim to check mobile, tablet and desktop layouts but
+run everything in a single default-sized page.  ``DeviceMatrix`` turns
+each selected scenario into one variant per device profile
+(``TC019_...@mobile``); every variant gets its own context with that
+profile's viewport, device scale factor and touch/mobile flags, and the
+variants run concurrently with the rest of the suite, so the matrix costs
+about as much as its slowest profile.
+
+Per variant the page reports first contentful paint and LCP of the first
+document, and the worst cumulative layout shift over all documents it
+loaded, into ``extras["device"]``::
+
+    python -m harness.runner TC019 --devices all -c 7
+    python -m harness.runner TC019 --devices mobile,mobile-hidpi,desktop
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from typing import Any, Dict, List, Sequence
+
+from playwright.async_api import BrowserContext
+
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport
+from .scenarios import Scenario
+
+PROFILES: Dict[str, Dict[str, Any]] = {
+    "desktop": {"viewport": {"width": 1280, "height": 720}, "device_scale_factor": 1},
+    "desktop-hidpi": {"viewport": {"width": 1440, "height": 900}, "device_scale_factor": 2},
+    "tablet": {
+        "viewport": {"width": 768, "height": 1024},
+        "device_scale_factor": 2,
+        "is_mobile": True,
+        "has_touch": True,
+    },
+    "tablet-landscape": {
+        "viewport": {"width": 1024, "height": 768},
+        "device_scale_factor": 2,
+        "is_mobile": True,
+        "has_touch": True,
+    },
+    "mobile": {
+        "viewport": {"width": 375, "height": 667},
+        "device_scale_factor": 2,
+        "is_mobile": True,
+        "has_touch": True,
+    },
+    "mobile-hidpi": {
+        "viewport": {"width": 390, "height": 844},
+        "device_scale_factor": 3,
+        "is_mobile": True,
+        "has_touch": True,
+    },
+    "mobile-small": {
+        "viewport": {"width": 320, "height": 568},
+        "device_scale_factor": 2,
+        "is_mobile": True,
+        "has_touch": True,
+    },
+}
+
+# Posts paint and layout-shift entries to Python as they happen, so the
+# numbers survive the script closing its own context.
+REPORT_SCRIPT = """
+(() => {
+  const report = (kind, value) => window.__deviceMetric && window.__deviceMetric(kind, value);
+  const watch = (type, fn) => {
+    try { new PerformanceObserver((l) => l.getEntries().forEach(fn)).observe({ type, buffered: true }); }
+    catch (e) {}
+  };
+  let cls = 0;
+  watch('paint', (e) => { if (e.name === 'first-contentful-paint') report('fcp', e.startTime); });
+  watch('largest-contentful-paint', (e) => report('lcp', e.renderTime || e.loadTime || e.startTime));
+  watch('layout-shift', (e) => { if (!e.hadRecentInput) { cls += e.value; report('cls', cls); } });
+})();
+"""
+
+
+@dataclasses.dataclass
+class _Document:
+    fcp_ms: float = 0.0
+    lcp_ms: float = 0.0
+    cls: float = 0.0
+
+
+class DeviceMatrix(RunnerPlugin):
+    def __init__(self, devices: Sequence[str]):
+        names = list(PROFILES) if list(devices) == ["all"] else list(devices)
+        unknown = [d for d in names if d not in PROFILES]
+        if unknown:
+            raise ValueError(f"unknown device profile(s) {', '.join(unknown)}; known: {', '.join(PROFILES)}")
+        self.devices = names
+        self._variants: Dict[str, str] = {}
+        self._documents: Dict[str, Dict[Any, _Document]] = {}
+
+    def expand(self, scenarios: Sequence[Scenario]) -> List[Scenario]:
+        variants = []
+        for scenario in scenarios:
+            for device in self.devices:
+                variant = dataclasses.replace(scenario, name=f"{scenario.name}@{device}")
+                self._variants[variant.name] = device
+                variants.append(variant)
+        return variants
+
+    async def context_options(self, scenario: Scenario) -> Dict[str, Any]:
+        device = self._variants.get(scenario.name)
+        return dict(PROFILES[device]) if device else {}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        if scenario.name not in self._variants:
+            return
+        documents = self._documents.setdefault(scenario.name, {})
+
+        def metric(source: Dict[str, Any], kind: str, value: float) -> None:
+            # One entry per page and URL the scenario loaded.
+            doc = documents.setdefault((id(source["page"]), source["frame"].url), _Document())
+            if kind == "fcp":
+                doc.fcp_ms = doc.fcp_ms or value
+            elif kind == "lcp":
+                doc.lcp_ms = value
+            else:
+                doc.cls = value
+
+        await context.expose_binding("__deviceMetric", metric)
+        await context.add_init_script(REPORT_SCRIPT)
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        device = self._variants.get(scenario.name)
+        if device is None:
+            return
+        docs = list(self._documents.pop(scenario.name, {}).values())
+        first = docs[0] if docs else _Document()
+        result.extras["device"] = {
+            "profile": device,
+            **PROFILES[device],
+            "fcp_ms": round(first.fcp_ms, 1),
+            "lcp_ms": round(first.lcp_ms, 1),
+            "cls": round(max((d.cls for d in docs), default=0.0), 4),
+            "documents": len(docs),
+        }
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        table = format_matrix(report.results)
+        if table:
+            print(table)
+
+
+def format_matrix(results: Sequence[ScenarioResult]) -> str:
+    rows = [r for r in results if "device" in r.extras]
+    if not rows:
+        return ""
+    header = f"{'scenario':<48}  {'device':<16}  {'status':<7}  {'secs':>6}  {'fcp':>6}  {'lcp':>6}  {'cls':>6}"
+    lines = [header, "-" * len(header)]
+    for r in sorted(rows, key=lambda r: r.name):
+        d = r.extras["device"]
+        base = r.name.rsplit("@", 1)[0][:48]
+        lines.append(
+            f"{base:<48}  {d['profile']:<16}  {r.status:<7}  {r.duration:>6.1f}  "
+            f"{d['fcp_ms']:>6.0f}  {d['lcp_ms']:>6.0f}  {d['cls']:>6.3f}"
+        )
+    return "\n".join(lines)
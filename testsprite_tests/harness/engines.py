@@ -0,0 +1,339 @@
+"""Run the critical journeys on Chromium, Firefox and WebKit side by side.
+
+The scripts only ever launch ``pw.chromium``; the runner's shim already
+hands them whatever browser it launched, so here one Playwright instance
+launches all selected engines and runs the same scenarios (by default the
+booking and payment journeys TC010-TC015) on each of them at the same
+time.  Every page of every context reports, from inside the page and the
+same way on all engines:
+
+* ``load`` - Navigation Timing of each full document load: ``ttfb_ms``,
+  ``dcl_ms`` and ``load_ms``, keyed by URL path;
+* ``interaction`` - input to next paint for each ``click``, ``keydown``
+  and ``input`` event: from the event's timestamp to the first task after
+  the next animation frame, i.e. handlers plus React's re-render plus one
+  frame of rendering.
+
+The per-engine summaries land in ``extras["engine"]`` of every result and
+in ``tmp/engines_report.json``, and the comparison table flags paths and
+interactions where one engine's median is at least ``--ratio`` times the
+fastest other engine's (and ``--min-ms`` slower), which is what an
+engine-specific problem looks like::
+
+    python -m harness.engines                                  # TC010-TC015, all engines
+    python -m harness.engines TC013 TC014 --engines firefox,webkit --event-waits
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from playwright import async_api
+from playwright.async_api import BrowserContext
+
+from .metrics import percentile
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport, execute, launch
+from .scenarios import TESTS_DIR, Scenario, discover
+
+ENGINES = ("chromium", "firefox", "webkit")
+DEFAULT_PATTERNS = ("TC010", "TC011", "TC012", "TC013", "TC014", "TC015")
+DEFAULT_ENGINE_REPORT = TESTS_DIR / "tmp" / "engines_report.json"
+LOAD_METRICS = ("ttfb_ms", "dcl_ms", "load_ms")
+
+# Reports through a binding, so a document's numbers survive the script
+# navigating away or closing its context.
+PROBE_SCRIPT = """
+(() => {
+  const report = (kind, data) => window.__engineEntry && window.__engineEntry(kind, data);
+  addEventListener('load', () => setTimeout(() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    if (nav) report('load', {
+      ttfb_ms: nav.responseStart, dcl_ms: nav.domContentLoadedEventEnd, load_ms: nav.loadEventEnd,
+    });
+  }, 0));
+  const describe = (el) => !el || !el.tagName ? '' : el.tagName.toLowerCase()
+    + (el.id ? `#${el.id}` : el.name ? `[name=${el.name}]` : '')
+    + (el.tagName === 'BUTTON' || el.tagName === 'A' ? ` "${(el.textContent || '').trim().slice(0, 24)}"` : '');
+  for (const type of ['click', 'keydown', 'input']) {
+    addEventListener(type, (e) => {
+      const start = e.timeStamp;
+      const target = describe(e.target);
+      requestAnimationFrame(() => setTimeout(() => report('interaction', {
+        type, target, duration: performance.now() - start,
+      }), 0));
+    }, true);
+  }
+})();
+"""
+
+_ID = re.compile(r"/[0-9a-f]{24}(?=/|$)|/\d+(?=/|$)")
+
+
+def normalize_path(url: str) -> str:
+    """URL path with Mongo ids and numbers folded to ``:id``."""
+    return _ID.sub("/:id", urlsplit(url).path) or "/"
+
+
+class EngineProbe(RunnerPlugin):
+    """Collects load and interaction timings for the scenarios of one engine."""
+
+    def __init__(self, engine: str):
+        self.engine = engine
+        self.loads: List[Dict[str, Any]] = []
+        self.interactions: List[Dict[str, Any]] = []
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        def entry(source: Dict[str, Any], kind: str, data: Dict[str, Any]) -> None:
+            data.update(scenario=scenario.name, path=normalize_path(source["frame"].url))
+            (self.loads if kind == "load" else self.interactions).append(data)
+
+        await context.expose_binding("__engineEntry", entry)
+        await context.add_init_script(PROBE_SCRIPT)
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        loads = [e for e in self.loads if e["scenario"] == scenario.name]
+        inputs = sorted(e["duration"] for e in self.interactions if e["scenario"] == scenario.name)
+        result.extras["engine"] = {
+            "loads": len(loads),
+            "load_ms_p50": round(percentile(sorted(e["load_ms"] for e in loads), 50), 1),
+            "interactions": len(inputs),
+            "interaction_ms_p50": round(percentile(inputs, 50), 1),
+            "interaction_ms_p95": round(percentile(inputs, 95), 1),
+        }
+
+
+def _stats(values: Sequence[float]) -> Dict[str, float]:
+    ordered = sorted(values)
+    return {
+        "n": len(ordered),
+        "p50": round(percentile(ordered, 50), 1),
+        "p95": round(percentile(ordered, 95), 1),
+    }
+
+
+def summarize(probes: Sequence[EngineProbe], results: Sequence[ScenarioResult]) -> Dict[str, Dict[str, Any]]:
+    """Per engine: pass counts, scenario wall time, load metrics and interaction latency."""
+    out: Dict[str, Dict[str, Any]] = {}
+    for probe in probes:
+        mine = [r for r in results if r.engine == probe.engine]
+        out[probe.engine] = {
+            "scenarios": len(mine),
+            "passed": sum(1 for r in mine if r.passed),
+            "scenario_s": _stats([r.duration for r in mine]),
+            **{metric: _stats([e[metric] for e in probe.loads]) for metric in LOAD_METRICS},
+            "interaction_ms": _stats([e["duration"] for e in probe.interactions]),
+        }
+    return out
+
+
+@dataclass
+class Outlier:
+    kind: str  # "load" or "interaction"
+    key: str
+    engine: str
+    median_ms: float
+    best_engine: str
+    best_ms: float
+
+    @property
+    def ratio(self) -> float:
+        return self.median_ms / self.best_ms if self.best_ms else float("inf")
+
+
+def compare(
+    probes: Sequence[EngineProbe], *, ratio: float = 1.5, min_ms: float = 50.0
+) -> Tuple[Dict[str, Dict[str, Dict[str, float]]], List[Outlier]]:
+    """Median per path (loads) and per path + target (interactions), and the engine outliers.
+
+    An engine is an outlier for a key when its median is ``ratio`` times
+    and ``min_ms`` above the fastest *other* engine that saw the key.
+    """
+    table: Dict[str, Dict[str, Dict[str, List[float]]]] = {"load": defaultdict(dict), "interaction": defaultdict(dict)}
+    for probe in probes:
+        for e in probe.loads:
+            table["load"][e["path"]].setdefault(probe.engine, []).append(e["load_ms"])
+        for e in probe.interactions:
+            key = f"{e['path']} {e['type']} {e['target']}".strip()
+            table["interaction"][key].setdefault(probe.engine, []).append(e["duration"])
+    medians: Dict[str, Dict[str, Dict[str, float]]] = {}
+    outliers: List[Outlier] = []
+    for kind, rows in table.items():
+        medians[kind] = {}
+        for key, samples in sorted(rows.items()):
+            row = {engine: percentile(sorted(values), 50) for engine, values in samples.items()}
+            medians[kind][key] = row
+            for engine, value in row.items():
+                others = {e: v for e, v in row.items() if e != engine}
+                if not others:
+                    continue
+                best = min(others, key=others.__getitem__)
+                if value >= others[best] * ratio and value - others[best] >= min_ms:
+                    outliers.append(Outlier(kind, key, engine, value, best, others[best]))
+    outliers.sort(key=lambda o: o.median_ms - o.best_ms, reverse=True)
+    return medians, outliers
+
+
+def format_comparison(summary: Dict[str, Dict[str, Any]], outliers: Sequence[Outlier], top: int = 20) -> str:
+    engines = list(summary)
+    header = f"{'':<22}" + "".join(f"  {engine:>16}" for engine in engines)
+    lines = [header, "-" * len(header)]
+
+    def row(label: str, cell) -> None:
+        lines.append(f"{label:<22}" + "".join(f"  {cell(summary[engine]):>16}" for engine in engines))
+
+    row("passed", lambda s: f"{s['passed']}/{s['scenarios']}")
+    row("scenario p50/p95 s", lambda s: f"{s['scenario_s']['p50']:.1f} / {s['scenario_s']['p95']:.1f}")
+    for metric in LOAD_METRICS + ("interaction_ms",):
+        row(f"{metric[:-3]} p50/p95 ms", lambda s, m=metric: f"{s[m]['p50']:.0f} / {s[m]['p95']:.0f}")
+    row("loads / interactions", lambda s: f"{s['load_ms']['n']} / {s['interaction_ms']['n']}")
+    if outliers:
+        lines.append("\nengine-specific slowdowns (median vs fastest other engine):")
+    for o in outliers[:top]:
+        lines.append(
+            f"  {o.engine:<8}  {o.kind:<11}  {o.median_ms:>7.0f} ms  x{o.ratio:<4.1f} "
+            f"vs {o.best_engine} {o.best_ms:.0f} ms  {o.key[:70]}"
+        )
+    return "\n".join(lines)
+
+
+def format_scenarios(results: Sequence[ScenarioResult], engines: Sequence[str]) -> str:
+    """Seconds per scenario and engine; failed runs are marked with ``!``."""
+    cells: Dict[str, Dict[str, str]] = defaultdict(dict)
+    for r in results:
+        cells[r.name][r.engine] = f"{r.duration:.1f}{'' if r.passed else '!'}"
+    width = max([len(name) for name in cells] + [8])
+    header = f"{'scenario':<{width}}" + "".join(f"  {engine:>9}" for engine in engines)
+    lines = [header, "-" * len(header)]
+    for name in sorted(cells):
+        lines.append(f"{name:<{width}}" + "".join(f"  {cells[name].get(engine, '-'):>9}" for engine in engines))
+    return "\n".join(lines)
+
+
+def _plugins(args: argparse.Namespace) -> List[RunnerPlugin]:
+    plugins: List[RunnerPlugin] = []
+    if args.event_waits:
+        from .waits import EventWaits
+
+        plugins.append(EventWaits())
+    if args.sessions:
+        from .sessions import Sessions
+
+        plugins.append(Sessions())
+    return plugins
+
+
+async def run_matrix(
+    scenarios: Sequence[Scenario],
+    engines: Sequence[str],
+    args: argparse.Namespace,
+) -> Tuple[SuiteReport, List[EngineProbe]]:
+    """Launch every engine and run ``scenarios`` on all of them concurrently."""
+    started = time.perf_counter()
+    probes = [EngineProbe(engine) for engine in engines]
+
+    async with async_api.async_playwright() as pw:
+
+        async def one(probe: EngineProbe) -> List[ScenarioResult]:
+            # Plugins keep per-scenario state, so every engine gets its own.
+            plugins = [probe, *_plugins(args)]
+            browser = await launch(pw, probe.engine, not args.headed)
+            engine_started = time.perf_counter()
+            try:
+                for plugin in plugins:
+                    await plugin.on_suite_start(browser)
+                results = await execute(
+                    browser,
+                    scenarios,
+                    concurrency=args.concurrency,
+                    plugins=plugins,
+                    timeout=args.timeout,
+                    engine=probe.engine,
+                )
+                engine_report = SuiteReport(
+                    results=results,
+                    wall_time=time.perf_counter() - engine_started,
+                    concurrency=args.concurrency,
+                    engines=[probe.engine],
+                )
+                for plugin in plugins:
+                    await plugin.on_suite_end(engine_report)
+                return results
+            finally:
+                await browser.close()
+
+        per_engine = await asyncio.gather(*(one(probe) for probe in probes))
+    report = SuiteReport(
+        results=[r for results in per_engine for r in results],
+        wall_time=time.perf_counter() - started,
+        concurrency=args.concurrency * len(engines),
+        engines=list(engines),
+    )
+    return report, probes
+
+
+def _parse_engines(text: str) -> List[str]:
+    engines = [e.strip() for e in text.split(",") if e.strip()]
+    unknown = sorted(set(engines) - set(ENGINES))
+    if unknown or not engines:
+        raise argparse.ArgumentTypeError(f"engines must be a comma list of {', '.join(ENGINES)}, got {text!r}")
+    return engines
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.engines",
+        description="Run the booking and payment journeys on every browser engine and compare their latency.",
+    )
+    parser.add_argument(
+        "patterns", nargs="*", help=f"substrings of scenario file names (default: {' '.join(DEFAULT_PATTERNS)})"
+    )
+    parser.add_argument("--engines", type=_parse_engines, default=list(ENGINES), metavar="LIST")
+    parser.add_argument("-c", "--concurrency", type=int, default=2, help="scenarios in flight per engine")
+    parser.add_argument("--headed", action="store_true", help="show the browser windows")
+    parser.add_argument("--timeout", type=float, default=None, help="per-scenario timeout in seconds")
+    parser.add_argument("--event-waits", action="store_true", help="replace fixed sleeps with event-driven waits")
+    parser.add_argument("--sessions", action="store_true", help="start role-bound scenarios already logged in")
+    parser.add_argument("--ratio", type=float, default=1.5, help="slowdown factor that marks an engine outlier")
+    parser.add_argument("--min-ms", type=float, default=50.0, help="minimum absolute slowdown of an outlier")
+    parser.add_argument("--top", type=int, default=20, help="outliers to print")
+    parser.add_argument("--report", type=Path, default=DEFAULT_ENGINE_REPORT, help="JSON report path")
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    scenarios = discover(args.patterns or DEFAULT_PATTERNS)
+    if not scenarios:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    report, probes = asyncio.run(run_matrix(scenarios, args.engines, args))
+    summary = summarize(probes, report.results)
+    medians, outliers = compare(probes, ratio=args.ratio, min_ms=args.min_ms)
+
+    print(format_scenarios(report.results, args.engines))
+    print(f"{report.passed} passed, {report.failed} failed in {report.wall_time:.1f}s\n")
+    print(format_comparison(summary, outliers, args.top))
+    data = report.to_dict()
+    data.update(
+        engines=summary,
+        medians=medians,
+        outliers=[{**asdict(o), "ratio": round(o.ratio, 2)} for o in outliers],
+    )
+    args.report.parent.mkdir(parents=True, exist_ok=True)
+    args.report.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"Report written to {args.report}")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,449 @@
+"""Timing history across runs: regressions and flaky scenarios.
+
+``tmp/test_results.json`` only holds the last TestSprite cloud run.  With
+``--history`` the runner appends every run to a SQLite store
+(``tmp/history.sqlite``): one row per run (time, label, git commit), per
+scenario (status, seconds) and per step, where a step is the stretch of
+the script after one ``# -> ...`` comment up to the next (see
+``scenarios.py``; the time before the first comment is ``(setup)``).
+
+Regressions compare the durations of passing runs before and after a
+baseline with a one-sided Mann-Whitney U test (normal approximation with
+tie correction, so it needs no SciPy and makes no normality assumption).
+A scenario or step is reported when the slowdown is significant at
+``--alpha`` *and* its median grew by at least ``--min-ratio`` and
+``--min-seconds``, so tiny but consistent shifts do not drown the list.
+
+A scenario is flaky when its recent runs both passed and failed; the
+score is the share of consecutive runs whose outcome flipped, and runs
+that passed and failed on the same commit are called out::
+
+    python -m harness.runner --history --history-label nightly
+    python -m harness.history regressions                   # last 10 runs vs the 10 before
+    python -m harness.history regressions --since nightly --steps
+    python -m harness.history flaky --window 20
+    python -m harness.shard --history                       # the parent stores the merged run
+    python -m harness.history import tmp/run_report.json --label ci
+    python -m harness.history import-cloud                  # backfill tmp/test_results.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import re
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from statistics import median
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport
+from .scenarios import TESTS_DIR, Scenario
+
+DEFAULT_DB = TESTS_DIR / "tmp" / "history.sqlite"
+CLOUD_RESULTS = TESTS_DIR / "tmp" / "test_results.json"
+SETUP_STEP = "(setup)"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started REAL NOT NULL,
+    label TEXT,
+    commit_sha TEXT,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    run INTEGER NOT NULL REFERENCES runs(id),
+    scenario TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    engine TEXT,
+    PRIMARY KEY (run, scenario)
+);
+CREATE TABLE IF NOT EXISTS steps (
+    run INTEGER NOT NULL REFERENCES runs(id),
+    scenario TEXT NOT NULL,
+    step INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    PRIMARY KEY (run, scenario, step)
+);
+"""
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=TESTS_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+class History:
+    def __init__(self, path: Path = DEFAULT_DB):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    def add_run(
+        self,
+        results: Iterable[Dict[str, Any]],
+        *,
+        label: Optional[str] = None,
+        commit: Optional[str] = None,
+        source: str = "runner",
+        started: Optional[float] = None,
+    ) -> int:
+        """Store one run; ``results`` are ``ScenarioResult`` dicts as in ``run_report.json``."""
+        with self.db:
+            cursor = self.db.execute(
+                "INSERT INTO runs (started, label, commit_sha, source) VALUES (?, ?, ?, ?)",
+                (started or time.time(), label, commit, source),
+            )
+            run = cursor.lastrowid
+            for r in results:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                    (run, r["name"], r["status"], r["duration"], r.get("engine")),
+                )
+                for index, step in enumerate((r.get("extras") or {}).get("steps", [])):
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO steps VALUES (?, ?, ?, ?, ?)",
+                        (run, r["name"], index, step["name"], step["seconds"]),
+                    )
+        return int(run)
+
+    def runs(self, limit: int = 20) -> List[Tuple[int, float, Optional[str], Optional[str], str, int, int]]:
+        return self.db.execute(
+            """
+            SELECT r.id, r.started, r.label, r.commit_sha, r.source,
+                   COUNT(x.scenario), SUM(x.status = 'passed')
+            FROM runs r LEFT JOIN results x ON x.run = r.id
+            GROUP BY r.id ORDER BY r.id DESC LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+
+    def resolve(self, ref: str) -> Optional[int]:
+        """Run id, or the latest run with that label or commit prefix."""
+        if ref.isdigit():
+            row = self.db.execute("SELECT id FROM runs WHERE id = ?", (int(ref),)).fetchone()
+        else:
+            row = self.db.execute(
+                "SELECT id FROM runs WHERE label = ? OR commit_sha LIKE ? ORDER BY id DESC LIMIT 1",
+                (ref, f"{ref}%"),
+            ).fetchone()
+        return row[0] if row else None
+
+    def series(self, steps: bool = False) -> Dict[str, List[Tuple[int, float, str, Optional[str]]]]:
+        """``key -> [(run, seconds, status, commit)]`` in run order.
+
+        Step rows carry the status of their scenario in that run.
+        """
+        if steps:
+            query = """
+                SELECT s.scenario || ' / ' || printf('%02d ', s.step) || s.name, s.run, s.seconds, x.status, r.commit_sha
+                FROM steps s JOIN results x ON x.run = s.run AND x.scenario = s.scenario
+                JOIN runs r ON r.id = s.run ORDER BY s.run
+            """
+        else:
+            query = """
+                SELECT x.scenario, x.run, x.seconds, x.status, r.commit_sha
+                FROM results x JOIN runs r ON r.id = x.run ORDER BY x.run
+            """
+        out: Dict[str, List[Tuple[int, float, str, Optional[str]]]] = defaultdict(list)
+        for key, run, seconds, status, commit in self.db.execute(query):
+            out[key].append((run, seconds, status, commit))
+        return out
+
+
+def mann_whitney_greater(before: Sequence[float], after: Sequence[float]) -> Tuple[float, float]:
+    """U statistic of ``after`` and the one-sided p-value that it is larger.
+
+    Normal approximation with tie and continuity correction; reasonable
+    from about five samples per side.
+    """
+    n1, n2 = len(after), len(before)
+    if not n1 or not n2:
+        return 0.0, 1.0
+    pooled = sorted([(v, 0) for v in after] + [(v, 1) for v in before])
+    ranks = [0.0] * len(pooled)
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        t = j - i + 1
+        ties += t**3 - t
+        i = j + 1
+    rank_sum = sum(r for r, (_, side) in zip(ranks, pooled) if side == 0)
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+@dataclass
+class Regression:
+    key: str
+    before_median: float
+    after_median: float
+    p_value: float
+    effect: float  # probability that an "after" run is slower than a "before" run
+    n_before: int
+    n_after: int
+
+    @property
+    def ratio(self) -> float:
+        return self.after_median / self.before_median if self.before_median else float("inf")
+
+
+@dataclass
+class Flake:
+    scenario: str
+    runs: int
+    failures: int
+    flips: int
+    same_commit: List[str]
+
+    @property
+    def score(self) -> float:
+        return self.flips / (self.runs - 1) if self.runs > 1 else 0.0
+
+
+def find_regressions(
+    history: History,
+    *,
+    baseline: Optional[int] = None,
+    window: int = 10,
+    alpha: float = 0.01,
+    min_ratio: float = 1.1,
+    min_seconds: float = 0.25,
+    min_samples: int = 5,
+    steps: bool = False,
+) -> List[Regression]:
+    """Keys whose passing durations after ``baseline`` are significantly longer.
+
+    Without a baseline the last ``window`` runs are compared with the
+    ``window`` runs before them.
+    """
+    out = []
+    for key, rows in history.series(steps).items():
+        passing = [(run, seconds) for run, seconds, status, _ in rows if status == "passed"]
+        if baseline is None:
+            runs = sorted({run for run, _ in passing})
+            cut = runs[-window - 1] if len(runs) > window else None
+            if cut is None:
+                continue
+        else:
+            cut = baseline
+        before = [s for run, s in passing if run <= cut][-window:]
+        after = [s for run, s in passing if run > cut][-window:]
+        if len(before) < min_samples or len(after) < min_samples:
+            continue
+        u, p = mann_whitney_greater(before, after)
+        reg = Regression(key, median(before), median(after), p, u / (len(before) * len(after)), len(before), len(after))
+        if p < alpha and reg.ratio >= min_ratio and reg.after_median - reg.before_median >= min_seconds:
+            out.append(reg)
+    return sorted(out, key=lambda r: r.after_median - r.before_median, reverse=True)
+
+
+def find_flakes(history: History, *, window: int = 20, min_runs: int = 5) -> List[Flake]:
+    out = []
+    for scenario, rows in history.series().items():
+        recent = rows[-window:]
+        if len(recent) < min_runs:
+            continue
+        passed = [status == "passed" for _, _, status, _ in recent]
+        failures = passed.count(False)
+        if failures in (0, len(passed)):
+            continue
+        outcomes: Dict[str, set] = defaultdict(set)
+        for (_, _, _, commit), ok in zip(recent, passed):
+            if commit:
+                outcomes[commit].add(ok)
+        flips = sum(a != b for a, b in zip(passed, passed[1:]))
+        same = sorted(c for c, seen in outcomes.items() if len(seen) == 2)
+        out.append(Flake(scenario, len(recent), failures, flips, same))
+    return sorted(out, key=lambda f: (f.score, f.failures), reverse=True)
+
+
+class RunHistory(RunnerPlugin):
+    """Time the ``# -> ...`` steps and append the run to the history store.
+
+    With ``path=None`` steps are only timed; the shard workers do that and
+    leave storing the merged run to the parent.
+    """
+
+    def __init__(self, path: Optional[Path] = DEFAULT_DB, *, label: Optional[str] = None):
+        self.path = path
+        self.label = label
+        self._marks: Dict[str, List[Tuple[str, float]]] = {}
+
+    async def namespace(self, scenario: Scenario) -> Dict[str, Any]:
+        marks = self._marks[scenario.name] = [(SETUP_STEP, time.perf_counter())]
+
+        def step(index: int) -> None:
+            marks.append((scenario.steps[index], time.perf_counter()))
+
+        return {"__step__": step}
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        marks = self._marks.pop(scenario.name, [])
+        if len(marks) < 2:
+            return
+        ends = [t for _, t in marks[1:]] + [time.perf_counter()]
+        result.extras["steps"] = [
+            {"name": name, "seconds": round(end - start, 3)} for (name, start), end in zip(marks, ends)
+        ]
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        if self.path is not None:
+            record_run(report, self.path, label=self.label)
+
+
+def record_run(report: SuiteReport, path: Path = DEFAULT_DB, *, label: Optional[str] = None) -> int:
+    history = History(path)
+    try:
+        run = history.add_run(report.to_dict()["results"], label=label, commit=git_commit())
+    finally:
+        history.close()
+    print(f"Run {run} added to {path}")
+    return run
+
+
+def _cloud_results(path: Path) -> Tuple[List[Dict[str, Any]], Optional[float]]:
+    results, started = [], None
+    for entry in json.loads(path.read_text(encoding="utf-8")):
+        try:
+            created = datetime.fromisoformat(entry["created"].replace("Z", "+00:00"))
+            modified = datetime.fromisoformat(entry["modified"].replace("Z", "+00:00"))
+        except (KeyError, ValueError):
+            continue
+        started = min(started or created.timestamp(), created.timestamp())
+        name = re.sub(r"[^0-9A-Za-z]+", "_", entry.get("title", "")).strip("_")
+        status = "passed" if entry.get("testStatus") == "PASSED" else "failed"
+        results.append({"name": name, "status": status, "duration": (modified - created).total_seconds()})
+    return results, started
+
+
+def format_regressions(regressions: Sequence[Regression], top: int) -> str:
+    if not regressions:
+        return "No significant slowdowns."
+    width = max(len(r.key[:70]) for r in regressions[:top])
+    lines = [f"{'scenario / step':<{width}}  {'before':>7}  {'after':>7}  {'ratio':>6}  {'p':>8}  {'P(slower)':>9}"]
+    lines.append("-" * len(lines[0]))
+    for r in regressions[:top]:
+        lines.append(
+            f"{r.key[:70]:<{width}}  {r.before_median:>6.2f}s  {r.after_median:>6.2f}s  "
+            f"{r.ratio:>5.2f}x  {r.p_value:>8.1e}  {r.effect:>9.2f}"
+        )
+    return "\n".join(lines)
+
+
+def format_flakes(flakes: Sequence[Flake], top: int) -> str:
+    if not flakes:
+        return "No flaky scenarios."
+    width = max(len(f.scenario) for f in flakes[:top])
+    lines = [f"{'scenario':<{width}}  {'runs':>4}  {'fails':>5}  {'flips':>5}  {'score':>5}  same-commit"]
+    lines.append("-" * len(lines[0]))
+    for f in flakes[:top]:
+        lines.append(
+            f"{f.scenario:<{width}}  {f.runs:>4}  {f.failures:>5}  {f.flips:>5}  {f.score:>5.2f}  "
+            f"{', '.join(f.same_commit) or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.history",
+        description="Inspect the run history for timing regressions and flaky scenarios.",
+    )
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    runs = commands.add_parser("runs", help="list recorded runs")
+    runs.add_argument("-n", type=int, default=20)
+
+    reg = commands.add_parser("regressions", help="significant slowdowns since a baseline")
+    reg.add_argument("--since", default=None, help="baseline run id, label or commit (default: sliding window)")
+    reg.add_argument("--window", type=int, default=10, help="runs per side")
+    reg.add_argument("--alpha", type=float, default=0.01)
+    reg.add_argument("--min-ratio", type=float, default=1.1)
+    reg.add_argument("--min-seconds", type=float, default=0.25)
+    reg.add_argument("--steps", action="store_true", help="compare steps instead of whole scenarios")
+    reg.add_argument("--top", type=int, default=20)
+
+    flaky = commands.add_parser("flaky", help="scenarios that both pass and fail")
+    flaky.add_argument("--window", type=int, default=20)
+    flaky.add_argument("--top", type=int, default=20)
+
+    imp = commands.add_parser("import", help="add run_report.json files as runs")
+    imp.add_argument("reports", nargs="+", type=Path)
+    imp.add_argument("--label", default=None)
+
+    cloud = commands.add_parser("import-cloud", help="add the TestSprite cloud results as a run")
+    cloud.add_argument("path", nargs="?", type=Path, default=CLOUD_RESULTS)
+
+    args = parser.parse_args(argv)
+    history = History(args.db)
+    try:
+        if args.command == "runs":
+            for run, started, label, commit, source, total, passed in history.runs(args.n):
+                when = datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M")
+                print(f"{run:>5}  {when}  {passed or 0:>3}/{total:<3}  {source:<7}  {commit or '-':<9}  {label or ''}")
+        elif args.command == "regressions":
+            baseline = None
+            if args.since:
+                baseline = history.resolve(args.since)
+                if baseline is None:
+                    print(f"No run matches {args.since!r}.", file=sys.stderr)
+                    return 2
+            found = find_regressions(
+                history,
+                baseline=baseline,
+                window=args.window,
+                alpha=args.alpha,
+                min_ratio=args.min_ratio,
+                min_seconds=args.min_seconds,
+                steps=args.steps,
+            )
+            print(format_regressions(found, args.top))
+            return 1 if found else 0
+        elif args.command == "flaky":
+            print(format_flakes(find_flakes(history, window=args.window), args.top))
+        elif args.command == "import":
+            for path in args.reports:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                run = history.add_run(data["results"], label=args.label, source="import", started=path.stat().st_mtime)
+                print(f"{path} -> run {run}")
+        else:
+            results, started = _cloud_results(args.path)
+            run = history.add_run(results, label="cloud", source="cloud", started=started)
+            print(f"{len(results)} cloud results -> run {run}")
+    finally:
+        history.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""Select the scenarios a change can affect.
+
+Two halves:
+
+* ``ImpactRecorder`` (``runner --record-impact``) learns, per scenario,
+  which backend routes the page called and which frontend paths it
+  navigated to, and merges them into ``impact_map.json``.
+* The selector maps a git diff onto those routes and pages statically:
+  ``backend/src/server.ts`` gives each ``routes/*.ts`` its mount prefix,
+  each route's handlers are traced to the modules they are imported from,
+  and an import graph over ``backend/src`` and ``frontend`` carries a
+  change in a controller, model, component or service to every route or
+  ``app/**/page.tsx`` that depends on it.
+
+A scenario runs when it called an affected route, visited an affected
+page, was itself edited, or has no recorded traffic yet.  Anything the
+selector cannot place (``package.json``, ``server.ts``, ``next.config``,
+the harness itself, a file outside both trees) selects the full suite::
+
+    python -m harness.runner --record-impact          # refresh the map
+    python -m harness.impact --base origin/main       # list affected scenarios
+    python -m harness.impact --base origin/main --run -- -c 4 --sessions
+    python -m harness.impact --files backend/src/controllers/reviews.ts --explain
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from urllib.parse import urlparse
+
+from .api_client import route_of
+from .config import API_URL, FRONTEND_URL
+from .runner import RunnerPlugin, SuiteReport
+from .scenarios import TESTS_DIR, Scenario, discover
+
+REPO_ROOT = TESTS_DIR.parent
+BACKEND_SRC = REPO_ROOT / "backend" / "src"
+FRONTEND = REPO_ROOT / "frontend"
+DEFAULT_MAP = Path(__file__).resolve().parent / "impact_map.json"
+
+IGNORED = ("*.md", "docs/*", "backend/tests/*", "frontend/tests/*", "testsprite_tests/tmp/*", "*.http")
+# Files whose effect cannot be narrowed to particular routes or pages.
+GLOBAL = (
+    "backend/package*.json",
+    "backend/tsconfig.json",
+    "backend/src/server.ts",
+    "frontend/package*.json",
+    "frontend/pnpm-lock.yaml",
+    "frontend/next.config.*",
+    "frontend/middleware.ts",
+    "frontend/tailwind.config.*",
+    "frontend/tsconfig.json",
+    "frontend/app/layout.tsx",
+    "frontend/app/globals.css",
+    "ecosystem.config.js",
+    "testsprite_tests/harness/*",
+)
+
+_IMPORT = re.compile(
+    r"""(?:import|export)\s[^'";]*?from\s*['"]([^'"]+)['"]|import\s*\(\s*['"]([^'"]+)['"]|"""
+    r"""require\(\s*['"]([^'"]+)['"]\s*\)|import\s+['"]([^'"]+)['"]"""
+)
+_NAMED_IMPORT = re.compile(r"import\s+(?:(\w+)\s*,?\s*)?(?:\{([^}]*)\})?\s*from\s*['\"]([^'\"]+)['\"]")
+_EXTENSIONS = ("", ".ts", ".tsx", ".js", ".jsx", "/index.ts", "/index.tsx", "/index.js")
+
+
+class ImportGraph:
+    """File-level import graph of a TypeScript tree."""
+
+    def __init__(self, root: Path, aliases: Optional[Dict[str, Path]] = None):
+        self.root = root
+        self.aliases = aliases or {}
+        self.imports: Dict[Path, Set[Path]] = {}
+        self.importers: Dict[Path, Set[Path]] = defaultdict(set)
+        for path in root.rglob("*"):
+            if path.suffix in (".ts", ".tsx", ".js", ".jsx") and "node_modules" not in path.parts:
+                if ".next" in path.parts or "dist" in path.parts:
+                    continue
+                self._scan(path.resolve())
+
+    def resolve(self, source: Path, spec: str) -> Optional[Path]:
+        base: Optional[Path] = None
+        for prefix, target in self.aliases.items():
+            if spec.startswith(prefix):
+                base = target / spec[len(prefix):]
+                break
+        if base is None:
+            if not spec.startswith("."):
+                return None  # a package
+            base = source.parent / spec
+        for ext in _EXTENSIONS:
+            candidate = Path(f"{base}{ext}")
+            if candidate.is_file():
+                return candidate.resolve()
+        return None
+
+    def _scan(self, path: Path) -> None:
+        text = path.read_text(encoding="utf-8", errors="replace")
+        deps = set()
+        for match in _IMPORT.finditer(text):
+            spec = next(g for g in match.groups() if g)
+            target = self.resolve(path, spec)
+            if target is not None:
+                deps.add(target)
+                self.importers[target].add(path)
+        self.imports[path] = deps
+
+    def dependents(self, path: Path) -> Set[Path]:
+        """``path`` and every file that imports it, directly or not."""
+        seen = {path.resolve()}
+        queue = deque(seen)
+        while queue:
+            for importer in self.importers.get(queue.popleft(), ()):
+                if importer not in seen:
+                    seen.add(importer)
+                    queue.append(importer)
+        return seen
+
+
+@dataclass
+class RouteDef:
+    method: str
+    path: str  # full path with :params, e.g. /api/bookings/:id
+    file: Path
+    handler_modules: Set[Path] = field(default_factory=set)
+
+    @property
+    def key(self) -> str:
+        return f"{self.method} {self.path}"
+
+
+def route_matches(declared: str, recorded: str) -> bool:
+    """``GET /api/bookings/:bookingId`` matches the recorded ``GET /api/bookings/:id``."""
+    method, _, path = declared.partition(" ")
+    seen_method, _, seen_path = recorded.partition(" ")
+    if method != seen_method:
+        return False
+    ours, theirs = path.strip("/").split("/"), seen_path.strip("/").split("/")
+    return len(ours) == len(theirs) and all(a == b or a.startswith(":") for a, b in zip(ours, theirs))
+
+
+def _call_args(text: str, start: int) -> Tuple[str, int]:
+    """Text between the parenthesis at ``start`` and its match."""
+    depth, i = 0, start
+    while i < len(text):
+        if text[i] == "(":
+            depth += 1
+        elif text[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return text[start + 1 : i], i + 1
+        i += 1
+    return text[start + 1 :], len(text)
+
+
+_VERB = re.compile(r"\.(get|post|put|patch|delete)\s*\(")
+_DIRECT = re.compile(r"router\s*\.(get|post|put|patch|delete)\s*\(")
+_CHAIN = re.compile(r"router\s*\.route\(\s*['\"]([^'\"]+)['\"]\s*\)")
+_STRING = re.compile(r"^\s*['\"]([^'\"]*)['\"]")
+_IDENT = re.compile(r"\b[A-Za-z_]\w*\b")
+
+
+def _mounts(server: Path, graph: ImportGraph) -> Dict[Path, str]:
+    text = server.read_text(encoding="utf-8")
+    modules = {m.group(1): graph.resolve(server, m.group(3)) for m in _NAMED_IMPORT.finditer(text) if m.group(1)}
+    mounts = {}
+    for prefix, name in re.findall(r"app\.use\(\s*['\"]([^'\"]+)['\"]\s*,\s*(\w+)\s*\)", text):
+        if modules.get(name) is not None:
+            mounts[modules[name]] = prefix.rstrip("/")
+    return mounts
+
+
+def backend_routes(graph: ImportGraph, src: Path = BACKEND_SRC) -> List[RouteDef]:
+    routes: List[RouteDef] = []
+    for file, prefix in _mounts(src / "server.ts", graph).items():
+        text = file.read_text(encoding="utf-8")
+        origin: Dict[str, Path] = {}
+        for default, named, spec in _NAMED_IMPORT.findall(text):
+            target = graph.resolve(file, spec)
+            if target is None:
+                continue
+            names = [default] if default else []
+            names += [n.split(" as ")[-1].strip() for n in named.split(",") if n.strip()]
+            origin.update({n: target for n in names})
+
+        def add(method: str, sub: str, args: str) -> None:
+            path = (prefix + ("" if sub == "/" else sub)) or "/"
+            modules = {origin[name] for name in _IDENT.findall(args) if name in origin}
+            routes.append(RouteDef(method.upper(), path, file, modules or {file}))
+
+        for match in _DIRECT.finditer(text):
+            args, _ = _call_args(text, match.end() - 1)
+            sub = _STRING.match(args)
+            if sub:
+                add(match.group(1), sub.group(1), args)
+        for match in _CHAIN.finditer(text):
+            statement = text[match.end() : text.find(";", match.end())]
+            for verb in _VERB.finditer(statement):
+                args, _ = _call_args(statement, verb.end() - 1)
+                add(verb.group(1), match.group(1), args)
+    return routes
+
+
+def _page_pattern(page: Path, app: Path) -> str:
+    parts = []
+    for part in page.parent.relative_to(app).parts:
+        if part.startswith("(") and part.endswith(")"):
+            continue
+        if part.startswith("[[...") or part.startswith("[..."):
+            parts.append("**")
+        elif part.startswith("["):
+            parts.append("*")
+        else:
+            parts.append(part)
+    return "/" + "/".join(parts)
+
+
+def page_matches(pattern: str, path: str) -> bool:
+    ours, theirs = pattern.strip("/").split("/"), path.strip("/").split("/")
+    if ours == [""]:
+        return theirs == [""]
+    for i, segment in enumerate(ours):
+        if segment == "**":
+            return True
+        if i >= len(theirs) or (segment != "*" and segment != theirs[i]):
+            return False
+    return len(ours) == len(theirs)
+
+
+@dataclass
+class Impact:
+    full: bool = False
+    reasons: List[str] = field(default_factory=list)
+    routes: Set[str] = field(default_factory=set)
+    pages: Set[str] = field(default_factory=set)
+    scenarios: Set[str] = field(default_factory=set)  # edited scenario files
+
+
+class ChangeAnalyzer:
+    def __init__(self) -> None:
+        self.backend = ImportGraph(BACKEND_SRC)
+        self.frontend = ImportGraph(FRONTEND, {"@/": FRONTEND})
+        self.routes = backend_routes(self.backend)
+        app = FRONTEND / "app"
+        self.pages = {p.resolve(): _page_pattern(p, app) for p in app.rglob("page.tsx")}
+        self.routes_files = {r.file for r in self.routes}
+
+    def _backend(self, path: Path, impact: Impact) -> None:
+        affected = self.backend.dependents(path)
+        handlers: Dict[Path, Set[Path]] = defaultdict(set)
+        for route in self.routes:
+            handlers[route.file] |= route.handler_modules
+        for route in self.routes:
+            # A routes file that reaches the change other than through a
+            # handler module (middleware, validators) exposes every route.
+            other = self.backend.imports.get(route.file, set()) - handlers[route.file]
+            if route.file == path.resolve() or route.handler_modules & affected or other & affected:
+                impact.routes.add(route.key)
+
+    def _frontend(self, path: Path, impact: Impact) -> None:
+        affected = self.frontend.dependents(path)
+        app = (FRONTEND / "app").resolve()
+        for page, pattern in self.pages.items():
+            # Layouts, loading and error boundaries wrap every page below them.
+            wrapped = any(
+                f.parent in page.parents or f.parent == page.parent
+                for f in affected
+                if f.stem in ("layout", "template", "loading", "error", "not-found") and app in f.parents
+            )
+            if page in affected or wrapped:
+                impact.pages.add(pattern)
+
+    def analyze(self, changed: Iterable[str]) -> Impact:
+        impact = Impact()
+        for rel in changed:
+            path = REPO_ROOT / rel
+            if any(fnmatch(rel, pattern) for pattern in IGNORED):
+                continue
+            if any(fnmatch(rel, pattern) for pattern in GLOBAL):
+                impact.full = True
+                impact.reasons.append(f"{rel}: affects everything")
+            elif rel.startswith("testsprite_tests/") and re.match(r"TC\d+", path.name):
+                impact.scenarios.add(path.stem)
+            elif rel.startswith("backend/src/") and path.suffix == ".ts":
+                if path.exists():
+                    self._backend(path, impact)
+                else:
+                    impact.full = True
+                    impact.reasons.append(f"{rel}: deleted backend module")
+            elif rel.startswith("frontend/") and path.suffix in (".ts", ".tsx", ".js", ".jsx", ".css"):
+                if path.exists() and path.suffix != ".css":
+                    self._frontend(path, impact)
+                else:
+                    impact.full = True
+                    impact.reasons.append(f"{rel}: cannot trace")
+            else:
+                impact.full = True
+                impact.reasons.append(f"{rel}: not mapped to routes or pages")
+        return impact
+
+
+def load_map(path: Path = DEFAULT_MAP) -> Dict[str, Dict[str, List[str]]]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def select(
+    scenarios: Sequence[Scenario], impact: Impact, traffic: Dict[str, Dict[str, List[str]]]
+) -> Dict[str, str]:
+    """Scenario name -> why it was selected."""
+    if impact.full:
+        return {s.name: "full suite" for s in scenarios}
+    chosen: Dict[str, str] = {}
+    for s in scenarios:
+        seen = traffic.get(s.name)
+        if s.name in impact.scenarios:
+            chosen[s.name] = "scenario edited"
+        elif seen is None:
+            chosen[s.name] = "no recorded traffic"
+        else:
+            hit_route = next(
+                (r for r in seen.get("api", []) if any(route_matches(d, r) for d in impact.routes)), None
+            )
+            hit_page = next(
+                (p for p in seen.get("pages", []) if any(page_matches(pat, p) for pat in impact.pages)), None
+            )
+            if hit_route:
+                chosen[s.name] = f"calls {hit_route}"
+            elif hit_page:
+                chosen[s.name] = f"visits {hit_page}"
+    return chosen
+
+
+class ImpactRecorder(RunnerPlugin):
+    """Record the API routes and frontend paths each scenario touches."""
+
+    def __init__(self, path: Path = DEFAULT_MAP):
+        self.path = path
+        self.api_host = urlparse(API_URL).netloc
+        self.frontend_host = urlparse(FRONTEND_URL).netloc
+        self.seen: Dict[str, Dict[str, Set[str]]] = defaultdict(lambda: {"api": set(), "pages": set()})
+
+    async def on_context(self, scenario: Scenario, context) -> None:  # type: ignore[no-untyped-def]
+        seen = self.seen[scenario.name]
+
+        def on_request(request) -> None:  # type: ignore[no-untyped-def]
+            if urlparse(request.url).netloc == self.api_host:
+                seen["api"].add(route_of(request.method, request.url))
+
+        def on_page(page) -> None:  # type: ignore[no-untyped-def]
+            def on_navigate(frame) -> None:  # type: ignore[no-untyped-def]
+                url = urlparse(frame.url)
+                if frame == page.main_frame and url.netloc == self.frontend_host:
+                    seen["pages"].add(url.path or "/")
+
+            page.on("framenavigated", on_navigate)
+
+        context.on("request", on_request)
+        context.on("page", on_page)
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        data = load_map(self.path)
+        for name, seen in self.seen.items():
+            data[name] = {key: sorted(values) for key, values in seen.items()}
+        self.path.write_text(json.dumps(dict(sorted(data.items())), indent=2) + "\n", encoding="utf-8")
+
+
+def changed_files(base: str) -> List[str]:
+    """Files changed between ``base`` and the working tree (committed or not)."""
+    def git(*args: str) -> List[str]:
+        out = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout
+        return [line for line in out.splitlines() if line]
+
+    files = set(git("diff", "--name-only", f"{base}...HEAD"))
+    files.update(git("diff", "--name-only", "HEAD"))
+    files.update(git("ls-files", "--others", "--exclude-standard"))
+    return sorted(files)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    passthrough: List[str] = []
+    if "--" in argv:
+        passthrough = argv[argv.index("--") + 1 :]
+        argv = argv[: argv.index("--")]
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.impact",
+        description="Pick the TestSprite scenarios affected by a change.",
+    )
+    parser.add_argument("--base", default="origin/main", help="git ref to diff against")
+    parser.add_argument("--files", nargs="*", default=None, help="changed files (skips git)")
+    parser.add_argument("--map", type=Path, default=DEFAULT_MAP)
+    parser.add_argument("--explain", action="store_true", help="show affected routes and pages")
+    parser.add_argument("--run", action="store_true", help="run the selection (runner args after --)")
+    args = parser.parse_args(argv)
+
+    scenarios = discover()
+    try:
+        files = args.files if args.files is not None else changed_files(args.base)
+        impact = ChangeAnalyzer().analyze(files)
+    except (OSError, subprocess.CalledProcessError) as exc:
+        impact = Impact(full=True, reasons=[f"could not diff against {args.base}: {exc}"])
+    traffic = load_map(args.map)
+    if not traffic and not impact.full:
+        impact.full = True
+        impact.reasons.append(f"no traffic recorded in {args.map.name}; run the runner with --record-impact")
+
+    chosen = select(scenarios, impact, traffic)
+    if args.explain:
+        for reason in impact.reasons:
+            print(f"full suite: {reason}")
+        for route in sorted(impact.routes):
+            print(f"route  {route}")
+        for page in sorted(impact.pages):
+            print(f"page   {page}")
+    for name, why in sorted(chosen.items()):
+        print(f"{name}  ({why})")
+    print(f"{len(chosen)} of {len(scenarios)} scenarios selected", file=sys.stderr)
+
+    if not args.run or not chosen:
+        return 0
+    from .runner import main as run
+
+    return run([*passthrough, *sorted(chosen)])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,427 @@
+"""Replay SSLCommerz IPN callbacks at peak-day rates.
+
+``PaymentsService.handleIPN`` validates every callback against the
+gateway's ``validationserverAPI.php`` (axios, 8 s timeout) before
+``markSuccess`` / ``markFailure``.  This tool starts a local validator
+stand-in with configurable latency, errors and timeouts, and fires IPN
+callbacks at ``POST /api/payments/ipn``:
+
+* ``--log backend/logs/payment-callbacks.log`` replays the recorded
+  payments: each ``init-payload`` becomes one IPN, ``VALID`` if the
+  payment later logged ``success`` and ``FAILED`` if it logged ``fail``
+  or ``cancel``.  ``--speed`` compresses the recorded spacing;
+  ``--rate`` ignores it and sends at a fixed arrival rate.  ``--loop``
+  repeats the log with fresh ``tran_id``s.
+* without ``--log``, ``--synthetic N`` callbacks are generated.
+
+``--duplicates`` re-sends a fraction of callbacks ``--dup-count`` times
+(concurrently, or ``--dup-delay`` ms apart), like a gateway retrying an
+unacknowledged IPN.  With ``--uri`` the replayed payments are inserted
+as ``PENDING`` first and checked afterwards for a wrong final status and
+for extra ``statusHistory`` entries pushed by duplicates.
+
+Start the backend with ``SSL_VALIDATOR_URL`` pointing at the stand-in::
+
+    SSL_VALIDATOR_URL=http://127.0.0.1:5099 npm run dev          # in backend/
+    python -m harness.ipn_replay --synthetic 5000 --rate 300 --validator-latency 120~80 \\
+        --duplicates 0.1 --uri mongodb://localhost:27017/educonnect
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from aiohttp import web
+
+from .api_client import ApiClient
+from .metrics import LatencyRecorder, percentile
+from .scenarios import TESTS_DIR
+from .stub_backend import _parse_override
+
+DEFAULT_LOG = TESTS_DIR.parent / "backend" / "logs" / "payment-callbacks.log"
+DEFAULT_OUTPUT = TESTS_DIR / "tmp" / "ipn_replay.json"
+IPN = "POST /api/payments/ipn"
+VALIDATOR_PATH = "/validator/api/validationserverAPI.php"
+
+
+@dataclass
+class IpnEvent:
+    at: float  # seconds after the first event
+    tran_id: str
+    status: str  # VALID or FAILED, what the gateway will confirm
+    amount: float
+
+
+def load_log(path: Path) -> List[IpnEvent]:
+    """IPN events for every logged payment that reached an outcome."""
+    started: Dict[str, Dict[str, Any]] = {}
+    outcome: Dict[str, tuple] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        payload, event = entry.get("payload") or {}, entry.get("event")
+        tran_id = payload.get("tran_id")
+        if not tran_id:
+            continue
+        ts = datetime.fromisoformat(entry["ts"].replace("Z", "+00:00")).timestamp()
+        if event == "init-payload":
+            started[tran_id] = {"amount": payload.get("amount", 0)}
+        elif event in ("success", "fail", "cancel", "ipn") and tran_id not in outcome:
+            ok = event == "success" or payload.get("status") == "SUCCESS"
+            outcome[tran_id] = (ts, "VALID" if ok else "FAILED")
+    events = [
+        IpnEvent(ts, tran_id, status, float(started[tran_id]["amount"]))
+        for tran_id, (ts, status) in outcome.items()
+        if tran_id in started
+    ]
+    events.sort(key=lambda e: e.at)
+    first = events[0].at if events else 0.0
+    for event in events:
+        event.at -= first
+    return events
+
+
+def synthetic(count: int, fail_rate: float, rng: random.Random) -> List[IpnEvent]:
+    events = []
+    for _ in range(count):
+        status = "FAILED" if rng.random() < fail_rate else "VALID"
+        tran_id = str(uuid.UUID(int=rng.getrandbits(128)))
+        events.append(IpnEvent(0.0, tran_id, status, rng.choice([300, 500, 800, 1200])))
+    return events
+
+
+def schedule(events: List[IpnEvent], *, rate: Optional[float], speed: float, loop: int) -> List[IpnEvent]:
+    """Send times for ``loop`` copies of ``events`` (fresh tran_ids after the first)."""
+    out: List[IpnEvent] = []
+    span = (events[-1].at if events else 0.0) / speed
+    for n in range(loop):
+        for event in events:
+            tran_id = event.tran_id if n == 0 else f"{event.tran_id}-r{n}"
+            out.append(IpnEvent(event.at / speed + n * span, tran_id, event.status, event.amount))
+    if rate:
+        for i, event in enumerate(out):
+            event.at = i / rate
+    return out
+
+
+class FakeValidator:
+    """Answers ``validationserverAPI.php`` the way the sandbox does.
+
+    Outcomes are registered per ``val_id`` by the replayer; a fraction of
+    calls can fail with HTTP 500 or hang past the backend's 8 s timeout.
+    """
+
+    def __init__(
+        self,
+        *,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 5099,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.rng = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.outcomes: Dict[str, IpnEvent] = {}
+        self.calls: Counter = Counter()  # by tran_id
+        self.injected: Counter = Counter()
+        self.recorder = LatencyRecorder()
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def handle(self, request: web.Request) -> web.Response:
+        started = time.perf_counter()
+        event = self.outcomes.get(request.query.get("val_id", ""))
+        if event is not None:
+            self.calls[event.tran_id] += 1
+        roll = self.rng.random()
+        delay = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        fault = None
+        if roll < self.timeout_rate:
+            fault, delay = "timeout", 10.0  # past the backend's 8 s axios timeout
+        elif roll < self.timeout_rate + self.error_rate:
+            fault = "error"
+        await asyncio.sleep(delay)
+        self.recorder.record("validator", time.perf_counter() - started, ok=fault is None)
+        if fault:
+            self.injected[fault] += 1
+        if fault == "error":
+            return web.json_response({"status": "ERROR"}, status=500)
+        if event is None:
+            return web.json_response({"status": "INVALID_TRANSACTION"})
+        return web.json_response(
+            {
+                "status": event.status,
+                "tran_id": event.tran_id,
+                "val_id": request.query.get("val_id"),
+                "amount": f"{event.amount:.2f}",
+                "currency": "BDT",
+            }
+        )
+
+    async def __aenter__(self) -> "FakeValidator":
+        app = web.Application()
+        app.router.add_get(VALIDATOR_PATH, self.handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+
+def prepare_payments(uri: str, events: Sequence[IpnEvent]) -> None:
+    """Insert a PENDING Payment per replayed ``tran_id`` (skipping existing ones)."""
+    from bson import ObjectId
+    from pymongo import MongoClient, UpdateOne
+
+    now = datetime.now(timezone.utc)
+    client = MongoClient(uri)
+    try:
+        client.get_default_database().payments.bulk_write(
+            [
+                UpdateOne(
+                    {"transactionId": e.tran_id},
+                    {
+                        "$setOnInsert": {
+                            "gigId": ObjectId(),
+                            "studentId": ObjectId(),
+                            "teacherId": ObjectId(),
+                            "amount": e.amount,
+                            "status": "PENDING",
+                            "statusHistory": [{"status": "PENDING", "at": now}],
+                            "createdAt": now,
+                            "updatedAt": now,
+                            "__v": 0,
+                        }
+                    },
+                    upsert=True,
+                )
+                for e in events
+            ],
+            ordered=False,
+        )
+    finally:
+        client.close()
+
+
+def check_payments(uri: str, events: Sequence[IpnEvent]) -> Dict[str, int]:
+    from pymongo import MongoClient
+
+    expected = {e.tran_id: "SUCCESS" if e.status == "VALID" else "FAILED" for e in events}
+    client = MongoClient(uri)
+    try:
+        docs = client.get_default_database().payments.find(
+            {"transactionId": {"$in": list(expected)}}, {"transactionId": 1, "status": 1, "statusHistory": 1}
+        )
+        wrong = extra = 0
+        for doc in docs:
+            wrong += doc.get("status") != expected[doc["transactionId"]]
+            # One PENDING entry plus one per applied callback.
+            extra += max(0, len(doc.get("statusHistory") or []) - 2)
+    finally:
+        client.close()
+    return {"wrong_status": wrong, "extra_history_entries": extra}
+
+
+async def replay(
+    events: Sequence[IpnEvent],
+    validator: FakeValidator,
+    *,
+    duplicates: float = 0.0,
+    dup_count: int = 2,
+    dup_delay_ms: float = 0.0,
+    connections: int = 0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    recorder = LatencyRecorder()
+    lateness: List[float] = []
+    answers: Counter = Counter()
+    mismatched = 0
+
+    async def send(event: IpnEvent, copy: int, start: float) -> None:
+        nonlocal mismatched
+        target = start + event.at + copy * dup_delay_ms / 1000
+        await asyncio.sleep(max(0.0, target - time.perf_counter()))
+        lateness.append(time.perf_counter() - target)
+        val_id = f"{event.tran_id}-v"
+        validator.outcomes[val_id] = event
+        resp = await client.post(
+            "/api/payments/ipn",
+            json={"tran_id": event.tran_id, "val_id": val_id, "status": event.status, "amount": event.amount},
+            name=IPN if copy == 0 else f"{IPN} (duplicate)",
+        )
+        applied = resp.body.get("status") if isinstance(resp.body, dict) else None
+        answers[applied or f"HTTP {resp.status}"] += 1
+        mismatched += applied is not None and applied != ("SUCCESS" if event.status == "VALID" else "FAILED")
+
+    async with ApiClient(recorder, connections=connections) as client:
+        started = time.perf_counter()
+        recorder.started = started
+        tasks = []
+        for event in events:
+            copies = dup_count if rng.random() < duplicates else 1
+            tasks += [send(event, copy, started) for copy in range(copies)]
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - started
+
+    lateness.sort()
+    summary = recorder.summary(elapsed)
+    sent = sum(s["count"] for s in summary.values())
+    revalidated = sum(max(0, n - 1) for n in validator.calls.values())
+    return {
+        "callbacks": len(events),
+        "sent": sent,
+        "elapsed_s": elapsed,
+        "callbacks_per_s": sent / elapsed if elapsed else 0.0,
+        "latency": summary,
+        "schedule_lag_ms": {"p50": percentile(lateness, 50) * 1000, "p99": percentile(lateness, 99) * 1000},
+        "answers": dict(answers),
+        "unexpected_status": mismatched,
+        "validator": {
+            "calls": sum(validator.calls.values()),
+            "revalidated": revalidated,
+            "injected": dict(validator.injected),
+            "latency": validator.recorder.summary(elapsed).get("validator", {}),
+        },
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{'route':<36}  {'count':>6}  {'err%':>6}  {'p50':>7}  {'p95':>7}  {'p99':>7}  {'max':>7}",
+    ]
+    lines.append("-" * len(lines[0]))
+    rows = dict(report["latency"])
+    if report["validator"]["latency"]:
+        rows["validator (stand-in)"] = report["validator"]["latency"]
+    for name, s in rows.items():
+        lines.append(
+            f"{name:<36}  {s['count']:>6}  {s['error_rate'] * 100:>5.1f}%  {s['p50_ms']:>7.0f}  "
+            f"{s['p95_ms']:>7.0f}  {s['p99_ms']:>7.0f}  {s['max_ms']:>7.0f}"
+        )
+    lines.append(
+        f"{report['sent']} callbacks ({report['callbacks']} distinct) in {report['elapsed_s']:.1f}s = "
+        f"{report['callbacks_per_s']:.1f}/s; schedule lag p99 {report['schedule_lag_ms']['p99']:.0f} ms"
+    )
+    answers = ", ".join(f"{k} {v}" for k, v in sorted(report["answers"].items()))
+    lines.append(f"answers: {answers}; {report['unexpected_status']} disagreed with the gateway outcome")
+    v = report["validator"]
+    lines.append(
+        f"validator: {v['calls']} calls, {v['revalidated']} repeated for an already validated tran_id, "
+        f"injected {v['injected'] or 'nothing'}"
+    )
+    if "payments" in report:
+        p = report["payments"]
+        lines.append(
+            f"payments: {p['wrong_status']} with a wrong final status, "
+            f"{p['extra_history_entries']} extra statusHistory entries from duplicates"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.ipn_replay",
+        description="Replay SSLCommerz IPN callbacks against the backend with a local validator stand-in.",
+    )
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--log", type=Path, default=None, help=f"payment log to replay (e.g. {DEFAULT_LOG})")
+    source.add_argument("--synthetic", type=int, default=1000, help="number of generated callbacks")
+    parser.add_argument("--fail-rate", type=float, default=0.05, help="FAILED share of synthetic callbacks")
+    parser.add_argument("--rate", type=float, default=None, help="callbacks per second (default: log timing)")
+    parser.add_argument("--speed", type=float, default=1.0, help="compress recorded spacing by this factor")
+    parser.add_argument("--loop", type=int, default=1, help="repeat the log with fresh tran_ids")
+    parser.add_argument("--duplicates", type=float, default=0.0, help="fraction of callbacks sent more than once")
+    parser.add_argument("--dup-count", type=int, default=2)
+    parser.add_argument("--dup-delay", type=float, default=0.0, help="ms between copies of a duplicate")
+    parser.add_argument("--validator-latency", default="50~20", metavar="MS[~JITTER]")
+    parser.add_argument("--validator-error-rate", type=float, default=0.0)
+    parser.add_argument("--validator-timeout-rate", type=float, default=0.0)
+    parser.add_argument("--validator-port", type=int, default=5099)
+    parser.add_argument("-c", "--connections", type=int, default=0, help="client connection cap (0 = unlimited)")
+    parser.add_argument("--uri", default=None, help="MongoDB URI to seed and check the replayed payments")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    if args.log:
+        events = load_log(args.log)
+        if not events:
+            print(f"{args.log} has no payments with an outcome to replay")
+            return 2
+        rate = args.rate
+    else:
+        events = synthetic(args.synthetic, args.fail_rate, rng)
+        rate = args.rate or 200.0
+    events = schedule(events, rate=rate, speed=args.speed, loop=args.loop)
+    if args.uri:
+        prepare_payments(args.uri, events)
+
+    _, latency, jitter = _parse_override(args.validator_latency)
+    validator = FakeValidator(
+        latency_ms=latency,
+        jitter_ms=jitter,
+        error_rate=args.validator_error_rate,
+        timeout_rate=args.validator_timeout_rate,
+        seed=args.seed,
+        port=args.validator_port,
+    )
+
+    async def run() -> Dict[str, Any]:
+        async with validator:
+            print(f"[ipn] validator stand-in on {validator.url}; {len(events)} callbacks queued", file=sys.stderr)
+            return await replay(
+                events,
+                validator,
+                duplicates=args.duplicates,
+                dup_count=args.dup_count,
+                dup_delay_ms=args.dup_delay,
+                connections=args.connections,
+                seed=args.seed,
+            )
+
+    report = asyncio.run(run())
+    if report["validator"]["calls"] == 0 and report["sent"]:
+        print("warning: the backend never called the stand-in; is it running with SSL_VALIDATOR_URL set?")
+    if args.uri:
+        report["payments"] = check_payments(args.uri, events)
+
+    print(format_report(report))
+    output: Path = args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
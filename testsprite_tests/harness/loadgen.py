@@ -0,0 +1,359 @@
+"""HTTP load generator replaying the EduConnect user journeys.
+
+The journeys mirror what the TestSprite scenarios do through the UI, at
+the API level only, so a run needs nothing but the backend on port 5000
+with its local MongoDB and Redis (no Clerk, SSLCommerz or Cloudinary):
+
+* ``browse``  - anonymous ``GET /api/gigs`` with category / sort / page
+* ``student`` - login, browse, ``POST /api/bookings``, then
+  ``POST /api/bookings/:id/payment/submit`` once the booking is accepted
+* ``teacher`` - login, ``GET /api/bookings?status=pending``, then
+  ``PUT /api/bookings/:id`` to accept or reject
+
+Virtual users are scaled along a ramp profile of ``duration:users``
+stages, with linear interpolation inside each stage::
+
+    python -m harness.loadgen --ramp 30s:20,2m:20,30s:0 --think 0.5
+
+Start the backend with ``NODE_ENV=development`` (or a raised
+``RATE_LIMIT_MAX_REQUESTS``); otherwise the rate limiter answers most of
+the traffic with 429.
+"""
+
+from __future__ import annotations
+
+import abc
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .api_client import ApiClient
+from .metrics import LatencyRecorder
+
+CATEGORIES = [
+    "Mathematics",
+    "Science",
+    "English",
+    "History",
+    "Computer Science",
+    "Art",
+    "Languages",
+    "Programming",
+]
+SORTS = ["", "newest", "price_low", "price_high", "rating", "popular"]
+PASSWORD = "Load-Passw0rd!"
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)(ms|s|m|h)?$")
+
+
+def parse_duration(text: str) -> float:
+    """``"90"``, ``"90s"``, ``"2m"``, ``"1h"`` -> seconds."""
+    match = _DURATION.match(text.strip())
+    if not match:
+        raise ValueError(f"invalid duration {text!r}")
+    value, unit = float(match.group(1)), match.group(2) or "s"
+    return value * {"ms": 0.001, "s": 1, "m": 60, "h": 3600}[unit]
+
+
+@dataclass(frozen=True)
+class Stage:
+    duration: float
+    users: int
+
+
+def parse_ramp(text: str) -> List[Stage]:
+    """``"30s:10,2m:50,30s:0"`` -> ramp to 10 users over 30 s, to 50 over 2 min, down to 0."""
+    stages = []
+    for part in text.split(","):
+        duration, _, users = part.partition(":")
+        stages.append(Stage(parse_duration(duration), int(users)))
+    return stages
+
+
+def target_users(stages: Sequence[Stage], elapsed: float) -> Optional[int]:
+    """Users wanted ``elapsed`` seconds into the run, or None once it is over."""
+    previous = 0
+    for stage in stages:
+        if elapsed < stage.duration:
+            fraction = elapsed / stage.duration if stage.duration else 1.0
+            return round(previous + (stage.users - previous) * fraction)
+        elapsed -= stage.duration
+        previous = stage.users
+    return None
+
+
+@dataclass
+class Account:
+    role: str
+    email: str
+    token: str
+    user_id: str
+
+
+@dataclass
+class World:
+    """Fixtures and hand-off queues shared by all virtual users."""
+
+    run_id: str
+    gigs: List[Tuple[str, str]] = field(default_factory=list)  # (gig id, teacher id)
+    teachers: Dict[str, Account] = field(default_factory=dict)  # by user id
+    pending: Dict[str, "asyncio.Queue[Tuple[str, str]]"] = field(default_factory=dict)
+    accepted: Dict[str, List[Tuple[str, float]]] = field(default_factory=dict)  # by student id
+
+    def email(self, role: str) -> str:
+        return f"load+{self.run_id}-{role}-{uuid.uuid4().hex[:8]}@educonnect.test"
+
+
+async def register(client: ApiClient, world: World, role: str) -> Optional[Account]:
+    email = world.email(role)
+    resp = await client.post(
+        "/api/auth/register",
+        json={"name": f"Load {role.title()}", "email": email, "password": PASSWORD, "role": role},
+    )
+    if resp.status != 201:
+        return None
+    return Account(role=role, email=email, token=resp.body["token"], user_id=str(resp.body["user"]["id"]))
+
+
+async def login(client: ApiClient, account: Account) -> None:
+    resp = await client.post("/api/auth/login", json={"email": account.email, "password": PASSWORD})
+    if resp.status == 200:
+        account.token = resp.body["token"]
+
+
+async def setup(
+    client: ApiClient, world: World, teachers: int, gigs_per_teacher: int, rng: random.Random
+) -> None:
+    """Create the teachers and gigs the student journeys book against."""
+    for _ in range(teachers):
+        teacher = await register(client, world, "teacher")
+        if teacher is None:
+            continue
+        world.teachers[teacher.user_id] = teacher
+        world.pending[teacher.user_id] = asyncio.Queue()
+        for n in range(gigs_per_teacher):
+            resp = await client.post(
+                "/api/gigs",
+                token=teacher.token,
+                json={
+                    "title": f"Load test class {n + 1}",
+                    "description": "Synthetic gig created by harness.loadgen",
+                    "category": rng.choice(CATEGORIES),
+                    "price": rng.choice([300, 500, 800, 1200]),
+                    "duration": rng.choice([30, 60, 90]),
+                },
+            )
+            if resp.status == 201:
+                world.gigs.append((str(resp.data["_id"]), teacher.user_id))
+    if not world.gigs:
+        raise RuntimeError("setup created no gigs; is the backend reachable and writable?")
+
+
+async def browse(client: ApiClient, rng: random.Random) -> None:
+    params = {"page": rng.choice([1, 1, 1, 2, 3]), "limit": 20}
+    if rng.random() < 0.6:
+        params["category"] = rng.choice(CATEGORIES)
+    sort = rng.choice(SORTS)
+    if sort:
+        params["sort"] = sort
+    await client.get("/api/gigs", params=params)
+
+
+class VirtualUser(abc.ABC):
+    def __init__(self, client: ApiClient, world: World, think: float, rng: random.Random):
+        self.client = client
+        self.world = world
+        self.think_time = think
+        self.rng = rng
+
+    async def think(self) -> None:
+        if self.think_time > 0:
+            await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+    @abc.abstractmethod
+    async def run(self) -> None:
+        """The user's journey; loops until the task is cancelled."""
+
+
+class BrowsingUser(VirtualUser):
+    async def run(self) -> None:
+        while True:
+            await browse(self.client, self.rng)
+            await self.think()
+
+
+class StudentUser(VirtualUser):
+    async def run(self) -> None:
+        account = await register(self.client, self.world, "student")
+        if account is None:
+            return
+        while True:
+            await login(self.client, account)
+            await self.think()
+            await browse(self.client, self.rng)
+            await self.think()
+            await self.book(account)
+            await self.think()
+            await self.pay(account)
+            await self.think()
+
+    async def book(self, account: Account) -> None:
+        gig_id, teacher_id = self.rng.choice(self.world.gigs)
+        when = time.gmtime(time.time() + self.rng.randint(2, 30) * 86400)
+        resp = await self.client.post(
+            "/api/bookings",
+            token=account.token,
+            json={
+                "gig": gig_id,
+                "scheduledDate": time.strftime("%Y-%m-%d", when),
+                "scheduledTime": f"{self.rng.randint(8, 20):02d}:00",
+            },
+        )
+        if resp.status == 201:
+            await self.world.pending[teacher_id].put((str(resp.data["_id"]), account.user_id))
+
+    async def pay(self, account: Account) -> None:
+        accepted = self.world.accepted.get(account.user_id)
+        if not accepted:
+            return
+        booking_id, amount = accepted.pop()
+        await self.client.post(
+            f"/api/bookings/{booking_id}/payment/submit",
+            token=account.token,
+            json={
+                "method": self.rng.choice(["bkash", "nagad"]),
+                "trxid": f"LT{uuid.uuid4().hex[:10].upper()}",
+                "senderNumber": f"017{self.rng.randint(10_000_000, 99_999_999)}",
+                "amountPaid": amount,
+            },
+        )
+
+
+class TeacherUser(VirtualUser):
+    async def run(self) -> None:
+        account = self.rng.choice(list(self.world.teachers.values()))
+        queue = self.world.pending[account.user_id]
+        while True:
+            await self.client.get("/api/bookings", token=account.token, params={"status": "pending"})
+            await self.think()
+            try:
+                booking_id, student_id = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                await self.think()
+                continue
+            status = "accepted" if self.rng.random() < 0.7 else "rejected"
+            resp = await self.client.put(
+                f"/api/bookings/{booking_id}", token=account.token, json={"status": status}
+            )
+            if resp.status == 200 and status == "accepted":
+                price = (resp.data or {}).get("gig", {}).get("price", 0)
+                self.world.accepted.setdefault(student_id, []).append((booking_id, price))
+            await self.think()
+
+
+MIXES: Dict[str, Dict[type, float]] = {
+    "default": {BrowsingUser: 0.6, StudentUser: 0.3, TeacherUser: 0.1},
+    "browse": {BrowsingUser: 1.0},
+    "booking": {BrowsingUser: 0.2, StudentUser: 0.6, TeacherUser: 0.2},
+}
+
+
+async def _guard(coro: Awaitable[None]) -> None:
+    try:
+        await coro
+    except asyncio.CancelledError:
+        raise
+    except Exception as exc:  # noqa: BLE001 - a crashed VU must not stop the run
+        print(f"[loadgen] virtual user crashed: {exc!r}", file=sys.stderr)
+
+
+async def run_load(
+    stages: Sequence[Stage],
+    *,
+    mix: Dict[type, float],
+    think: float = 1.0,
+    teachers: int = 5,
+    gigs_per_teacher: int = 3,
+    seed: Optional[int] = None,
+    recorder: Optional[LatencyRecorder] = None,
+    on_tick: Optional[Callable[[int, float], None]] = None,
+) -> Tuple[LatencyRecorder, float]:
+    rng = random.Random(seed)
+    world = World(run_id=uuid.uuid4().hex[:6])
+    setup_recorder = LatencyRecorder()
+    async with ApiClient(setup_recorder) as client:
+        await setup(client, world, teachers, gigs_per_teacher, rng)
+
+    recorder = recorder or LatencyRecorder()
+    kinds, weights = zip(*mix.items())
+    users: List[asyncio.Task] = []
+    async with ApiClient(recorder) as client:
+        started = time.perf_counter()
+        recorder.started = started
+        while True:
+            elapsed = time.perf_counter() - started
+            wanted = target_users(stages, elapsed)
+            if wanted is None:
+                break
+            while len(users) < wanted:
+                kind = rng.choices(kinds, weights)[0]
+                vu = kind(client, world, think, random.Random(rng.random()))
+                users.append(asyncio.create_task(_guard(vu.run())))
+            while len(users) > wanted:
+                users.pop().cancel()
+            if on_tick:
+                on_tick(len(users), elapsed)
+            await asyncio.sleep(1)
+        for task in users:
+            task.cancel()
+        await asyncio.gather(*users, return_exceptions=True)
+        elapsed = time.perf_counter() - started
+    return recorder, elapsed
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.loadgen",
+        description="Replay EduConnect user journeys against the backend API.",
+    )
+    parser.add_argument("--ramp", default="30s:10,1m:10,15s:0", help="stages of duration:users")
+    parser.add_argument("--mix", default="default", choices=sorted(MIXES))
+    parser.add_argument("--think", type=float, default=1.0, help="mean think time in seconds")
+    parser.add_argument("--teachers", type=int, default=5)
+    parser.add_argument("--gigs-per-teacher", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--json", type=Path, default=None, help="write the summary as JSON")
+    args = parser.parse_args(argv)
+
+    def tick(users: int, elapsed: float) -> None:
+        if int(elapsed) % 10 == 0:
+            print(f"[loadgen] t={elapsed:6.0f}s users={users}", file=sys.stderr)
+
+    recorder, elapsed = asyncio.run(
+        run_load(
+            parse_ramp(args.ramp),
+            mix=MIXES[args.mix],
+            think=args.think,
+            teachers=args.teachers,
+            gigs_per_teacher=args.gigs_per_teacher,
+            seed=args.seed,
+            on_tick=tick,
+        )
+    )
+    print(recorder.format_table(elapsed))
+    if args.json:
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(json.dumps(recorder.summary(elapsed), indent=2), encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+"""Latency bookkeeping shared by the HTTP-level tools."""
+
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Sequence
+
+
+def percentile(ordered: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence (``q`` in 0-100)."""
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyRecorder:
+    """Per-endpoint latency samples and error counts."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self._samples: Dict[str, List[float]] = defaultdict(list)
+        self._errors: Counter = Counter()
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True) -> None:
+        self._samples[endpoint].append(seconds)
+        if not ok:
+            self._errors[endpoint] += 1
+
+    def endpoints(self) -> List[str]:
+        return sorted(self._samples)
+
+    def samples(self, endpoint: str) -> List[float]:
+        return list(self._samples.get(endpoint, []))
+
+    def summary(self, elapsed: Optional[float] = None) -> Dict[str, Dict[str, float]]:
+        elapsed = elapsed or (time.perf_counter() - self.started)
+        out: Dict[str, Dict[str, float]] = {}
+        for endpoint, samples in sorted(self._samples.items()):
+            ordered = sorted(samples)
+            count = len(ordered)
+            out[endpoint] = {
+                "count": count,
+                "errors": self._errors[endpoint],
+                "error_rate": self._errors[endpoint] / count if count else 0.0,
+                "throughput": count / elapsed if elapsed else 0.0,
+                "p50_ms": percentile(ordered, 50) * 1000,
+                "p95_ms": percentile(ordered, 95) * 1000,
+                "p99_ms": percentile(ordered, 99) * 1000,
+                "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+            }
+        return out
+
+    def format_table(self, elapsed: Optional[float] = None) -> str:
+        summary = self.summary(elapsed)
+        width = max([len(e) for e in summary] + [8])
+        header = (
+            f"{'endpoint':<{width}}  {'count':>7}  {'req/s':>7}  {'err%':>6}  "
+            f"{'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}  {'max ms':>8}"
+        )
+        lines = [header, "-" * len(header)]
+        for endpoint, s in summary.items():
+            lines.append(
+                f"{endpoint:<{width}}  {s['count']:>7}  {s['throughput']:>7.1f}  "
+                f"{s['error_rate'] * 100:>5.1f}%  {s['p50_ms']:>8.1f}  {s['p95_ms']:>8.1f}  "
+                f"{s['p99_ms']:>8.1f}  {s['max_ms']:>8.1f}"
+            )
+        return "\n".join(lines)
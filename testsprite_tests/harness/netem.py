@@ -0,0 +1,397 @@
+"""Degraded-network profiles and ``/api/*`` fault injection.
+
+Profiles model the links many students use (mobile data in Bangladesh)
+rather than localhost.  Bandwidth and latency are applied through CDP
+``Network.emulateNetworkConditions`` (Chromium only); packet loss is not
+exposed by CDP, so it is modelled per API request: a lost request either
+pays a retransmission delay or, on a second loss, fails outright.
+``offline-flap`` toggles the whole context off and on with ``set_offline``.
+
+Faults target specific backend routes through request interception::
+
+    GET /api/gigs=500          answer 500 (any status)
+    GET /api/gigs*=abort       connection failure
+    GET /api/bookings=delay:4000
+    GET /api/wallet/*=hang     hold the request for 120 s, then drop it
+    GET /api/gigs=503@0.3      only for 30% of matching requests
+
+``NetworkConditions`` applies a profile and faults to runner scenarios::
+
+    python -m harness.runner TC020 TC022 --net 3g --fault "GET /api/gigs=500"
+
+and ``python -m harness.netem`` measures, per page of
+``vitals_pages.json``, how long each page takes to show a loading
+indicator and an error state under each profile/fault combination::
+
+    python -m harness.netem browse dashboard -p 3g -p lossy --fault "GET /api/gigs=500"
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Page, Route
+
+from .api_client import route_of
+from .config import API_URL, FRONTEND_URL
+from .runner import RunnerPlugin, launch
+from .scenarios import TESTS_DIR, Scenario
+from .sessions import SessionCache
+from .vitals import DEFAULT_PAGES, PageSpec, ParamResolver, VitalsConfig
+
+DEFAULT_OUTPUT = TESTS_DIR / "tmp" / "netem_report.json"
+HANG_SECONDS = 120.0
+
+LOADING_SELECTOR = "[class*=animate-pulse], [class*=animate-spin], [aria-busy=true]"
+ERROR_SELECTOR = "[role=alert], .destructive"
+ERROR_TEXT = re.compile(r"failed to load|try again|something went wrong|network error", re.I)
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    name: str
+    latency_ms: float = 0.0
+    download_kbps: float = -1.0
+    upload_kbps: float = -1.0
+    loss: float = 0.0  # probability an API request is "lost"
+    retransmit_ms: float = 1_000.0
+    offline_every_s: float = 0.0  # 0 disables flapping
+    offline_for_s: float = 0.0
+
+    @property
+    def throttled(self) -> bool:
+        return bool(self.latency_ms) or self.download_kbps >= 0 or self.upload_kbps >= 0
+
+
+PROFILES: Dict[str, NetworkProfile] = {
+    p.name: p
+    for p in (
+        NetworkProfile("perfect"),
+        NetworkProfile("4g", latency_ms=80, download_kbps=9_000, upload_kbps=3_000),
+        NetworkProfile("3g", latency_ms=300, download_kbps=1_600, upload_kbps=750),
+        NetworkProfile("slow-3g", latency_ms=2_000, download_kbps=400, upload_kbps=400),
+        NetworkProfile("high-latency", latency_ms=800),
+        NetworkProfile("lossy", latency_ms=150, download_kbps=1_600, upload_kbps=750, loss=0.1),
+        NetworkProfile("offline-flap", latency_ms=100, offline_every_s=6, offline_for_s=2),
+    )
+}
+
+
+@dataclass(frozen=True)
+class Fault:
+    route: str  # "METHOD /path" glob, matched against the normalized route
+    action: str  # status code, "abort", "delay:MS" or "hang"
+    probability: float = 1.0
+
+    @classmethod
+    def parse(cls, text: str) -> "Fault":
+        route, _, action = text.rpartition("=")
+        action, _, probability = action.partition("@")
+        if not route or not (action.isdigit() or action in ("abort", "hang") or action.startswith("delay:")):
+            raise ValueError(f"invalid fault {text!r}; expected ROUTE=STATUS|abort|delay:MS|hang[@P]")
+        return cls(route.strip(), action, float(probability or 1.0))
+
+    def matches(self, route: str) -> bool:
+        return fnmatch(route, self.route)
+
+
+class Interceptor:
+    """Route handler applying faults and modelled packet loss to API calls."""
+
+    def __init__(self, profile: NetworkProfile, faults: Sequence[Fault], seed: int = 0):
+        self.profile = profile
+        self.faults = list(faults)
+        self.rng = random.Random(seed)
+        self.api_host = urlparse(API_URL).netloc
+        self.injected: Dict[str, int] = {}
+
+    @property
+    def active(self) -> bool:
+        return bool(self.faults) or self.profile.loss > 0
+
+    async def install(self, context: BrowserContext) -> None:
+        if self.active:
+            await context.route(lambda url: urlparse(url).netloc == self.api_host, self.handle)
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        key = route_of(request.method, request.url)
+        for fault in self.faults:
+            if fault.matches(key) and self.rng.random() < fault.probability:
+                self.injected[fault.action] = self.injected.get(fault.action, 0) + 1
+                await self._apply(route, fault.action)
+                return
+        if self.profile.loss and self.rng.random() < self.profile.loss:
+            self.injected["loss"] = self.injected.get("loss", 0) + 1
+            if self.rng.random() < self.profile.loss:
+                await route.abort("connectionreset")
+                return
+            await asyncio.sleep(self.profile.retransmit_ms / 1000)
+        await route.continue_()
+
+    async def _apply(self, route: Route, action: str) -> None:
+        if action.isdigit():
+            body = json.dumps({"success": False, "message": "Injected fault"})
+            await route.fulfill(status=int(action), content_type="application/json", body=body)
+        elif action == "abort":
+            await route.abort("failed")
+        elif action == "hang":
+            # Hold the request well past any client timeout, then drop it.
+            await asyncio.sleep(HANG_SECONDS)
+            try:
+                await route.abort("timedout")
+            except async_api.Error:
+                pass  # page or context already closed
+        else:
+            await asyncio.sleep(float(action.split(":", 1)[1]) / 1000)
+            await route.continue_()
+
+
+async def throttle(page: Page, profile: NetworkProfile) -> None:
+    if not profile.throttled:
+        return
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    await cdp.send(
+        "Network.emulateNetworkConditions",
+        {
+            "offline": False,
+            "latency": profile.latency_ms,
+            "downloadThroughput": profile.download_kbps * 1024 / 8 if profile.download_kbps >= 0 else -1,
+            "uploadThroughput": profile.upload_kbps * 1024 / 8 if profile.upload_kbps >= 0 else -1,
+        },
+    )
+
+
+async def flap(context: BrowserContext, profile: NetworkProfile) -> None:
+    """Toggle the context offline on the profile's schedule until cancelled."""
+    try:
+        while True:
+            await asyncio.sleep(profile.offline_every_s)
+            await context.set_offline(True)
+            await asyncio.sleep(profile.offline_for_s)
+            await context.set_offline(False)
+    except async_api.Error:
+        pass  # context closed
+
+
+class NetworkConditions(RunnerPlugin):
+    """Run scenarios under ``profile`` with ``faults`` on the API routes."""
+
+    def __init__(self, profile: NetworkProfile, faults: Sequence[Fault] = (), seed: int = 0):
+        self.profile = profile
+        self.faults = list(faults)
+        self.seed = seed
+        self._flappers: Dict[str, List[asyncio.Task]] = {}
+        self._interceptors: Dict[str, Interceptor] = {}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        interceptor = self._interceptors.setdefault(scenario.name, Interceptor(self.profile, self.faults, self.seed))
+        await interceptor.install(context)
+
+        throttling: Dict[Page, asyncio.Future] = {}
+
+        def on_page(page: Page) -> asyncio.Future:
+            if page not in throttling:
+                throttling[page] = asyncio.ensure_future(throttle(page, self.profile))
+            return throttling[page]
+
+        # Popups only get the event; pages the scenario opens itself are
+        # handed back once the throttle is in place.
+        context.on("page", on_page)
+        new_page = context.new_page
+
+        async def throttled_page() -> Page:
+            page = await new_page()
+            await on_page(page)
+            return page
+
+        context.new_page = throttled_page  # type: ignore[method-assign]
+        if self.profile.offline_every_s:
+            self._flappers.setdefault(scenario.name, []).append(asyncio.create_task(flap(context, self.profile)))
+
+    async def on_result(self, scenario: Scenario, result: Any) -> None:
+        for task in self._flappers.pop(scenario.name, []):
+            task.cancel()
+        interceptor = self._interceptors.pop(scenario.name, None)
+        result.extras["network_profile"] = {
+            "profile": self.profile.name,
+            "faults": [asdict(f) for f in self.faults],
+            "injected": interceptor.injected if interceptor else {},
+        }
+
+
+@dataclass
+class PageOutcome:
+    page: str
+    profile: str
+    faults: List[str]
+    url: str
+    loading_ms: Optional[float] = None
+    error_ms: Optional[float] = None
+    settled_ms: Optional[float] = None
+    injected: Dict[str, int] = field(default_factory=dict)
+    note: Optional[str] = None
+
+
+async def _first_visible(page: Page, locator: Any, t0: float, timeout: float) -> Optional[float]:
+    try:
+        await locator.first.wait_for(state="visible", timeout=timeout * 1000)
+    except async_api.Error:
+        return None
+    return (time.perf_counter() - t0) * 1000
+
+
+async def measure_page(
+    browser: Browser,
+    spec: PageSpec,
+    profile: NetworkProfile,
+    faults: Sequence[Fault],
+    params: ParamResolver,
+    *,
+    timeout: float = 30.0,
+    seed: int = 0,
+) -> PageOutcome:
+    if spec.role:
+        context = await params.sessions.new_context(browser, spec.role)
+    else:
+        context = await browser.new_context()
+    outcome = PageOutcome(spec.name, profile.name, [f"{f.route}={f.action}" for f in faults], spec.path)
+    flapper: Optional[asyncio.Task] = None
+    try:
+        outcome.url = FRONTEND_URL + await params.resolve(context, spec.path)
+        interceptor = Interceptor(profile, faults, seed)
+        await interceptor.install(context)
+        page = await context.new_page()
+        await throttle(page, profile)
+        if profile.offline_every_s:
+            flapper = asyncio.create_task(flap(context, profile))
+
+        t0 = time.perf_counter()
+        await page.goto(outcome.url, wait_until="commit", timeout=timeout * 1000)
+        error = page.locator(ERROR_SELECTOR).or_(page.get_by_text(ERROR_TEXT))
+
+        async def settled() -> Optional[float]:
+            try:
+                await page.wait_for_load_state("networkidle", timeout=timeout * 1000)
+            except async_api.Error:
+                return None
+            return (time.perf_counter() - t0) * 1000
+
+        outcome.loading_ms, outcome.error_ms, outcome.settled_ms = await asyncio.gather(
+            _first_visible(page, page.locator(LOADING_SELECTOR), t0, timeout),
+            _first_visible(page, error, t0, timeout if faults else min(timeout, 10.0)),
+            settled(),
+        )
+        outcome.injected = interceptor.injected
+        if faults and interceptor.injected and outcome.error_ms is None:
+            outcome.note = "fault injected but no error state shown"
+        elif outcome.loading_ms is None and (profile.throttled or faults):
+            outcome.note = "no loading indicator"
+    except (async_api.Error, LookupError) as exc:
+        outcome.note = str(exc).splitlines()[0]
+    finally:
+        if flapper is not None:
+            flapper.cancel()
+        await context.close()
+    return outcome
+
+
+def format_outcomes(outcomes: Sequence[PageOutcome]) -> str:
+    def ms(value: Optional[float]) -> str:
+        return f"{value:>8.0f}" if value is not None else f"{'-':>8}"
+
+    header = f"{'page':<22}  {'profile':<13}  {'loading':>8}  {'error':>8}  {'settled':>8}  note"
+    lines = [header, "-" * len(header)]
+    for o in outcomes:
+        lines.append(
+            f"{o.page:<22}  {o.profile:<13}  {ms(o.loading_ms)}  {ms(o.error_ms)}  {ms(o.settled_ms)}  {o.note or ''}"
+        )
+    return "\n".join(lines)
+
+
+async def run_matrix(
+    pages: Sequence[PageSpec],
+    profiles: Sequence[NetworkProfile],
+    faults: Sequence[Fault],
+    *,
+    headless: bool = True,
+    timeout: float = 30.0,
+    concurrency: int = 4,
+    params: Optional[Dict[str, str]] = None,
+) -> List[PageOutcome]:
+    resolver = ParamResolver(SessionCache(), params)
+    gate = asyncio.Semaphore(max(1, concurrency))
+    async with async_api.async_playwright() as pw:
+        browser = await launch(pw, "chromium", headless)
+        try:
+
+            async def guarded(spec: PageSpec, profile: NetworkProfile, seed: int) -> PageOutcome:
+                async with gate:
+                    return await measure_page(browser, spec, profile, faults, resolver, timeout=timeout, seed=seed)
+
+            jobs = [(s, p) for p in profiles for s in pages]
+            return list(await asyncio.gather(*(guarded(s, p, i) for i, (s, p) in enumerate(jobs))))
+        finally:
+            await browser.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.netem",
+        description="Time-to-loading and time-to-error per page under degraded networks and API faults.",
+    )
+    parser.add_argument("pages", nargs="*", help="page names from the vitals config (default: all)")
+    parser.add_argument("--config", type=Path, default=DEFAULT_PAGES)
+    parser.add_argument("-p", "--profile", action="append", default=[], choices=sorted(PROFILES))
+    parser.add_argument("--fault", action="append", default=[], metavar="ROUTE=ACTION[@P]")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    config = VitalsConfig.load(args.config)
+    pages = [p for p in config.pages if not args.pages or p.name in args.pages]
+    if not pages:
+        print("No pages matched.", file=sys.stderr)
+        return 2
+    try:
+        faults = [Fault.parse(f) for f in args.fault]
+    except ValueError as exc:
+        parser.error(str(exc))
+    profiles = [PROFILES[name] for name in args.profile or ["3g"]]
+
+    outcomes = asyncio.run(
+        run_matrix(
+            pages,
+            profiles,
+            faults,
+            headless=not args.headed,
+            timeout=args.timeout,
+            concurrency=args.concurrency,
+            params=dict(p.split("=", 1) for p in args.param),
+        )
+    )
+    print(format_outcomes(outcomes))
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps([asdict(o) for o in outcomes], indent=2), encoding="utf-8")
+    print(f"Report written to {args.output}")
+    return 1 if any(o.note for o in outcomes) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
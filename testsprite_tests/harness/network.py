@@ -0,0 +1,154 @@
+"""Per-scenario backend call timings and latency budgets.
+
+``NetworkTiming`` listens to every context a scenario opens and records
+each request the page makes to the backend (``config.API_URL``) under its
+normalized route, with the status and the browser-measured time from
+request start to response end.  The calls land in the scenario's
+``extras["network"]`` and in a suite-wide ``LatencyRecorder`` whose table
+is printed and written next to the run report.
+
+Budgets are per-call ceilings in milliseconds, keyed by route or glob::
+
+    {"GET /api/gigs": 200, "GET /api/bookings": 300, "GET /api/wallet/*": 300}
+
+A scenario that passed its own assertions but made a call over budget is
+reported as failed::
+
+    python -m harness.runner --network
+    python -m harness.runner --budgets harness/budgets.json
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext, Request
+
+from .api_client import route_of
+from .config import API_URL
+from .metrics import LatencyRecorder
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport
+from .scenarios import TESTS_DIR, Scenario
+
+DEFAULT_BUDGETS = Path(__file__).resolve().parent / "budgets.json"
+DEFAULT_NETWORK_REPORT = TESTS_DIR / "tmp" / "network_report.json"
+
+
+@dataclass
+class ApiCall:
+    route: str
+    status: int  # 0 when the request failed without a response
+    ms: float
+    started: float  # epoch ms, as reported by the browser
+
+
+@dataclass
+class Violation:
+    route: str
+    ms: float
+    budget: float
+
+    def __str__(self) -> str:
+        return f"{self.route} took {self.ms:.0f} ms (budget {self.budget:.0f} ms)"
+
+
+class Budgets:
+    def __init__(self, limits: Optional[Dict[str, float]] = None):
+        self.limits = dict(limits or {})
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_BUDGETS) -> "Budgets":
+        return cls(json.loads(path.read_text(encoding="utf-8")))
+
+    def limit_for(self, route: str) -> Optional[float]:
+        if route in self.limits:
+            return self.limits[route]
+        for pattern, limit in self.limits.items():
+            if fnmatch(route, pattern):
+                return limit
+        return None
+
+    def check(self, calls: Iterable[ApiCall]) -> List[Violation]:
+        violations = []
+        for call in calls:
+            limit = self.limit_for(call.route)
+            if limit is not None and call.status and call.ms > limit:
+                violations.append(Violation(call.route, call.ms, limit))
+        return violations
+
+
+def _duration_ms(request: Request) -> float:
+    timing = request.timing
+    end = timing.get("responseEnd", -1)
+    return end if end >= 0 else 0.0
+
+
+class NetworkTiming(RunnerPlugin):
+    """Record backend calls per scenario and enforce ``budgets``."""
+
+    def __init__(
+        self,
+        budgets: Optional[Budgets] = None,
+        *,
+        hosts: Sequence[str] = (urlparse(API_URL).netloc,),
+        report: Optional[Path] = DEFAULT_NETWORK_REPORT,
+    ):
+        self.budgets = budgets or Budgets()
+        self.hosts = set(hosts)
+        self.report = report
+        self.recorder = LatencyRecorder()
+        self._calls: Dict[str, List[ApiCall]] = {}
+
+    def _tracked(self, request: Request) -> bool:
+        return urlparse(request.url).netloc in self.hosts
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        calls = self._calls.setdefault(scenario.name, [])
+
+        async def finished(request: Request) -> None:
+            if not self._tracked(request):
+                return
+            response = await request.response()
+            self._add(calls, request, response.status if response else 0)
+
+        def failed(request: Request) -> None:
+            if self._tracked(request):
+                self._add(calls, request, 0)
+
+        context.on("requestfinished", finished)
+        context.on("requestfailed", failed)
+
+    def _add(self, calls: List[ApiCall], request: Request, status: int) -> None:
+        call = ApiCall(
+            route=route_of(request.method, request.url),
+            status=status,
+            ms=_duration_ms(request),
+            started=request.timing.get("startTime", 0.0),
+        )
+        calls.append(call)
+        self.recorder.record(call.route, call.ms / 1000, ok=0 < status < 400)
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        calls = sorted(self._calls.pop(scenario.name, []), key=lambda c: c.started)
+        violations = self.budgets.check(calls)
+        result.extras["network"] = {
+            "calls": [asdict(c) for c in calls],
+            "violations": [str(v) for v in violations],
+        }
+        if violations and result.status == "passed":
+            result.status = "failed"
+            result.error = "API budget exceeded: " + "; ".join(str(v) for v in violations)
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        if not self.recorder.endpoints():
+            return
+        print(self.recorder.format_table(report.wall_time))
+        if self.report is not None:
+            self.report.parent.mkdir(parents=True, exist_ok=True)
+            data = {"budgets": self.budgets.limits, "routes": self.recorder.summary(report.wall_time)}
+            self.report.write_text(json.dumps(data, indent=2), encoding="utf-8")
@@ -0,0 +1,379 @@
+"""Interpret ``testsprite_frontend_test_plan.json`` directly.
+
+The plan lists each test case as free-text ``action`` / ``assertion``
+steps.  ``plan_selectors.json`` maps those step descriptions to a short
+list of operations, with ``@name`` aliases for selectors::
+
+    "Navigate to gig browsing page": ["goto /browse", "wait GET /api/gigs"]
+
+Operations:
+
+==================  =====================================================
+``goto PATH``       navigate (relative to the frontend URL)
+``login ROLE``      sign in as ROLE through Clerk (cached per role)
+``account ROLE``    make sure ROLE can sign in with the form (Clerk user
+                    exists, bot protection bypassed for this context)
+``click SEL``       click the first match
+``fill SEL TEXT``   fill an input; ``{unique_email}`` etc. are expanded
+``see SEL``         assert the first match becomes visible
+``hidden SEL``      assert no match is visible
+``url GLOB``        assert the current URL matches
+``idle``            wait for network idle
+``wait M PATH [S]`` assert the page issued M PATH (and got status S)
+``api M PATH S [R]`` call the backend directly (as role R), assert status
+``viewport WxH``    resize the page
+``storage KEY``     assert localStorage KEY is set
+==================  =====================================================
+
+A step mapped to ``[]`` is covered by the previous step (e.g. "Verify 403
+returned" after an ``api`` call).  Unmapped steps are skipped, and an item
+with any of them is reported as ``incomplete``, which fails the run unless
+``--allow-unmapped`` is given.  Every plan item runs in its own context on
+one shared browser, so adding a test case costs no additional browser
+start::
+
+    python -m harness.plan                 # whole plan
+    python -m harness.plan TC017 TC019 -c 2
+    python -m harness.plan --allow-unmapped
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import shlex
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Page, Response, expect
+
+from .config import API_URL, FRONTEND_URL, credentials
+from .runner import DEFAULT_REPORT, ScenarioResult, SuiteReport, launch
+from .scenarios import TESTS_DIR
+from .sessions import SessionCache, allow_clerk_testing, clerk_user_id
+
+DEFAULT_PLAN = TESTS_DIR / "testsprite_frontend_test_plan.json"
+DEFAULT_SELECTORS = Path(__file__).resolve().parent / "plan_selectors.json"
+
+
+class PlanError(Exception):
+    """The selector map contains an operation the interpreter cannot run."""
+
+
+@dataclass
+class SelectorMap:
+    selectors: Dict[str, str]
+    steps: Dict[str, List[str]]
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_SELECTORS) -> "SelectorMap":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(selectors=data.get("selectors", {}), steps=data.get("steps", {}))
+
+    def resolve(self, token: str) -> str:
+        if token.startswith("@"):
+            try:
+                return self.selectors[token[1:]]
+            except KeyError:
+                raise PlanError(f"unknown selector alias {token}") from None
+        return token
+
+    def ops_for(self, description: str) -> Optional[List[str]]:
+        return self.steps.get(description)
+
+
+@dataclass
+class StepOutcome:
+    description: str
+    type: str
+    status: str  # "passed" | "failed" | "unmapped" | "not-run"
+    duration: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class _ItemState:
+    context: BrowserContext
+    page: Page
+    variables: Dict[str, str]
+    token: Optional[str] = None
+    responses: List[Tuple[str, str, int]] = field(default_factory=list)
+    seen: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class Interpreter:
+    def __init__(
+        self,
+        selectors: SelectorMap,
+        sessions: Optional[SessionCache] = None,
+        timeout: float = 10_000,
+    ):
+        self.selectors = selectors
+        self.sessions = sessions or SessionCache()
+        self.timeout = timeout
+
+    # -- operations -----------------------------------------------------
+
+    async def op_goto(self, state: _ItemState, path: str) -> None:
+        url = path if path.startswith("http") else f"{FRONTEND_URL}{path}"
+        await state.page.goto(url, wait_until="domcontentloaded", timeout=self.timeout)
+
+    async def op_login(self, state: _ItemState, role: str) -> None:
+        browser = state.context.browser
+        if browser is None:
+            raise PlanError("login needs a context opened from a Browser")
+        session = await self.sessions.signed_in(browser, role)
+        state.token = session.token
+        # Replay the Clerk sign-in into this (already open) context: its
+        # cookies, plus each origin's localStorage on that origin's pages.
+        signed_in = session.storage_state()
+        await state.context.add_cookies(signed_in.get("cookies", []))
+        origins = {
+            o["origin"]: {e["name"]: e["value"] for e in o["localStorage"]} for o in signed_in.get("origins", [])
+        }
+        script = (
+            f"(() => {{ const entries = {json.dumps(origins)}[location.origin] || {{}};"
+            " for (const [k, v] of Object.entries(entries)) localStorage.setItem(k, v); })();"
+        )
+        await state.context.add_init_script(script)
+        self.sessions.watch(state.context, session)
+
+    async def op_account(self, state: _ItemState, role: str) -> None:
+        # The backend account first, so clerk-sync keeps its role.
+        await self.sessions.get(role)
+        await asyncio.to_thread(clerk_user_id, role)
+        await allow_clerk_testing(state.context)
+
+    async def op_click(self, state: _ItemState, selector: str) -> None:
+        await state.page.locator(self.selectors.resolve(selector)).first.click(timeout=self.timeout)
+
+    async def op_fill(self, state: _ItemState, selector: str, *text: str) -> None:
+        value = " ".join(text).format_map(state.variables)
+        await state.page.locator(self.selectors.resolve(selector)).first.fill(value, timeout=self.timeout)
+
+    async def op_see(self, state: _ItemState, selector: str) -> None:
+        locator = state.page.locator(self.selectors.resolve(selector)).first
+        await expect(locator).to_be_visible(timeout=self.timeout)
+
+    async def op_hidden(self, state: _ItemState, selector: str) -> None:
+        locator = state.page.locator(self.selectors.resolve(selector))
+        await expect(locator).to_be_hidden(timeout=self.timeout)
+
+    async def op_url(self, state: _ItemState, pattern: str) -> None:
+        await state.page.wait_for_url(lambda url: fnmatch(url, pattern), timeout=self.timeout)
+
+    async def op_idle(self, state: _ItemState) -> None:
+        await state.page.wait_for_load_state("networkidle", timeout=self.timeout)
+
+    async def op_wait(self, state: _ItemState, method: str, path: str, status: str = "") -> None:
+        def matched() -> Optional[int]:
+            for m, p, s in state.responses:
+                if m == method.upper() and fnmatch(p, path):
+                    return s
+            return None
+
+        deadline = time.monotonic() + self.timeout / 1000
+        while (got := matched()) is None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise AssertionError(f"no {method} {path} request was made")
+            state.seen.clear()
+            try:
+                await asyncio.wait_for(state.seen.wait(), remaining)
+            except asyncio.TimeoutError:
+                pass
+        if status and got != int(status):
+            raise AssertionError(f"{method} {path} returned {got}, expected {status}")
+
+    async def op_api(self, state: _ItemState, method: str, path: str, status: str, role: str = "") -> None:
+        headers: Dict[str, str] = {}
+        if role:
+            headers = (await self.sessions.get(role)).headers
+        response = await state.context.request.fetch(
+            f"{API_URL}{path}",
+            method=method.upper(),
+            headers=headers,
+            data={} if method.upper() in ("POST", "PUT") else None,
+            fail_on_status_code=False,
+            timeout=self.timeout,
+        )
+        if response.status != int(status):
+            raise AssertionError(f"{method} {path} returned {response.status}, expected {status}")
+
+    async def op_viewport(self, state: _ItemState, size: str) -> None:
+        width, height = (int(v) for v in size.lower().split("x"))
+        await state.page.set_viewport_size({"width": width, "height": height})
+
+    async def op_storage(self, state: _ItemState, key: str) -> None:
+        value = await state.page.evaluate("(k) => localStorage.getItem(k)", key)
+        if not value:
+            raise AssertionError(f"localStorage[{key!r}] is not set")
+
+    # -- execution ------------------------------------------------------
+
+    async def run_op(self, state: _ItemState, op: str) -> None:
+        verb, *args = shlex.split(op)
+        handler = getattr(self, f"op_{verb.replace('-', '_')}", None)
+        if handler is None:
+            raise PlanError(f"unknown operation {verb!r} in {op!r}")
+        await handler(state, *args)
+
+    async def run_item(self, browser: Browser, item: Dict[str, Any], origin: float) -> ScenarioResult:
+        context = await browser.new_context()
+        context.set_default_timeout(self.timeout)
+        page = await context.new_page()
+        email, password = credentials("student")
+        state = _ItemState(
+            context=context,
+            page=page,
+            variables={
+                "unique_email": f"e2e+{uuid.uuid4().hex[:10]}@educonnect.test",
+                "password": "E2e-Passw0rd!",
+                "student_email": email,
+                "student_password": password,
+            },
+        )
+        api_host = urlparse(API_URL).netloc
+
+        def record(response: Response) -> None:
+            url = urlparse(response.url)
+            if url.netloc == api_host:
+                state.responses.append((response.request.method, url.path, response.status))
+                state.seen.set()
+
+        context.on("response", record)
+
+        outcomes: List[StepOutcome] = []
+        status, error = "passed", None
+        started = time.perf_counter()
+        try:
+            for step in item.get("steps", []):
+                outcome = StepOutcome(description=step["description"], type=step.get("type", "action"), status="passed")
+                outcomes.append(outcome)
+                if status != "passed":
+                    outcome.status = "not-run"
+                    continue
+                ops = self.selectors.ops_for(outcome.description)
+                if ops is None:
+                    outcome.status = "unmapped"
+                    continue
+                step_started = time.perf_counter()
+                try:
+                    for op in ops:
+                        await self.run_op(state, op)
+                except AssertionError as exc:
+                    outcome.status, outcome.error = "failed", str(exc)
+                    status, error = "failed", f"{outcome.description}: {exc}"
+                except (async_api.Error, PlanError) as exc:
+                    outcome.status, outcome.error = "failed", str(exc)
+                    status, error = "error", f"{outcome.description}: {exc}"
+                outcome.duration = time.perf_counter() - step_started
+        finally:
+            await context.close()
+
+        if status == "passed" and any(o.status == "unmapped" for o in outcomes):
+            status = "incomplete"
+        return ScenarioResult(
+            name=f"{item['id']}_{item['title']}",
+            tc_id=item["id"],
+            title=item["title"],
+            status=status,
+            duration=time.perf_counter() - started,
+            started_at=started - origin,
+            error=error,
+            extras={
+                "steps": [asdict(o) for o in outcomes],
+                "unmapped": sum(1 for o in outcomes if o.status == "unmapped"),
+            },
+        )
+
+
+def load_plan(path: Path = DEFAULT_PLAN, ids: Sequence[str] = ()) -> List[Dict[str, Any]]:
+    items = json.loads(path.read_text(encoding="utf-8"))
+    wanted = {i.upper() for i in ids}
+    return [item for item in items if not wanted or item["id"].upper() in wanted]
+
+
+async def run_plan(
+    items: Sequence[Dict[str, Any]],
+    selectors: SelectorMap,
+    *,
+    concurrency: int = 4,
+    headless: bool = True,
+    engine: str = "chromium",
+) -> SuiteReport:
+    interpreter = Interpreter(selectors)
+    gate = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+
+    async with async_api.async_playwright() as pw:
+        browser = await launch(pw, engine, headless)
+        try:
+
+            async def guarded(item: Dict[str, Any]) -> ScenarioResult:
+                async with gate:
+                    return await interpreter.run_item(browser, item, started)
+
+            results = list(await asyncio.gather(*(guarded(i) for i in items)))
+        finally:
+            await browser.close()
+    return SuiteReport(
+        results=results,
+        wall_time=time.perf_counter() - started,
+        concurrency=concurrency,
+        engines=[engine],
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.plan",
+        description="Execute the TestSprite frontend test plan on one shared browser.",
+    )
+    parser.add_argument("ids", nargs="*", help="plan item ids to run (default: all)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4)
+    parser.add_argument("--plan", type=Path, default=DEFAULT_PLAN)
+    parser.add_argument("--selectors", type=Path, default=DEFAULT_SELECTORS)
+    parser.add_argument("--engine", default="chromium", choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT.with_name("plan_report.json"))
+    parser.add_argument(
+        "--allow-unmapped",
+        action="store_true",
+        help="exit 0 even when items are incomplete because steps have no mapping",
+    )
+    args = parser.parse_args(argv)
+
+    items = load_plan(args.plan, args.ids)
+    if not items:
+        print("No plan items matched.", file=sys.stderr)
+        return 2
+    report = asyncio.run(
+        run_plan(
+            items,
+            SelectorMap.load(args.selectors),
+            concurrency=args.concurrency,
+            headless=not args.headed,
+            engine=args.engine,
+        )
+    )
+    print(report.format_table())
+    unmapped = sum(r.extras.get("unmapped", 0) for r in report.results)
+    if unmapped:
+        print(f"{unmapped} plan steps have no entry in {args.selectors.name} and were skipped")
+    report.write(args.report)
+    print(f"Report written to {args.report}")
+    ok = ("passed", "incomplete") if args.allow_unmapped else ("passed",)
+    return 0 if all(r.status in ok for r in report.results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
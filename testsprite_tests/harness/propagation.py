@@ -0,0 +1,327 @@
+"""How long a teacher's booking decision takes to reach the student.
+
+TC016/TC017 only look for static text.  This probe opens a teacher and a
+student context, both signed in through Clerk by ``SessionCache``, keeps
+the student's dashboard open and, per iteration:
+
+1. creates a uniquely titled gig (teacher) and books it (student),
+2. primes the student's ``GET /api/bookings`` cache entry and dashboard,
+3. sends ``PUT /api/bookings/:id`` from the teacher's context with the
+   teacher's JWT, the request ``bookingsApi.updateBookingStatus`` makes
+   (a sample whose PUT is not answered with 200 is recorded as failed),
+   then measures, from that moment:
+
+   * ``api_ms`` - until the student's ``GET /api/bookings`` (polled every
+     ``--poll-ms``) returns the new status; stale reads, and whether they
+     were served from the Redis ``bookings`` cache (``cached: true``), are
+     counted.  Without invalidation this would be bounded by the cache
+     TTL (600 s), so ``--timeout`` should stay well below it.
+   * ``ui_ms`` - until the student's ``/dashboard/bookings`` shows the
+     status badge, either by reloading every ``--reload-ms`` (``reload``)
+     or by waiting for the page's own refresh (``passive``).
+
+::
+
+    python -m harness.propagation -n 50
+    python -m harness.propagation -n 20 --ui passive --timeout 60
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Page
+
+from .config import API_URL, FRONTEND_URL
+from .metrics import percentile
+from .runner import launch
+from .scenarios import TESTS_DIR
+from .sessions import SessionCache
+
+DEFAULT_OUTPUT = TESTS_DIR / "tmp" / "propagation.json"
+BOOKINGS_PAGE = "/dashboard/bookings"
+
+
+@dataclass
+class Sample:
+    iteration: int
+    booking_id: str
+    put_ms: float
+    put_status: int
+    api_ms: Optional[float]  # None when the change never showed up
+    stale_reads: int
+    cached_stale_reads: int
+    ui_ms: Optional[float]
+    error: Optional[str] = None
+
+
+def _status_of(body: Any, booking_id: str) -> Tuple[Optional[str], bool]:
+    if not isinstance(body, dict):
+        return None, False
+    for booking in body.get("data") or []:
+        if booking.get("_id") == booking_id:
+            return booking.get("status"), bool(body.get("cached"))
+    return None, bool(body.get("cached"))
+
+
+class PropagationProbe:
+    def __init__(
+        self,
+        browser: Browser,
+        *,
+        status: str = "accepted",
+        poll_ms: float = 50,
+        reload_ms: float = 1_000,
+        ui: str = "reload",
+        timeout: float = 30.0,
+    ):
+        self.browser = browser
+        self.status = status
+        self.poll_ms = poll_ms
+        self.reload_ms = reload_ms
+        self.ui = ui
+        self.timeout = timeout
+        self.sessions = SessionCache()
+        self.run_id = uuid.uuid4().hex[:6]
+
+    async def open(self) -> None:
+        self.teacher_context = await self.sessions.new_context(self.browser, "teacher")
+        try:
+            await self._open_student()
+        except BaseException:
+            await self.teacher_context.close()
+            raise
+        self.student = await self.sessions.get("student")
+        self.teacher = await self.sessions.get("teacher")
+
+    async def _open_student(self) -> None:
+        if self.ui == "off":
+            # API calls carry their own Authorization header.
+            self.student_context = await self.browser.new_context()
+        else:
+            self.student_context = await self.sessions.new_context(self.browser, "student")
+            self.student_page = await self.student_context.new_page()
+            await self.student_page.goto(f"{FRONTEND_URL}{BOOKINGS_PAGE}", wait_until="domcontentloaded")
+            await self.student_page.wait_for_load_state("networkidle")
+            landed = urlparse(self.student_page.url).path
+            if landed != BOOKINGS_PAGE:
+                await self.student_context.close()
+                raise RuntimeError(f"student dashboard redirected to {landed}; the Clerk sign-in did not take")
+
+    async def close(self) -> None:
+        await self.student_context.close()
+        await self.teacher_context.close()
+
+    def _context(self, role: str) -> BrowserContext:
+        return self.teacher_context if role == "teacher" else self.student_context
+
+    async def _call(self, role: str, method: str, path: str, data: Any = None) -> Any:
+        session = self.teacher if role == "teacher" else self.student
+        response = await self._context(role).request.fetch(
+            f"{API_URL}{path}", method=method, headers=session.headers, data=data, fail_on_status_code=True
+        )
+        return await response.json()
+
+    async def _prepare(self, iteration: int) -> Tuple[str, str]:
+        title = f"Propagation probe {self.run_id}-{iteration}"
+        gig = await self._call(
+            "teacher",
+            "POST",
+            "/api/gigs",
+            {
+                "title": title,
+                "description": "Created by harness.propagation",
+                "category": "Mathematics",
+                "price": 500,
+                "duration": 60,
+            },
+        )
+        when = time.gmtime(time.time() + (iteration % 28 + 2) * 86400)
+        booking = await self._call(
+            "student",
+            "POST",
+            "/api/bookings",
+            {
+                "gig": gig["data"]["_id"],
+                "scheduledDate": time.strftime("%Y-%m-%d", when),
+                "scheduledTime": f"{8 + iteration % 12:02d}:00",
+            },
+        )
+        return booking["data"]["_id"], title
+
+    def _badge(self, page: Page, title: str) -> Any:
+        card = page.locator(f"[class*=card]:has-text({json.dumps(title)})").first
+        return card.get_by_text(self.status, exact=True).first
+
+    async def _watch_api(self, booking_id: str, t0: float) -> Tuple[Optional[float], int, int]:
+        stale = cached = 0
+        while time.perf_counter() - t0 < self.timeout:
+            body = await self._call("student", "GET", "/api/bookings")
+            status, from_cache = _status_of(body, booking_id)
+            if status == self.status:
+                return (time.perf_counter() - t0) * 1000, stale, cached
+            stale += 1
+            cached += from_cache
+            await asyncio.sleep(self.poll_ms / 1000)
+        return None, stale, cached
+
+    async def _update(self, booking_id: str) -> int:
+        response = await self.teacher_context.request.fetch(
+            f"{API_URL}/api/bookings/{booking_id}",
+            method="PUT",
+            headers=self.teacher.headers,
+            data={"status": self.status},
+            fail_on_status_code=False,
+        )
+        return response.status
+
+    async def _watch_ui(self, title: str, t0: float) -> Optional[float]:
+        if self.ui == "off":
+            return None
+        badge = self._badge(self.student_page, title)
+        while True:
+            remaining = self.timeout - (time.perf_counter() - t0)
+            if remaining <= 0:
+                return None
+            wait = remaining if self.ui == "passive" else min(remaining, self.reload_ms / 1000)
+            try:
+                await badge.wait_for(state="visible", timeout=wait * 1000)
+                return (time.perf_counter() - t0) * 1000
+            except async_api.TimeoutError:
+                if self.ui == "passive":
+                    return None
+                await self.student_page.reload(wait_until="domcontentloaded")
+
+    async def iterate(self, iteration: int) -> Sample:
+        booking_id, title = await self._prepare(iteration)
+        # Warm the cached list and the dashboard with the old status.
+        await self._call("student", "GET", "/api/bookings")
+        if self.ui != "off":
+            await self.student_page.goto(f"{FRONTEND_URL}{BOOKINGS_PAGE}", wait_until="domcontentloaded")
+            await self.student_page.get_by_text(title).first.wait_for(timeout=self.timeout * 1000)
+
+        t0 = time.perf_counter()
+        put_status = await self._update(booking_id)
+        put_ms = (time.perf_counter() - t0) * 1000
+        if put_status != 200:
+            error = f"PUT /api/bookings/{booking_id} returned {put_status}"
+            return Sample(iteration, booking_id, put_ms, put_status, None, 0, 0, None, error)
+        (api_ms, stale, cached), ui_ms = await asyncio.gather(
+            self._watch_api(booking_id, t0), self._watch_ui(title, t0)
+        )
+        return Sample(iteration, booking_id, put_ms, put_status, api_ms, stale, cached, ui_ms)
+
+
+def summarize(samples: Sequence[Sample]) -> Dict[str, Dict[str, float]]:
+    out: Dict[str, Dict[str, float]] = {}
+    for key in ("put_ms", "api_ms", "ui_ms"):
+        values = sorted(v for v in (getattr(s, key) for s in samples) if v is not None)
+        out[key] = {
+            "count": len(values),
+            "missed": sum(1 for s in samples if getattr(s, key) is None),
+            "p50": percentile(values, 50),
+            "p90": percentile(values, 90),
+            "p99": percentile(values, 99),
+            "max": values[-1] if values else 0.0,
+        }
+    out["failed"] = {"total": sum(1 for s in samples if s.error)}
+    out["stale_reads"] = {
+        "total": sum(s.stale_reads for s in samples),
+        "from_cache": sum(s.cached_stale_reads for s in samples),
+    }
+    return out
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    lines = [f"{'metric':<8}  {'count':>5}  {'missed':>6}  {'p50':>8}  {'p90':>8}  {'p99':>8}  {'max':>8}"]
+    lines.append("-" * len(lines[0]))
+    for key in ("put_ms", "api_ms", "ui_ms"):
+        s = summary[key]
+        lines.append(
+            f"{key:<8}  {s['count']:>5}  {s['missed']:>6}  {s['p50']:>8.0f}  {s['p90']:>8.0f}  "
+            f"{s['p99']:>8.0f}  {s['max']:>8.0f}"
+        )
+    stale = summary["stale_reads"]
+    if summary["failed"]["total"]:
+        lines.append(f"failed samples (PUT not 200): {summary['failed']['total']}")
+    lines.append(f"stale GET /api/bookings reads: {stale['total']} ({stale['from_cache']} served from cache)")
+    return "\n".join(lines)
+
+
+async def run_probe(iterations: int, *, headless: bool = True, **options: Any) -> List[Sample]:
+    samples: List[Sample] = []
+    async with async_api.async_playwright() as pw:
+        browser = await launch(pw, "chromium", headless)
+        probe = PropagationProbe(browser, **options)
+        try:
+            await probe.open()
+        except BaseException:
+            await browser.close()
+            raise
+        try:
+            for i in range(iterations):
+                sample = await probe.iterate(i)
+                samples.append(sample)
+                if sample.error:
+                    print(f"[propagation] #{i + 1:<3} failed: {sample.error}", file=sys.stderr)
+                    continue
+                print(
+                    f"[propagation] #{i + 1:<3} put {sample.put_ms:6.0f} ms  "
+                    f"api {sample.api_ms or float('nan'):6.0f} ms  ui {sample.ui_ms or float('nan'):6.0f} ms",
+                    file=sys.stderr,
+                )
+        finally:
+            await probe.close()
+            await browser.close()
+    return samples
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.propagation",
+        description="Measure how fast a teacher's booking update reaches the student.",
+    )
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    parser.add_argument("--status", default="accepted", choices=["accepted", "rejected"])
+    parser.add_argument("--ui", default="reload", choices=["reload", "passive", "off"])
+    parser.add_argument("--poll-ms", type=float, default=50)
+    parser.add_argument("--reload-ms", type=float, default=1_000)
+    parser.add_argument("--timeout", type=float, default=30.0, help="seconds before an update counts as missed")
+    parser.add_argument("--headed", action="store_true")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    samples = asyncio.run(
+        run_probe(
+            args.iterations,
+            headless=not args.headed,
+            status=args.status,
+            poll_ms=args.poll_ms,
+            reload_ms=args.reload_ms,
+            ui=args.ui,
+            timeout=args.timeout,
+        )
+    )
+    summary = summarize(samples)
+    print(format_summary(summary))
+    output: Path = args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(
+        json.dumps({"summary": summary, "samples": [asdict(s) for s in samples]}, indent=2), encoding="utf-8"
+    )
+    print(f"Samples written to {output}")
+    return 0 if summary["api_ms"]["missed"] == 0 and summary["failed"]["total"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,487 @@
+"""Run the generated scenarios concurrently on one shared browser.
+
+Each ``TC*.py`` script normally starts Playwright, launches its own
+Chromium with ``--single-process`` and tears everything down again.  Here
+the browser is launched once and every scenario receives a shim in place
+of ``playwright.async_api``: ``async_playwright().start()`` and
+``chromium.launch()`` hand back a lease on the shared browser, so the
+script's ``browser.new_context()`` becomes an isolated context and its
+``browser.close()`` only closes the contexts that scenario opened.
+
+Usage (from ``testsprite_tests/``)::
+
+    python -m harness.runner                      # whole suite
+    python -m harness.runner TC010 TC011 -c 2     # subset, two at a time
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import traceback
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext
+
+from .scenarios import TESTS_DIR, Scenario, discover
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "run_report.json"
+
+
+class RunnerPlugin:
+    """Extension point for features layered on top of the runner.
+
+    Every hook is optional; the base implementation does nothing.
+    """
+
+    async def on_suite_start(self, browser: Browser) -> None:
+        pass
+
+    async def namespace(self, scenario: Scenario) -> Dict[str, Any]:
+        """Module globals to rebind in the scenario script."""
+        return {}
+
+    async def context_options(self, scenario: Scenario) -> Dict[str, Any]:
+        """Extra keyword arguments merged into ``browser.new_context()``."""
+        return {}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        pass
+
+    async def on_result(self, scenario: Scenario, result: "ScenarioResult") -> None:
+        pass
+
+    async def on_suite_end(self, report: "SuiteReport") -> None:
+        pass
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    tc_id: str
+    title: str
+    status: str  # "passed" | "failed" | "error"
+    duration: float
+    started_at: float
+    engine: str = "chromium"
+    error: Optional[str] = None
+    extras: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def passed(self) -> bool:
+        return self.status == "passed"
+
+
+@dataclass
+class SuiteReport:
+    results: List[ScenarioResult]
+    wall_time: float
+    concurrency: int
+    engines: List[str]
+
+    @property
+    def passed(self) -> int:
+        return sum(1 for r in self.results if r.passed)
+
+    @property
+    def failed(self) -> int:
+        return len(self.results) - self.passed
+
+    @property
+    def serial_time(self) -> float:
+        """Sum of scenario durations, i.e. roughly the old sequential cost."""
+        return sum(r.duration for r in self.results)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "summary": {
+                "total": len(self.results),
+                "passed": self.passed,
+                "failed": self.failed,
+                "wall_time": round(self.wall_time, 3),
+                "serial_time": round(self.serial_time, 3),
+                "concurrency": self.concurrency,
+                "engines": self.engines,
+            },
+            "results": [asdict(r) for r in self.results],
+        }
+
+    def format_table(self) -> str:
+        width = max([len(r.name) for r in self.results] + [8])
+        lines = [f"{'scenario':<{width}}  {'status':<7}  {'seconds':>8}"]
+        lines.append("-" * len(lines[0]))
+        for r in sorted(self.results, key=lambda r: r.name):
+            lines.append(f"{r.name:<{width}}  {r.status:<7}  {r.duration:>8.2f}")
+        lines.append("-" * len(lines[0]))
+        speedup = self.serial_time / self.wall_time if self.wall_time else 0.0
+        lines.append(
+            f"{self.passed} passed, {self.failed} failed in {self.wall_time:.1f}s "
+            f"(sum of scenarios {self.serial_time:.1f}s, x{speedup:.1f})"
+        )
+        return "\n".join(lines)
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2), encoding="utf-8")
+
+
+class _BrowserLease:
+    """Stands in for the ``Browser`` a scenario believes it launched."""
+
+    def __init__(self, browser: Browser, scenario: Scenario, plugins: Sequence[RunnerPlugin]):
+        self._browser = browser
+        self._scenario = scenario
+        self._plugins = plugins
+        self._contexts: List[BrowserContext] = []
+
+    async def new_context(self, **kwargs: Any) -> BrowserContext:
+        options: Dict[str, Any] = {}
+        for plugin in self._plugins:
+            options.update(await plugin.context_options(self._scenario))
+        options.update(kwargs)
+        context = await self._browser.new_context(**options)
+        self._contexts.append(context)
+        for plugin in self._plugins:
+            await plugin.on_context(self._scenario, context)
+        return context
+
+    async def close(self) -> None:
+        for context in self._contexts:
+            try:
+                await context.close()
+            except async_api.Error:
+                pass
+        self._contexts.clear()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._browser, name)
+
+
+class _BrowserTypeShim:
+    def __init__(self, lease: _BrowserLease):
+        self._lease = lease
+
+    async def launch(self, **_: Any) -> _BrowserLease:
+        return self._lease
+
+
+class _PlaywrightShim:
+    def __init__(self, lease: _BrowserLease):
+        # Scripts are hard-wired to ``pw.chromium``; every engine attribute
+        # resolves to whichever browser the runner actually launched.
+        self.chromium = self.firefox = self.webkit = _BrowserTypeShim(lease)
+
+    async def start(self) -> "_PlaywrightShim":
+        return self
+
+    async def stop(self) -> None:
+        pass
+
+
+class AsyncApiShim:
+    """Replacement for the ``async_api`` module global inside a scenario."""
+
+    Error = async_api.Error
+    TimeoutError = async_api.TimeoutError
+
+    def __init__(self, lease: _BrowserLease):
+        self._playwright = _PlaywrightShim(lease)
+
+    def async_playwright(self) -> _PlaywrightShim:
+        return self._playwright
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(async_api, name)
+
+
+async def run_scenario(
+    browser: Browser,
+    scenario: Scenario,
+    *,
+    plugins: Sequence[RunnerPlugin] = (),
+    timeout: Optional[float] = None,
+    engine: str = "chromium",
+    origin: Optional[float] = None,
+) -> ScenarioResult:
+    """Run one scenario inside its own contexts on ``browser``."""
+    lease = _BrowserLease(browser, scenario, plugins)
+    overrides: Dict[str, Any] = {}
+    for plugin in plugins:
+        overrides.update(await plugin.namespace(scenario))
+    run_test = scenario.bind(AsyncApiShim(lease), **overrides)
+    origin = time.perf_counter() if origin is None else origin
+    started = time.perf_counter()
+    status, error = "passed", None
+    try:
+        await asyncio.wait_for(run_test(), timeout)
+    except AssertionError as exc:
+        status, error = "failed", str(exc) or "assertion failed"
+    except asyncio.TimeoutError:
+        status, error = "error", f"scenario exceeded {timeout}s"
+    except Exception as exc:  # noqa: BLE001 - report, don't abort the suite
+        status = "error"
+        error = "".join(traceback.format_exception_only(type(exc), exc)).strip()
+    finally:
+        await lease.close()
+    result = ScenarioResult(
+        name=scenario.name,
+        tc_id=scenario.tc_id,
+        title=scenario.title,
+        status=status,
+        duration=time.perf_counter() - started,
+        started_at=started - origin,
+        engine=engine,
+        error=error,
+    )
+    for plugin in plugins:
+        await plugin.on_result(scenario, result)
+    return result
+
+
+async def execute(
+    browser: Browser,
+    scenarios: Iterable[Scenario],
+    *,
+    concurrency: int = 4,
+    plugins: Sequence[RunnerPlugin] = (),
+    timeout: Optional[float] = None,
+    engine: str = "chromium",
+) -> List[ScenarioResult]:
+    """Run ``scenarios`` on an already launched browser, bounded by ``concurrency``."""
+    gate = asyncio.Semaphore(max(1, concurrency))
+    origin = time.perf_counter()
+
+    async def guarded(scenario: Scenario) -> ScenarioResult:
+        async with gate:
+            return await run_scenario(
+                browser,
+                scenario,
+                plugins=plugins,
+                timeout=timeout,
+                engine=engine,
+                origin=origin,
+            )
+
+    return list(await asyncio.gather(*(guarded(s) for s in scenarios)))
+
+
+async def launch(pw: Any, engine: str = "chromium", headless: bool = True) -> Browser:
+    browser_type = getattr(pw, engine)
+    args = LAUNCH_ARGS if engine == "chromium" else []
+    return await browser_type.launch(headless=headless, args=args)
+
+
+async def run_suite(
+    scenarios: Sequence[Scenario],
+    *,
+    concurrency: int = 4,
+    headless: bool = True,
+    engine: str = "chromium",
+    plugins: Sequence[RunnerPlugin] = (),
+    timeout: Optional[float] = None,
+) -> SuiteReport:
+    started = time.perf_counter()
+    async with async_api.async_playwright() as pw:
+        browser = await launch(pw, engine, headless)
+        try:
+            for plugin in plugins:
+                await plugin.on_suite_start(browser)
+            results = await execute(
+                browser,
+                scenarios,
+                concurrency=concurrency,
+                plugins=plugins,
+                timeout=timeout,
+                engine=engine,
+            )
+        finally:
+            await browser.close()
+    report = SuiteReport(
+        results=results,
+        wall_time=time.perf_counter() - started,
+        concurrency=concurrency,
+        engines=[engine],
+    )
+    for plugin in plugins:
+        await plugin.on_suite_end(report)
+    return report
+
+
+def _fault(text: str) -> Any:
+    from .netem import Fault
+
+    try:
+        return Fault.parse(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    from .netem import PROFILES
+
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.runner",
+        description="Run TestSprite scenarios concurrently on one shared browser.",
+    )
+    parser.add_argument("patterns", nargs="*", help="substrings of scenario file names to run")
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=int(os.environ.get("TESTSPRITE_CONCURRENCY", "4")),
+        help="maximum scenarios in flight (default: 4 or $TESTSPRITE_CONCURRENCY)",
+    )
+    parser.add_argument("--engine", default="chromium", choices=["chromium", "firefox", "webkit"])
+    parser.add_argument("--headed", action="store_true", help="show the browser window")
+    parser.add_argument("--timeout", type=float, default=None, help="per-scenario timeout in seconds")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT, help="JSON report path")
+    parser.add_argument(
+        "--event-waits",
+        action="store_true",
+        help="replace the scripts' fixed sleeps with event-driven waits",
+    )
+    parser.add_argument(
+        "--sessions",
+        action="store_true",
+        help="start role-bound scenarios already logged in (cached per role)",
+    )
+    parser.add_argument(
+        "--devices",
+        default=None,
+        metavar="LIST",
+        help="run each scenario once per device profile, concurrently (comma list or 'all')",
+    )
+    parser.add_argument(
+        "--net",
+        default=None,
+        choices=sorted(PROFILES),
+        metavar="PROFILE",
+        help="emulate a degraded network (%(choices)s)",
+    )
+    parser.add_argument(
+        "--fault",
+        type=_fault,
+        action="append",
+        default=[],
+        metavar="ROUTE=ACTION",
+        help="inject a fault on matching /api routes, e.g. 'GET /api/gigs=500' (repeatable)",
+    )
+    parser.add_argument(
+        "--network",
+        action="store_true",
+        help="record backend call timings per scenario and print a per-route table",
+    )
+    parser.add_argument(
+        "--budgets",
+        type=Path,
+        default=None,
+        help="JSON of per-route latency budgets in ms (implies --network)",
+    )
+    parser.add_argument(
+        "--record-impact",
+        action="store_true",
+        help="record the routes and pages each scenario touches for harness.impact",
+    )
+    parser.add_argument(
+        "--trace",
+        action="store_true",
+        help="record Playwright traces and CDP profiles and report where each scenario spends its time",
+    )
+    parser.add_argument("--trace-top", type=int, default=15, help="entries in the slow frame/task/function lists")
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="time the scripts' steps and append the run to tmp/history.sqlite (see harness.history)",
+    )
+    parser.add_argument("--history-label", default=None, help="label of the run in the history store")
+    return parser
+
+
+def plugins_from_args(args: argparse.Namespace) -> List[RunnerPlugin]:
+    """Instantiate the optional plugins selected on the command line."""
+    plugins: List[RunnerPlugin] = []
+    if args.event_waits:
+        from .waits import EventWaits
+
+        plugins.append(EventWaits())
+    if args.sessions:
+        from .sessions import Sessions
+
+        plugins.append(Sessions())
+    if args.network or args.budgets:
+        from .network import DEFAULT_NETWORK_REPORT, Budgets, NetworkTiming
+
+        # Shard workers only see part of the suite; they check budgets but
+        # must not overwrite each other's route report.
+        report = DEFAULT_NETWORK_REPORT if getattr(args, "suite_reports", True) else None
+        plugins.append(NetworkTiming(Budgets.load(args.budgets) if args.budgets else None, report=report))
+    if args.net or args.fault:
+        from .netem import PROFILES, NetworkConditions
+
+        profile = PROFILES[args.net or "perfect"]
+        plugins.append(NetworkConditions(profile, args.fault))
+    if args.record_impact:
+        from .impact import ImpactRecorder
+
+        plugins.append(ImpactRecorder())
+    if args.trace:
+        from .tracing import Tracing
+
+        plugins.append(Tracing(top=args.trace_top))
+    if args.history:
+        from .history import DEFAULT_DB, RunHistory
+
+        # Shard workers only time steps; the parent stores the merged run.
+        store = DEFAULT_DB if getattr(args, "record_history", True) else None
+        plugins.append(RunHistory(store, label=args.history_label))
+    return plugins
+
+
+def main(argv: Optional[Sequence[str]] = None, plugins: Sequence[RunnerPlugin] = ()) -> int:
+    args = build_parser().parse_args(argv)
+    scenarios = discover(args.patterns)
+    if not scenarios:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    plugins = list(plugins) + plugins_from_args(args)
+    if args.devices:
+        from .devices import DeviceMatrix
+
+        try:
+            matrix = DeviceMatrix(args.devices.split(","))
+        except ValueError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        scenarios = matrix.expand(scenarios)
+        plugins.append(matrix)
+    report = asyncio.run(
+        run_suite(
+            scenarios,
+            concurrency=args.concurrency,
+            headless=not args.headed,
+            engine=args.engine,
+            plugins=plugins,
+            timeout=args.timeout,
+        )
+    )
+    print(report.format_table())
+    report.write(args.report)
+    print(f"Report written to {args.report}")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,142 @@
+"""Discovery and loading of the generated ``TC*.py`` scenario scripts.
+
+Every generated script ends with a module-level ``asyncio.run(run_test())``,
+so importing one would immediately execute it against a private browser.
+``load_scenario`` compiles the script with that trailing call removed and
+lets the caller rebind the script's ``async_api`` global before
+``run_test`` is invoked.
+
+The scripts mark each step of the journey with a ``# -> description``
+comment.  Before every such step a ``__step__(index)`` call is compiled
+in; it does nothing unless a runner plugin rebinds ``__step__`` to time
+the steps (see ``history.py``).
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import re
+import tokenize
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import CodeType
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+_TC_ID = re.compile(r"^(TC\d{3})_(.+)$")
+_STEP = re.compile(r"#\s*->\s*(.+)")
+
+
+def _no_step(index: int) -> None:
+    pass
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A single generated test script, compiled but not executed."""
+
+    name: str
+    tc_id: str
+    title: str
+    path: Path
+    code: CodeType = field(repr=False, compare=False)
+    steps: Tuple[str, ...] = field(default=(), repr=False, compare=False)
+
+    def bind(self, async_api: Any, **overrides: Any) -> Callable[[], Awaitable[None]]:
+        """Return the script's ``run_test`` with ``async_api`` replaced.
+
+        ``overrides`` rebinds further module globals (e.g. ``asyncio``).
+        The script is executed into a fresh namespace on every call so the
+        same scenario can run concurrently under different shims.
+        """
+        namespace = {
+            "__name__": f"testsprite_tests.{self.name}",
+            "__file__": str(self.path),
+            "__step__": _no_step,
+        }
+        exec(self.code, namespace)
+        namespace.update(overrides)
+        namespace["async_api"] = async_api
+        return namespace["run_test"]
+
+
+def _is_entrypoint_call(node: ast.stmt) -> bool:
+    """Match a module-level ``asyncio.run(...)`` statement."""
+    if not isinstance(node, ast.Expr) or not isinstance(node.value, ast.Call):
+        return False
+    func = node.value.func
+    return (
+        isinstance(func, ast.Attribute)
+        and func.attr == "run"
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "asyncio"
+    )
+
+
+def _mark_steps(tree: ast.Module, source: str) -> Tuple[str, ...]:
+    """Insert ``__step__(i)`` before the statement following each step comment."""
+    comments = [
+        (tok.start[0], match.group(1).strip())
+        for tok in tokenize.generate_tokens(io.StringIO(source).readline)
+        if tok.type == tokenize.COMMENT and (match := _STEP.match(tok.string))
+    ]
+    statements = sorted({node.lineno for node in ast.walk(tree) if isinstance(node, ast.stmt)})
+    markers: Dict[int, List[int]] = {}
+    for index, (line, _) in enumerate(comments):
+        following = next((n for n in statements if n > line), None)
+        if following is not None:
+            markers.setdefault(following, []).append(index)
+
+    for node in ast.walk(tree):
+        for attr in ("body", "orelse", "finalbody"):
+            body = getattr(node, attr, None)
+            if not isinstance(body, list) or not body or not isinstance(body[0], ast.stmt):
+                continue
+            marked: List[ast.stmt] = []
+            for stmt in body:
+                for index in markers.pop(stmt.lineno, []):
+                    call = ast.Call(ast.Name("__step__", ast.Load()), [ast.Constant(index)], [])
+                    marked.append(ast.copy_location(ast.Expr(call), stmt))
+                marked.append(stmt)
+            setattr(node, attr, marked)
+    ast.fix_missing_locations(tree)
+    return tuple(text for _, text in comments)
+
+
+def load_scenario(path: Path) -> Scenario:
+    source = path.read_text(encoding="utf-8")
+    tree = ast.parse(source, filename=str(path))
+    tree.body = [node for node in tree.body if not _is_entrypoint_call(node)]
+    steps = _mark_steps(tree, source)
+    code = compile(tree, str(path), "exec")
+
+    match = _TC_ID.match(path.stem)
+    tc_id, title = (match.group(1), match.group(2)) if match else (path.stem, path.stem)
+    return Scenario(
+        name=path.stem,
+        tc_id=tc_id,
+        title=title.replace("_", " "),
+        path=path,
+        code=code,
+        steps=steps,
+    )
+
+
+def discover(
+    patterns: Optional[Iterable[str]] = None,
+    directory: Path = TESTS_DIR,
+) -> List[Scenario]:
+    """Load every ``TC*.py`` script, optionally filtered by substrings.
+
+    A pattern matches if it is contained in the file stem, so ``TC019``
+    selects both TC019 variants and ``Payment`` selects by title.
+    """
+    wanted = [p.lower() for p in patterns or []]
+    scenarios = []
+    for path in sorted(directory.glob("TC*.py")):
+        if wanted and not any(p in path.stem.lower() for p in wanted):
+            continue
+        scenarios.append(load_scenario(path))
+    return scenarios
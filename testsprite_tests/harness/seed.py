@@ -0,0 +1,666 @@
+"""Synthetic dataset seeder for scale benchmarks of the backend's Mongo models.
+
+Bulk-loads Users, Gigs, Bookings (with ``manualPayment`` subdocuments),
+Reviews, Payments, Wallets / WalletTransactions and Activities straight
+into MongoDB with batched ``insert_many`` so ``getGigs``, ``getBookings``
+and ``getClassAnalytics`` can be measured on realistic volumes.
+
+Distributions aim for what a live marketplace looks like rather than
+uniform noise: teacher popularity follows a Zipf-like heavy tail, a few
+gigs are featured or promoted, most bookings end up completed, ratings
+skew high, and activity volume tracks booking volume.
+
+Output is fully determined by ``--seed`` (ObjectIds included), so two
+runs with the same arguments produce identical collections::
+
+    python -m harness.seed --uri mongodb://localhost:27017/educonnect_bench \\
+        --students 200000 --teachers 5000 --bookings 2000000 \\
+        --activities 10000000 --drop --indexes
+
+Activities are generated in independent, seeded chunks by a process pool,
+which is what keeps ten million documents in the range of minutes.
+Every seeded account can log in with ``Seed-Passw0rd!``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import bisect
+import itertools
+import os
+import random
+import struct
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, MongoClient, UpdateOne
+from pymongo.database import Database
+
+CATEGORIES = [
+    "Mathematics",
+    "Science",
+    "English",
+    "History",
+    "Computer Science",
+    "Art",
+    "Languages",
+    "Programming",
+]
+# bcryptjs hash of "Seed-Passw0rd!" (cost 10); hashing per user would dominate the run.
+PASSWORD_HASH = "$2b$10$B4SMLbtLc0DRgERilijYaumELW9c2fI7oWU3Z6xflYGAhT3Z4a2HW"
+COMMISSION_RATE = 0.10
+EPOCH = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+BOOKING_STATUS = (("completed", 0.50), ("accepted", 0.22), ("pending", 0.16), ("rejected", 0.12))
+ACCEPTED_PAYMENT = (("pending_manual", 0.35), ("submitted", 0.30), ("verified", 0.25), ("rejected", 0.07), ("expired", 0.03))
+RATINGS = ((5, 0.55), (4, 0.28), (3, 0.10), (2, 0.04), (1, 0.03))
+ACTIVITY_ACTIONS = (
+    ("auth.login", 0.40),
+    ("booking.create", 0.15),
+    ("booking.updateStatus", 0.15),
+    ("booking.payment.submitted", 0.07),
+    ("booking.payment.verified", 0.06),
+    ("review.create", 0.04),
+    ("user.updateMe", 0.05),
+    ("gig.update", 0.04),
+    ("wallet.withdraw.request", 0.02),
+    ("auth.register", 0.02),
+)
+COLLECTIONS = (
+    "users",
+    "gigs",
+    "bookings",
+    "reviews",
+    "payments",
+    "wallets",
+    "wallettransactions",
+    "activities",
+)
+
+# Mirrors the schema-level indexes declared in backend/src/models.
+INDEXES: Dict[str, List[Tuple[List[Tuple[str, int]], Dict[str, Any]]]] = {
+    "users": [([("email", ASCENDING)], {"unique": True})],
+    "gigs": [
+        ([("averageRating", ASCENDING)], {}),
+        ([("isFeatured", ASCENDING)], {}),
+        ([("isPromoted", ASCENDING)], {}),
+        ([("completedBookingsCount", ASCENDING)], {}),
+        ([("rankingScore", ASCENDING)], {}),
+        ([("category", ASCENDING), ("rankingScore", DESCENDING)], {}),
+        (
+            [("category", ASCENDING), ("isFeatured", DESCENDING), ("isPromoted", DESCENDING), ("rankingScore", DESCENDING)],
+            {},
+        ),
+    ],
+    "bookings": [
+        ([("scheduledAt", ASCENDING)], {}),
+        ([("attended", ASCENDING)], {}),
+        ([("reviewVisibility", ASCENDING)], {}),
+        ([("paymentRefCode", ASCENDING)], {"unique": True, "sparse": True}),
+        ([("manualPayment.status", ASCENDING)], {}),
+        ([("manualPayment.methodType", ASCENDING)], {}),
+    ],
+    "reviews": [
+        ([("gig", ASCENDING)], {}),
+        ([("teacher", ASCENDING)], {}),
+        ([("student", ASCENDING)], {}),
+        ([("student", ASCENDING), ("gig", ASCENDING)], {"unique": True}),
+    ],
+    "payments": [
+        ([("bookingId", ASCENDING)], {}),
+        ([("status", ASCENDING)], {}),
+        ([("transactionId", ASCENDING)], {"unique": True}),
+        ([("bookingId", ASCENDING), ("studentId", ASCENDING), ("status", ASCENDING)], {}),
+        ([("gigId", ASCENDING), ("studentId", ASCENDING), ("status", ASCENDING)], {}),
+    ],
+    "wallets": [([("teacher", ASCENDING)], {"unique": True})],
+    "wallettransactions": [
+        ([("wallet", ASCENDING)], {}),
+        ([("teacher", ASCENDING)], {}),
+        ([("type", ASCENDING)], {}),
+        ([("status", ASCENDING)], {}),
+    ],
+    "activities": [
+        ([("user", ASCENDING)], {}),
+        ([("action", ASCENDING)], {}),
+        ([("targetType", ASCENDING)], {}),
+        ([("targetId", ASCENDING)], {}),
+        ([("createdAt", DESCENDING)], {}),
+        ([("user", ASCENDING), ("createdAt", DESCENDING)], {}),
+        ([("action", ASCENDING), ("createdAt", DESCENDING)], {}),
+    ],
+}
+
+
+@dataclass
+class SeedConfig:
+    uri: str
+    students: int = 10_000
+    teachers: int = 500
+    admins: int = 2
+    gigs_per_teacher: float = 3.0
+    bookings: int = 100_000
+    review_rate: float = 0.4
+    sslcommerz_rate: float = 0.1
+    activities: int = 1_000_000
+    days: int = 365
+    zipf: float = 1.1
+    seed: int = 42
+    batch: int = 10_000
+    workers: int = max(1, (os.cpu_count() or 2) - 1)
+
+
+class Ids:
+    """Reproducible ObjectIds: timestamp bytes from ``when``, the rest from the RNG."""
+
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+
+    def at(self, when: datetime) -> ObjectId:
+        return ObjectId(struct.pack(">I", int(when.timestamp())) + self.rng.getrandbits(64).to_bytes(8, "big"))
+
+
+class Weighted:
+    """``random.choices`` with the cumulative weights computed once."""
+
+    def __init__(self, options: Sequence[Any], weights: Sequence[float]):
+        self.options = list(options)
+        self.cumulative = list(itertools.accumulate(weights))
+
+    @classmethod
+    def of(cls, pairs: Sequence[Tuple[Any, float]]) -> "Weighted":
+        return cls([p[0] for p in pairs], [p[1] for p in pairs])
+
+    def pick(self, rng: random.Random) -> Any:
+        return self.options[bisect.bisect_right(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+@dataclass
+class GigStats:
+    price: int
+    teacher: int
+    completed: int = 0
+    rating_sum: int = 0
+    reviews: int = 0
+
+
+@dataclass
+class World:
+    students: List[ObjectId] = field(default_factory=list)
+    teachers: List[ObjectId] = field(default_factory=list)
+    gigs: List[ObjectId] = field(default_factory=list)
+    gig_stats: List[GigStats] = field(default_factory=list)
+    bookings: int = 0
+    booking_sample: List[ObjectId] = field(default_factory=list)  # activity targets
+
+
+def _when(rng: random.Random, days: int, end: datetime = EPOCH) -> datetime:
+    # Skew towards recent dates: traffic grows over the year.
+    return end - timedelta(seconds=int((rng.random() ** 1.6) * days * 86400))
+
+
+def _batched(docs: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    for doc in docs:
+        batch.append(doc)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def insert(db: Database, name: str, docs: Iterable[Dict[str, Any]], batch: int) -> int:
+    collection = db[name]
+    total = 0
+    for chunk in _batched(docs, batch):
+        collection.insert_many(chunk, ordered=False, bypass_document_validation=True)
+        total += len(chunk)
+    return total
+
+
+def gen_users(cfg: SeedConfig, rng: random.Random, ids: Ids, world: World) -> Iterator[Dict[str, Any]]:
+    roles = [("admin", cfg.admins), ("teacher", cfg.teachers), ("student", cfg.students)]
+    for role, count in roles:
+        for n in range(count):
+            created = _when(rng, cfg.days)
+            _id = ids.at(created)
+            if role == "teacher":
+                world.teachers.append(_id)
+            elif role == "student":
+                world.students.append(_id)
+            yield {
+                "_id": _id,
+                "name": f"Seed {role.title()} {n}",
+                "email": f"seed.{role}.{n}@educonnect.test",
+                "password": PASSWORD_HASH,
+                "role": role,
+                "isOnboarded": True,
+                "teacherRatingSum": 0,
+                "teacherReviewsCount": 0,
+                "teacherRatingAverage": 0,
+                "createdAt": created,
+                "updatedAt": created,
+                "__v": 0,
+            }
+
+
+def gen_gigs(cfg: SeedConfig, rng: random.Random, ids: Ids, world: World) -> Iterator[Dict[str, Any]]:
+    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    for t_index, teacher in enumerate(world.teachers):
+        count = max(1, int(rng.expovariate(1 / cfg.gigs_per_teacher)))
+        for n in range(count):
+            created = _when(rng, cfg.days)
+            _id = ids.at(created)
+            price = rng.choice([200, 300, 500, 500, 800, 1000, 1500, 2500])
+            world.gigs.append(_id)
+            world.gig_stats.append(GigStats(price=price, teacher=t_index))
+            promoted = rng.random() < 0.05
+            yield {
+                "_id": _id,
+                "teacher": teacher,
+                "title": f"{rng.choice(CATEGORIES)} class {t_index}-{n}",
+                "description": "Seeded gig for scale benchmarks.",
+                "price": price,
+                "category": rng.choice(CATEGORIES),
+                "duration": rng.choice([30, 45, 60, 60, 90, 120]),
+                "averageRating": 0,
+                "reviewsCount": 0,
+                "availability": {"days": rng.sample(days, 3), "times": ["10:00", "18:00"]},
+                "isFeatured": rng.random() < 0.01,
+                "isPromoted": promoted,
+                "promotedUntil": EPOCH + timedelta(days=rng.randint(-10, 30)) if promoted else None,
+                "completedBookingsCount": 0,
+                "viewsCount": 0,
+                "rankingScore": 0,
+                "createdAt": created,
+                "updatedAt": created,
+                "__v": 0,
+            }
+
+
+def gen_bookings(
+    cfg: SeedConfig,
+    rng: random.Random,
+    ids: Ids,
+    world: World,
+    reviews: List[Dict[str, Any]],
+    payments: List[Dict[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """Bookings, collecting reviews and SSLCommerz payments on the side."""
+    teacher_weight = [1 / (rank + 1) ** cfg.zipf for rank in range(len(world.teachers))]
+    rng.shuffle(teacher_weight)
+    gig_pick = Weighted(
+        range(len(world.gigs)),
+        [teacher_weight[s.teacher] * rng.uniform(0.5, 1.5) for s in world.gig_stats],
+    )
+    status_pick = Weighted.of(BOOKING_STATUS)
+    payment_pick = Weighted.of(ACCEPTED_PAYMENT)
+    rating_pick = Weighted.of(RATINGS)
+    reviewed: Set[Tuple[int, int]] = set()
+
+    for n in range(cfg.bookings):
+        g = gig_pick.pick(rng)
+        stats = world.gig_stats[g]
+        s = rng.randrange(len(world.students))
+        created = _when(rng, cfg.days)
+        scheduled = created + timedelta(days=rng.randint(1, 21), hours=rng.randint(8, 20))
+        status = status_pick.pick(rng)
+        _id = ids.at(created)
+        doc: Dict[str, Any] = {
+            "_id": _id,
+            "student": world.students[s],
+            "gig": world.gigs[g],
+            "status": status,
+            "scheduledDate": scheduled.replace(hour=0),
+            "scheduledTime": f"{scheduled.hour:02d}:00",
+            "scheduledAt": scheduled,
+            "timeZone": "Asia/Dhaka",
+            "attended": status == "completed" and rng.random() < 0.9,
+            "reviewVisibility": status == "completed",
+            "paymentRefCode": f"TC-BOOK-{n:08X}",
+            "createdAt": created,
+            "updatedAt": created,
+            "__v": 0,
+        }
+        if status in ("accepted", "completed"):
+            pay_status = "verified" if status == "completed" else payment_pick.pick(rng)
+            accepted_at = created + timedelta(hours=rng.randint(1, 48))
+            manual: Dict[str, Any] = {
+                "methodType": "manual",
+                "status": pay_status,
+                "amountExpected": stats.price,
+                "submissionCount": 0 if pay_status == "pending_manual" else rng.randint(1, 2),
+                "acceptedAt": accepted_at,
+            }
+            if pay_status != "pending_manual":
+                manual.update(
+                    method=rng.choice(["bkash", "bkash", "nagad", "bank"]),
+                    amountPaid=stats.price,
+                    trxid=f"SD{n:010d}",
+                    senderNumber=f"017{rng.randint(10_000_000, 99_999_999)}",
+                    submittedAt=accepted_at + timedelta(hours=rng.randint(1, 24)),
+                )
+            if pay_status == "verified":
+                manual["verifiedAt"] = manual["submittedAt"] + timedelta(hours=rng.randint(1, 12))
+            doc["manualPayment"] = manual
+            doc["meetingRoomId"] = f"seed-{n}"
+            doc["meetingLink"] = f"https://meet.jit.si/seed-{n}"
+        world.bookings += 1
+        # Reservoir sample so activity targets reference real bookings.
+        if len(world.booking_sample) < 50_000:
+            world.booking_sample.append(_id)
+        else:
+            slot = rng.randrange(world.bookings)
+            if slot < 50_000:
+                world.booking_sample[slot] = _id
+
+        if status == "completed":
+            stats.completed += 1
+            if rng.random() < cfg.review_rate and (s, g) not in reviewed:
+                reviewed.add((s, g))
+                rating = rating_pick.pick(rng)
+                stats.rating_sum += rating
+                stats.reviews += 1
+                doc["studentRating"] = rating
+                at = scheduled + timedelta(days=rng.randint(0, 5))
+                reviews.append(
+                    {
+                        "_id": ids.at(at),
+                        "gig": world.gigs[g],
+                        "teacher": world.teachers[stats.teacher],
+                        "student": world.students[s],
+                        "booking": _id,
+                        "rating": rating,
+                        "comment": "Seeded review.",
+                        "createdAt": at,
+                        "updatedAt": at,
+                        "__v": 0,
+                    }
+                )
+        if status in ("accepted", "completed") and rng.random() < cfg.sslcommerz_rate:
+            payments.append(
+                {
+                    "_id": ids.at(created),
+                    "gigId": world.gigs[g],
+                    "studentId": world.students[s],
+                    "teacherId": world.teachers[stats.teacher],
+                    "bookingId": _id,
+                    "amount": stats.price,
+                    "status": "SUCCESS",
+                    "transactionId": f"SEED-{n:010d}",
+                    "statusHistory": [{"status": "PENDING", "at": created}, {"status": "SUCCESS", "at": created}],
+                    "createdAt": created,
+                    "updatedAt": created,
+                    "__v": 0,
+                }
+            )
+        yield doc
+
+
+def gen_wallets(
+    cfg: SeedConfig, rng: random.Random, ids: Ids, world: World, transactions: List[Dict[str, Any]]
+) -> Iterator[Dict[str, Any]]:
+    """One wallet per teacher whose balance equals the sum of its transactions."""
+    earned = [0.0] * len(world.teachers)
+    credits = [0] * len(world.teachers)
+    for stats in world.gig_stats:
+        earned[stats.teacher] += stats.completed * stats.price
+        credits[stats.teacher] += stats.completed
+    for t, teacher in enumerate(world.teachers):
+        wallet_id = ids.at(EPOCH - timedelta(days=cfg.days))
+        total_net = total_withdrawn = 0.0
+        # Aggregate credits per teacher into at most 50 transactions to keep volume sane.
+        remaining, chunks = earned[t], min(credits[t], 50)
+        for c in range(chunks):
+            amount = round(remaining / (chunks - c), 2)
+            remaining -= amount
+            commission = round(amount * COMMISSION_RATE, 2)
+            net = round(amount - commission, 2)
+            total_net += net
+            at = _when(rng, cfg.days)
+            transactions.append(
+                {
+                    "_id": ids.at(at),
+                    "wallet": wallet_id,
+                    "teacher": teacher,
+                    "type": "CREDIT",
+                    "amount": amount,
+                    "commission": commission,
+                    "netAmount": net,
+                    "status": "COMPLETED",
+                    "description": "Seeded class earnings",
+                    "createdAt": at,
+                    "updatedAt": at,
+                    "__v": 0,
+                }
+            )
+        if total_net > 0 and rng.random() < 0.5:
+            amount = round(total_net * rng.uniform(0.2, 0.8), 2)
+            total_withdrawn = amount
+            at = _when(rng, cfg.days // 4)
+            transactions.append(
+                {
+                    "_id": ids.at(at),
+                    "wallet": wallet_id,
+                    "teacher": teacher,
+                    "type": "WITHDRAWAL",
+                    "amount": amount,
+                    "commission": 0,
+                    "netAmount": amount,
+                    "status": "COMPLETED",
+                    "description": "Seeded withdrawal",
+                    "withdrawalMethod": "MOBILE_BANKING",
+                    "withdrawalDetails": {"mobileNumber": "01700000000"},
+                    "createdAt": at,
+                    "updatedAt": at,
+                    "__v": 0,
+                }
+            )
+        yield {
+            "_id": wallet_id,
+            "teacher": teacher,
+            "balance": round(total_net - total_withdrawn, 2),
+            "totalEarned": round(total_net, 2),
+            "totalWithdrawn": total_withdrawn,
+            "currency": "BDT",
+            "createdAt": EPOCH - timedelta(days=cfg.days),
+            "updatedAt": EPOCH,
+            "__v": 0,
+        }
+
+
+def _activity_chunk(args: Tuple[SeedConfig, int, int, List[bytes], List[bytes]]) -> int:
+    """Generate and insert one chunk of activities in a worker process."""
+    cfg, chunk, count, user_ids, target_ids = args
+    rng = random.Random(f"{cfg.seed}:activities:{chunk}")
+    ids = Ids(rng)
+    users = [ObjectId(u) for u in user_ids]
+    targets = [ObjectId(t) for t in target_ids]
+    # Heavy tail again: a minority of users produce most of the events.
+    user_pick = Weighted(range(len(users)), [1 / (i + 1) ** 0.8 for i in range(len(users))])
+    action_pick = Weighted.of(ACTIVITY_ACTIONS)
+
+    def docs() -> Iterator[Dict[str, Any]]:
+        for _ in range(count):
+            at = _when(rng, cfg.days)
+            action = action_pick.pick(rng)
+            doc: Dict[str, Any] = {
+                "_id": ids.at(at),
+                "user": users[user_pick.pick(rng)],
+                "action": action,
+                "ip": f"103.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                "userAgent": "Mozilla/5.0 (seed)",
+                "createdAt": at,
+                "updatedAt": at,
+                "__v": 0,
+            }
+            if action.startswith("booking.") and targets:
+                doc["targetType"] = "Booking"
+                doc["targetId"] = rng.choice(targets)
+            yield doc
+
+    client = MongoClient(cfg.uri)
+    try:
+        return insert(client.get_default_database(), "activities", docs(), cfg.batch)
+    finally:
+        client.close()
+
+
+def seed(cfg: SeedConfig, *, drop: bool = False, indexes: bool = False, log=print) -> Dict[str, int]:
+    client = MongoClient(cfg.uri)
+    db = client.get_default_database()
+    rng = random.Random(cfg.seed)
+    ids = Ids(rng)
+    world = World()
+    counts: Dict[str, int] = {}
+
+    def step(name: str, docs: Iterable[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        counts[name] = insert(db, name, docs, cfg.batch)
+        elapsed = time.perf_counter() - started
+        log(f"[seed] {name:<20} {counts[name]:>11,} docs in {elapsed:7.1f}s")
+
+    try:
+        if drop:
+            for name in COLLECTIONS:
+                db.drop_collection(name)
+
+        step("users", gen_users(cfg, rng, ids, world))
+        step("gigs", gen_gigs(cfg, rng, ids, world))
+
+        reviews: List[Dict[str, Any]] = []
+        payments: List[Dict[str, Any]] = []
+        step("bookings", gen_bookings(cfg, rng, ids, world, reviews, payments))
+        step("reviews", reviews)
+        step("payments", payments)
+
+        transactions: List[Dict[str, Any]] = []
+        step("wallets", gen_wallets(cfg, rng, ids, world, transactions))
+        step("wallettransactions", transactions)
+
+        # Back-fill the denormalized rating / ranking fields the API sorts on.
+        _backfill(db, world)
+
+        if cfg.activities:
+            started = time.perf_counter()
+            counts["activities"] = _seed_activities(cfg, world)
+            log(f"[seed] {'activities':<20} {counts['activities']:>11,} docs in {time.perf_counter() - started:7.1f}s")
+
+        if indexes:
+            started = time.perf_counter()
+            for name, specs in INDEXES.items():
+                for keys, options in specs:
+                    db[name].create_index(keys, **options)
+            log(f"[seed] indexes built in {time.perf_counter() - started:.1f}s")
+    finally:
+        client.close()
+    return counts
+
+
+def _backfill(db: Database, world: World) -> None:
+    teacher_sum = [0] * len(world.teachers)
+    teacher_count = [0] * len(world.teachers)
+    gig_ops = []
+    for gig_id, stats in zip(world.gigs, world.gig_stats):
+        average = round(stats.rating_sum / stats.reviews, 2) if stats.reviews else 0
+        teacher_sum[stats.teacher] += stats.rating_sum
+        teacher_count[stats.teacher] += stats.reviews
+        gig_ops.append(
+            UpdateOne(
+                {"_id": gig_id},
+                {
+                    "$set": {
+                        "averageRating": average,
+                        "reviewsCount": stats.reviews,
+                        "completedBookingsCount": stats.completed,
+                        "rankingScore": round(average * 10 + stats.completed * 0.5 + stats.reviews, 2),
+                    }
+                },
+            )
+        )
+    user_ops = [
+        UpdateOne(
+            {"_id": teacher},
+            {
+                "$set": {
+                    "teacherRatingSum": teacher_sum[i],
+                    "teacherReviewsCount": teacher_count[i],
+                    "teacherRatingAverage": round(teacher_sum[i] / teacher_count[i], 2),
+                }
+            },
+        )
+        for i, teacher in enumerate(world.teachers)
+        if teacher_count[i]
+    ]
+    for collection, ops in ((db.gigs, gig_ops), (db.users, user_ops)):
+        for start in range(0, len(ops), 10_000):
+            collection.bulk_write(ops[start : start + 10_000], ordered=False)
+
+
+def _seed_activities(cfg: SeedConfig, world: World) -> int:
+    users = [u.binary for u in world.students + world.teachers]
+    targets = [b.binary for b in world.booking_sample]
+    chunk_size = max(cfg.batch, 250_000)
+    chunks = [
+        (cfg, i, min(chunk_size, cfg.activities - start), users, targets)
+        for i, start in enumerate(range(0, cfg.activities, chunk_size))
+    ]
+    if cfg.workers <= 1:
+        return sum(_activity_chunk(c) for c in chunks)
+    with ProcessPoolExecutor(max_workers=cfg.workers) as pool:
+        return sum(pool.map(_activity_chunk, chunks))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.seed",
+        description="Bulk-load a reproducible synthetic EduConnect dataset into MongoDB.",
+    )
+    parser.add_argument(
+        "--uri",
+        default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017/educonnect_bench"),
+        help="connection string including the database name",
+    )
+    parser.add_argument("--students", type=int, default=SeedConfig.students)
+    parser.add_argument("--teachers", type=int, default=SeedConfig.teachers)
+    parser.add_argument("--gigs-per-teacher", type=float, default=SeedConfig.gigs_per_teacher)
+    parser.add_argument("--bookings", type=int, default=SeedConfig.bookings)
+    parser.add_argument("--review-rate", type=float, default=SeedConfig.review_rate)
+    parser.add_argument("--activities", type=int, default=SeedConfig.activities)
+    parser.add_argument("--days", type=int, default=SeedConfig.days, help="history span")
+    parser.add_argument("--zipf", type=float, default=SeedConfig.zipf, help="teacher popularity skew")
+    parser.add_argument("--seed", type=int, default=SeedConfig.seed)
+    parser.add_argument("--batch", type=int, default=SeedConfig.batch)
+    parser.add_argument("--workers", type=int, default=SeedConfig.workers)
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    parser.add_argument("--indexes", action="store_true", help="build the model indexes after loading")
+    args = parser.parse_args(argv)
+
+    cfg = SeedConfig(
+        uri=args.uri,
+        students=args.students,
+        teachers=args.teachers,
+        gigs_per_teacher=args.gigs_per_teacher,
+        bookings=args.bookings,
+        review_rate=args.review_rate,
+        activities=args.activities,
+        days=args.days,
+        zipf=args.zipf,
+        seed=args.seed,
+        batch=args.batch,
+        workers=args.workers,
+    )
+    started = time.perf_counter()
+    counts = seed(cfg, drop=args.drop, indexes=args.indexes)
+    print(f"[seed] {sum(counts.values()):,} documents in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,361 @@
+"""Authenticated session cache keyed by role.
+
+Instead of every scenario re-driving the login page to reach a logged-in
+state, ``SessionCache`` signs each fixture account in once and reuses it:
+
+* ``get(role)`` - a backend JWT from ``POST /api/auth/login`` (registering
+  the account with its role on first use), for API calls only;
+* ``signed_in(browser, role)`` - additionally a real Clerk sign-in.  The
+  frontend trusts Clerk alone: ``Providers`` clears ``token``/``user``/
+  ``role`` from ``localStorage`` while Clerk reports no session, so seeding
+  a backend JWT does not log the UI in.  A sign-in ticket for the account's
+  Clerk user (created on first use) comes from the Clerk Backend API, the
+  page redeems it with ``Clerk.client.signIn.create`` while Frontend API
+  calls carry a testing token (which skips bot protection), and once
+  ``/auth/clerk-sync`` has stored the backend JWT the context's
+  ``storage_state`` is saved.
+
+Both are persisted under ``tmp/sessions/<role>.json`` and reused on the
+next run while the backend accepts the token and the sign-in is younger
+than ``STATE_MAX_AGE``.  Needs ``CLERK_SECRET_KEY`` and the publishable
+key (``NEXT_PUBLIC_CLERK_PUBLISHABLE_KEY``) of the frontend's instance.
+
+When a scenario's page receives a 401 from the backend's ``protect``
+middleware while presenting a cached token, the session is dropped and the
+next scenario for that role signs in again.
+
+Runner usage::
+
+    python -m harness.runner --sessions
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import urllib.error
+import urllib.request
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote, urlparse
+
+from playwright.async_api import Browser, BrowserContext, Response, Route
+
+from .config import (
+    API_URL,
+    CLERK_API_URL,
+    CLERK_SECRET_KEY,
+    FRONTEND_URL,
+    ROLES,
+    bearer,
+    clerk_frontend_api,
+    credentials,
+)
+from .runner import RunnerPlugin
+from .scenarios import TESTS_DIR, Scenario
+
+SESSIONS_DIR = TESTS_DIR / "tmp" / "sessions"
+STATE_MAX_AGE = 12 * 3600  # seconds a saved Clerk sign-in is reused
+SIGN_IN_TIMEOUT_MS = 20000
+
+# Scenarios that need a logged-in user, by file-name prefix.  The login
+# scenarios (TC003, TC004) test signing in and must start signed out.
+SCENARIO_ROLES: Dict[str, str] = {
+    "TC012_Teacher_Booking_Approval": "teacher",
+    "TC013_Teacher_Booking_Request": "teacher",
+    "TC014_Dashboard_Data_Accuracy_for_Teacher": "teacher",
+    "TC014_Payment_Flow": "student",
+    "TC015_Dashboard_Data_Accuracy_for_Student": "student",
+    "TC016_Real_time_Updates": "teacher",
+    "TC016_Role_Based_Dashboard": "student",
+    "TC017_Real_Time_Updates": "teacher",
+    "TC017_Role_based_Access_Control": "admin",
+    "TC021_Session_Persistence": "student",
+}
+
+
+class AuthError(RuntimeError):
+    pass
+
+
+@dataclass
+class Session:
+    role: str
+    token: str
+    user: Dict[str, Any]
+    created: float
+    state: Optional[Dict[str, Any]] = None  # Playwright storage_state of a Clerk sign-in
+    signed_in: float = 0.0
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        return bearer(self.token)
+
+    @property
+    def browser_ready(self) -> bool:
+        return self.state is not None and time.time() - self.signed_in < STATE_MAX_AGE
+
+    def storage_state(self) -> Dict[str, Any]:
+        if self.state is None:
+            raise AuthError(f"{self.role} session has no browser sign-in; use SessionCache.signed_in")
+        return self.state
+
+
+def _request(
+    method: str,
+    path: str,
+    body: Optional[Dict[str, Any]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 10.0,
+) -> Tuple[int, Dict[str, Any]]:
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    req = urllib.request.Request(
+        f"{API_URL}{path}",
+        data=data,
+        method=method,
+        headers={"Content-Type": "application/json", **(headers or {})},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as resp:
+            return resp.status, json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as exc:
+        try:
+            return exc.code, json.loads(exc.read() or b"{}")
+        except ValueError:
+            return exc.code, {}
+
+
+def login(role: str) -> Session:
+    """Log the fixture account for ``role`` in, registering it on first use."""
+    email, password = credentials(role)
+    status, payload = _request("POST", "/api/auth/login", {"email": email, "password": password})
+    if status == 401:
+        status, payload = _request(
+            "POST",
+            "/api/auth/register",
+            {"name": f"E2E {role.title()}", "email": email, "password": password, "role": role},
+        )
+    if status not in (200, 201) or not payload.get("token"):
+        raise AuthError(f"could not log in as {role} ({status}): {payload.get('message')}")
+    user = payload.get("user") or {}
+    if user.get("role") != role:
+        raise AuthError(f"fixture account {email} has role {user.get('role')!r}, expected {role!r}")
+    return Session(role=role, token=payload["token"], user=user, created=time.time())
+
+
+def _clerk(method: str, path: str, body: Optional[Dict[str, Any]] = None) -> Any:
+    """Call the Clerk Backend API with the instance's secret key."""
+    if not CLERK_SECRET_KEY:
+        raise AuthError("CLERK_SECRET_KEY is not set; it is needed to sign fixture accounts in through Clerk")
+    req = urllib.request.Request(
+        f"{CLERK_API_URL}{path}",
+        data=json.dumps(body).encode("utf-8") if body is not None else None,
+        method=method,
+        headers={"Content-Type": "application/json", **bearer(CLERK_SECRET_KEY)},
+    )
+    try:
+        with urllib.request.urlopen(req, timeout=10.0) as resp:
+            return json.loads(resp.read() or b"{}")
+    except urllib.error.HTTPError as exc:
+        raise AuthError(f"Clerk {method} {path} failed ({exc.code}): {exc.read()[:300]!r}") from exc
+
+
+def clerk_user_id(role: str) -> str:
+    """Id of ``role``'s Clerk user (same e-mail and password), created on first use."""
+    email, password = credentials(role)
+    users = _clerk("GET", f"/users?email_address={quote(email)}")
+    if users:
+        return users[0]["id"]
+    body = {"email_address": [email], "password": password, "skip_password_checks": True}
+    return _clerk("POST", "/users", body)["id"]
+
+
+def clerk_sign_in_ticket(role: str) -> str:
+    """One-time sign-in ticket for ``role``'s Clerk user."""
+    user_id = clerk_user_id(role)
+    return _clerk("POST", "/sign_in_tokens", {"user_id": user_id, "expires_in_seconds": 600})["token"]
+
+
+def clerk_testing_token() -> str:
+    return _clerk("POST", "/testing_tokens")["token"]
+
+
+async def allow_clerk_testing(context: BrowserContext) -> None:
+    """Let ``context`` use Clerk's sign-in without bot protection (testing token)."""
+    frontend_api = clerk_frontend_api()
+    if not frontend_api:
+        raise AuthError("NEXT_PUBLIC_CLERK_PUBLISHABLE_KEY is not set")
+    testing_token = await asyncio.to_thread(clerk_testing_token)
+
+    async def with_testing_token(route: Route) -> None:
+        url = route.request.url
+        separator = "&" if "?" in url else "?"
+        await route.continue_(url=f"{url}{separator}__clerk_testing_token={testing_token}")
+
+    await context.route(f"https://{frontend_api}/v1/**", with_testing_token)
+
+
+# Redeems the ticket the way <SignIn/> would and activates the session;
+# Providers then calls /auth/clerk-sync and stores the backend JWT.
+SIGN_IN_SCRIPT = """
+async (ticket) => {
+  const attempt = await window.Clerk.client.signIn.create({ strategy: 'ticket', ticket });
+  if (attempt.status !== 'complete') throw new Error(`sign-in ${attempt.status}`);
+  await window.Clerk.setActive({ session: attempt.createdSessionId });
+}
+"""
+
+
+async def clerk_sign_in(browser: Browser, role: str) -> Tuple[Dict[str, Any], str, Dict[str, Any]]:
+    """Sign ``role`` in through Clerk in a fresh context.
+
+    Returns the context's ``storage_state`` plus the backend JWT and user
+    that the frontend stored after ``/auth/clerk-sync``.
+    """
+    ticket = await asyncio.to_thread(clerk_sign_in_ticket, role)
+    context = await browser.new_context()
+    try:
+        await allow_clerk_testing(context)
+        page = await context.new_page()
+        await page.goto(f"{FRONTEND_URL}/sign-in", wait_until="domcontentloaded")
+        await page.wait_for_function("() => window.Clerk && window.Clerk.loaded", timeout=SIGN_IN_TIMEOUT_MS)
+        await page.evaluate(SIGN_IN_SCRIPT, ticket)
+        await page.wait_for_function("() => !!localStorage.getItem('token')", timeout=SIGN_IN_TIMEOUT_MS)
+        token, user = await page.evaluate("() => [localStorage.getItem('token'), localStorage.getItem('user')]")
+        state = await context.storage_state()
+    finally:
+        await context.close()
+    user = json.loads(user or "{}")
+    if user.get("role") != role:
+        raise AuthError(f"Clerk user for {role} synced as role {user.get('role')!r}")
+    return state, token, user
+
+
+def is_valid(session: Session) -> bool:
+    """True unless ``protect`` rejects the token."""
+    status, _ = _request("GET", "/api/bookings", headers=session.headers)
+    return status != 401
+
+
+class SessionCache:
+    """One login per role per run, shared across concurrent scenarios."""
+
+    def __init__(self, directory: Path = SESSIONS_DIR):
+        self.directory = directory
+        self._sessions: Dict[str, Session] = {}
+        self._locks = {role: asyncio.Lock() for role in ROLES}
+        self.logins = 0
+
+    def _path(self, role: str) -> Path:
+        return self.directory / f"{role}.json"
+
+    def _load(self, role: str) -> Optional[Session]:
+        try:
+            return Session(**json.loads(self._path(role).read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _store(self, session: Session) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path(session.role).write_text(json.dumps(asdict(session), indent=2), encoding="utf-8")
+
+    async def get(self, role: str) -> Session:
+        """Session with a backend JWT for API calls (no browser sign-in needed)."""
+        if role not in self._locks:
+            raise ValueError(f"unknown role {role!r}")
+        async with self._locks[role]:
+            session = self._sessions.get(role)
+            if session is None:
+                persisted = self._load(role)
+                if persisted is not None and await asyncio.to_thread(is_valid, persisted):
+                    session = persisted
+                else:
+                    session = await asyncio.to_thread(login, role)
+                    self.logins += 1
+                    self._store(session)
+                self._sessions[role] = session
+            return session
+
+    async def signed_in(self, browser: Browser, role: str) -> Session:
+        """Session whose ``storage_state`` is a real Clerk sign-in."""
+        session = await self.get(role)
+        async with self._locks[role]:
+            session = self._sessions.get(role, session)
+            if not session.browser_ready:
+                # The account must exist with its role before clerk-sync
+                # looks it up by e-mail (it would create a student).
+                state, token, user = await clerk_sign_in(browser, role)
+                session = replace(session, token=token, user=user, state=state, signed_in=time.time())
+                self.logins += 1
+                self._store(session)
+                self._sessions[role] = session
+            return session
+
+    def invalidate(self, role: str, token: Optional[str] = None) -> None:
+        """Forget ``role``'s session (only if it still holds ``token``)."""
+        session = self._sessions.get(role)
+        if session is not None and (token is None or session.token == token):
+            del self._sessions[role]
+            self._path(role).unlink(missing_ok=True)
+
+    async def new_context(self, browser: Browser, role: str, **kwargs: Any) -> BrowserContext:
+        """Open a context already logged in as ``role``."""
+        session = await self.signed_in(browser, role)
+        context = await browser.new_context(storage_state=session.storage_state(), **kwargs)
+        self.watch(context, session)
+        return context
+
+    def watch(self, context: BrowserContext, session: Session) -> None:
+        """Drop ``session`` as soon as the backend answers it with a 401."""
+        expected = f"Bearer {session.token}"
+        api_host = urlparse(API_URL).netloc
+
+        def on_response(response: Response) -> None:
+            if response.status != 401:
+                return
+            url = urlparse(response.url)
+            if url.netloc != api_host or not url.path.startswith("/api/"):
+                return
+            if response.request.headers.get("authorization") == expected:
+                self.invalidate(session.role, session.token)
+
+        context.on("response", on_response)
+
+
+def role_for(scenario: Scenario) -> Optional[str]:
+    for prefix, role in SCENARIO_ROLES.items():
+        if scenario.name.startswith(prefix):
+            return role
+    return None
+
+
+class Sessions(RunnerPlugin):
+    """Start role-bound scenarios in a pre-authenticated context."""
+
+    def __init__(self, cache: Optional[SessionCache] = None):
+        self.cache = cache or SessionCache()
+        self._active: Dict[str, Session] = {}
+        self._browser: Optional[Browser] = None
+
+    async def on_suite_start(self, browser: Browser) -> None:
+        self._browser = browser
+
+    async def context_options(self, scenario: Scenario) -> Dict[str, Any]:
+        role = role_for(scenario)
+        if role is None or self._browser is None:
+            return {}
+        session = await self.cache.signed_in(self._browser, role)
+        self._active[scenario.name] = session
+        return {"storage_state": session.storage_state()}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        session = self._active.get(scenario.name)
+        if session is not None:
+            self.cache.watch(context, session)
+
+    async def on_result(self, scenario: Scenario, result: Any) -> None:
+        session = self._active.pop(scenario.name, None)
+        if session is not None:
+            result.extras["session"] = {"role": session.role}
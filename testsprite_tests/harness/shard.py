@@ -0,0 +1,314 @@
+"""Split the suite across worker processes by expected duration.
+
+Expected durations come from ``tmp/timings.json``, which every sharded run
+updates with what it observed.  Scenarios it has not seen yet fall back
+to the TestSprite cloud run in ``tmp/test_results.json`` (``modified -
+created``), and anything still unknown gets the median of the rest.
+
+Scenarios are dealt longest-first onto the least loaded shard (LPT), so
+each worker starts with its own queue of roughly total/N.  A worker that
+drains its queue steals the shortest pending scenario from the shard
+with the most predicted work left, which absorbs estimates that turned
+out wrong.  Each worker runs its own browser with the runner's
+concurrency, and the results are merged into one ``run_report.json`` in
+the usual format::
+
+    python -m harness.shard -n 4                  # 4 processes
+    python -m harness.shard -n 4 -c 2 --sessions  # 2 scenarios per process
+    python -m harness.shard --plan -n 3           # print the split only
+    python -m harness.shard --shard 2/3           # one static LPT shard (CI)
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from multiprocessing.connection import Connection, wait
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+from .scenarios import TESTS_DIR, Scenario, discover, load_scenario
+
+DEFAULT_TIMINGS = TESTS_DIR / "tmp" / "timings.json"
+CLOUD_RESULTS = TESTS_DIR / "tmp" / "test_results.json"
+FALLBACK_SECONDS = 60.0
+
+
+class TimingStore:
+    """Expected seconds per scenario name, smoothed across runs."""
+
+    def __init__(self, path: Path = DEFAULT_TIMINGS, *, alpha: float = 0.5):
+        self.path = path
+        self.alpha = alpha
+        self.seconds: Dict[str, float] = {}
+        if path.exists():
+            self.seconds = json.loads(path.read_text(encoding="utf-8"))
+
+    def estimate(self, scenarios: Sequence[Scenario], cloud: Path = CLOUD_RESULTS) -> Dict[str, float]:
+        fallback = _cloud_durations(cloud)
+        known: Dict[str, float] = {}
+        for s in scenarios:
+            if s.name in self.seconds:
+                known[s.name] = self.seconds[s.name]
+            elif s.tc_id in fallback:
+                known[s.name] = fallback[s.tc_id]
+        default = statistics.median(known.values()) if known else FALLBACK_SECONDS
+        return {s.name: known.get(s.name, default) for s in scenarios}
+
+    def update(self, results: Sequence[Any]) -> None:
+        for r in results:
+            if r.status == "error" and r.error and "exceeded" in r.error:
+                continue  # a timeout says nothing about the usual duration
+            previous = self.seconds.get(r.name)
+            self.seconds[r.name] = (
+                r.duration if previous is None else self.alpha * r.duration + (1 - self.alpha) * previous
+            )
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        rounded = {k: round(v, 3) for k, v in sorted(self.seconds.items())}
+        self.path.write_text(json.dumps(rounded, indent=2), encoding="utf-8")
+
+
+def _cloud_durations(path: Path) -> Dict[str, float]:
+    """``TC001`` -> seconds between ``created`` and ``modified`` in the cloud report."""
+    if not path.exists():
+        return {}
+    out: Dict[str, float] = {}
+    for entry in json.loads(path.read_text(encoding="utf-8")):
+        try:
+            created = datetime.fromisoformat(entry["created"].replace("Z", "+00:00"))
+            modified = datetime.fromisoformat(entry["modified"].replace("Z", "+00:00"))
+        except (KeyError, ValueError):
+            continue
+        tc_id = entry.get("title", "").split("-", 1)[0]
+        if tc_id:
+            out[tc_id] = max((modified - created).total_seconds(), 1.0)
+    return out
+
+
+def lpt(scenarios: Sequence[Scenario], expected: Dict[str, float], shards: int) -> List[List[Scenario]]:
+    """Longest-processing-time-first partition into ``shards`` lists."""
+    buckets: List[List[Scenario]] = [[] for _ in range(max(1, shards))]
+    loads = [0.0] * len(buckets)
+    for scenario in sorted(scenarios, key=lambda s: (-expected[s.name], s.name)):
+        i = loads.index(min(loads))
+        buckets[i].append(scenario)
+        loads[i] += expected[scenario.name]
+    return buckets
+
+
+class StealingQueues:
+    """Per-worker deques, longest first; idle workers steal from the tail."""
+
+    def __init__(self, buckets: Sequence[Sequence[Scenario]], expected: Dict[str, float]):
+        self.expected = expected
+        self.queues: List[Deque[Scenario]] = [deque(b) for b in buckets]
+        self.steals = 0
+
+    def remaining(self, worker: int) -> float:
+        return sum(self.expected[s.name] for s in self.queues[worker])
+
+    def next(self, worker: int) -> Optional[Scenario]:
+        if self.queues[worker]:
+            return self.queues[worker].popleft()
+        victim = max(range(len(self.queues)), key=self.remaining)
+        if not self.queues[victim]:
+            return None
+        self.steals += 1
+        return self.queues[victim].pop()
+
+
+def _worker(worker: int, conn: Connection, args: argparse.Namespace) -> None:
+    """Process entry point: one browser, pulling scenarios from the parent."""
+    from playwright import async_api
+
+    from .runner import ScenarioResult, SuiteReport, launch, plugins_from_args, run_scenario
+
+    args.record_history = False
+    args.suite_reports = False
+    plugins = plugins_from_args(args)
+    lock = asyncio.Lock()
+
+    def exchange(payload: Optional[Dict[str, Any]]) -> Optional[str]:
+        conn.send(("next", worker, payload))
+        return conn.recv()
+
+    async def ask(done: Optional[ScenarioResult]) -> Optional[str]:
+        async with lock:
+            return await asyncio.to_thread(exchange, asdict(done) if done is not None else None)
+
+    async def main() -> None:
+        results: List[ScenarioResult] = []
+        started = time.perf_counter()
+        # Report start offsets against the parent's clock so shards line up.
+        origin = started - (time.time() - args.started_wall)
+        async with async_api.async_playwright() as pw:
+            browser = await launch(pw, args.engine, not args.headed)
+            try:
+                for plugin in plugins:
+                    await plugin.on_suite_start(browser)
+
+                async def loop() -> None:
+                    path = await ask(None)
+                    while path is not None:
+                        result = await run_scenario(
+                            browser,
+                            load_scenario(Path(path)),
+                            plugins=plugins,
+                            timeout=args.timeout,
+                            engine=args.engine,
+                            origin=origin,
+                        )
+                        results.append(result)
+                        path = await ask(result)
+
+                await asyncio.gather(*(loop() for _ in range(max(1, args.concurrency))))
+            finally:
+                await browser.close()
+        report = SuiteReport(results, time.perf_counter() - started, args.concurrency, [args.engine])
+        for plugin in plugins:
+            await plugin.on_suite_end(report)
+
+    try:
+        asyncio.run(main())
+    finally:
+        conn.send(("exit", worker, None))
+        conn.close()
+
+
+def run_sharded(
+    scenarios: Sequence[Scenario],
+    expected: Dict[str, float],
+    workers: int,
+    args: argparse.Namespace,
+) -> Tuple[List[Any], float, int]:
+    """Run ``scenarios`` on ``workers`` processes; returns results, wall time, steals."""
+    from .runner import ScenarioResult
+
+    queues = StealingQueues(lpt(scenarios, expected, workers), expected)
+    ctx = multiprocessing.get_context("spawn")
+    started = time.perf_counter()
+    args.started_wall = time.time()
+    conns: Dict[Connection, int] = {}
+    processes = []
+    for worker in range(workers):
+        parent, child = ctx.Pipe()
+        process = ctx.Process(target=_worker, args=(worker, child, args), daemon=True)
+        process.start()
+        child.close()
+        conns[parent] = worker
+        processes.append(process)
+
+    results: List[ScenarioResult] = []
+    while conns:
+        for conn in wait(list(conns)):
+            try:
+                kind, worker, payload = conn.recv()
+            except EOFError:
+                kind, worker, payload = "exit", conns[conn], None
+            if payload is not None:
+                result = ScenarioResult(**payload)
+                results.append(result)
+                print(f"[shard {worker}] {result.status:<7} {result.duration:6.1f}s  {result.name}", flush=True)
+            if kind == "exit":
+                del conns[conn]
+                continue
+            scenario = queues.next(worker)
+            conn.send(str(scenario.path) if scenario else None)
+    for process in processes:
+        process.join()
+    return results, time.perf_counter() - started, queues.steals
+
+
+def format_plan(buckets: Sequence[Sequence[Scenario]], expected: Dict[str, float]) -> str:
+    total = sum(expected.values())
+    lines = []
+    for i, bucket in enumerate(buckets):
+        load = sum(expected[s.name] for s in bucket)
+        names = ", ".join(s.tc_id for s in bucket)
+        lines.append(f"shard {i + 1}: {load:7.1f}s  {names}")
+    slowest = max(sum(expected[s.name] for s in b) for b in buckets)
+    lines.append(f"total {total:.1f}s, ideal {total / len(buckets):.1f}s per shard, slowest {slowest:.1f}s")
+    return "\n".join(lines)
+
+
+def _parse_shard(text: str) -> Tuple[int, int]:
+    index, _, count = text.partition("/")
+    i, n = int(index), int(count)
+    if not 1 <= i <= n:
+        raise argparse.ArgumentTypeError(f"shard must be I/N with 1 <= I <= N, got {text!r}")
+    return i, n
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    from .runner import build_parser
+
+    parser = build_parser()
+    parser.prog = "python -m harness.shard"
+    parser.description = "Run TestSprite scenarios across worker processes, balanced by duration."
+    parser.add_argument("-n", "--workers", type=int, default=max(1, (multiprocessing.cpu_count() or 2) // 2))
+    parser.add_argument("--timings", type=Path, default=DEFAULT_TIMINGS)
+    parser.add_argument("--plan", action="store_true", help="print the LPT split and exit")
+    parser.add_argument("--shard", type=_parse_shard, default=None, metavar="I/N", help="run one static shard")
+    args = parser.parse_args(argv)
+    # These aggregate the whole suite in one process; every worker would
+    # write its own partial report over the same file.
+    flags = (("--network", args.network), ("--trace", args.trace), ("--record-impact", args.record_impact))
+    per_suite = [flag for flag, on in flags if on]
+    if per_suite:
+        parser.error(f"{', '.join(per_suite)} cannot be combined with sharding; run harness.runner instead")
+    if args.devices:
+        # DeviceMatrix expands the scenario list in runner.main, which the
+        # workers never go through; they would silently run desktop only.
+        parser.error("--devices cannot be combined with sharding; run harness.runner instead")
+
+    scenarios = discover(args.patterns)
+    if not scenarios:
+        print("No scenarios matched.", file=sys.stderr)
+        return 2
+    store = TimingStore(args.timings)
+    expected = store.estimate(scenarios)
+
+    if args.shard:
+        index, count = args.shard
+        scenarios = lpt(scenarios, expected, count)[index - 1]
+        expected = {s.name: expected[s.name] for s in scenarios}
+        args.workers = 1
+    workers = max(1, min(args.workers, len(scenarios)))
+    if args.plan:
+        print(format_plan(lpt(scenarios, expected, workers), expected))
+        return 0
+
+    from .runner import SuiteReport
+
+    results, wall_time, steals = run_sharded(scenarios, expected, workers, args)
+    report = SuiteReport(
+        results=sorted(results, key=lambda r: r.name),
+        wall_time=wall_time,
+        concurrency=workers * max(1, args.concurrency),
+        engines=[args.engine],
+    )
+    store.update(report.results)
+    store.save()
+    if args.history:
+        from .history import record_run
+
+        record_run(report, label=args.history_label)
+    print(report.format_table())
+    print(f"{workers} workers, {steals} scenarios stolen, ideal {sum(expected.values()) / workers:.1f}s")
+    report.write(args.report)
+    print(f"Report written to {args.report}")
+    return 0 if report.failed == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
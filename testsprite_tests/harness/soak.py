@@ -0,0 +1,373 @@
+"""Hours-long soak run that watches the backend for leaks and slowdowns.
+
+A steady ``loadgen`` mix keeps traffic going while ``/health/detailed``
+and ``/health/ready`` are polled.  Under PM2 cluster mode each poll lands
+on an arbitrary worker, so samples are attributed by process start time
+(the handler's ``timestamp - uptime``), which is stable per process to
+the millisecond: every distinct start time is one worker, and one that
+appears after the soak began is a restart (``max_memory_restart``, crash
+or deploy).
+
+Per worker the heap floor (the lowest ``heapUsed`` per window, i.e. what
+survives GC) is regressed against time; a floor that rises in most
+windows is flagged as monotonic growth and extrapolated to the memory
+limit.  Per endpoint the window p95 is regressed the same way, and the
+per-window request counts are correlated with heap growth to point at
+the traffic that drives it.  ``heapUsed`` is what the health route
+exposes; PM2's limit applies to RSS, which sits above it, so the
+projection is optimistic.
+
+::
+
+    python -m harness.soak --duration 6h --users 20 --think 0.5
+    python -m harness.soak --duration 30m --window 1m --mix booking
+
+The analysis is rewritten to ``tmp/soak_report.json`` after every window,
+so an interrupted run still leaves a report; raw health samples go to
+``tmp/soak_samples.jsonl``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .api_client import ApiClient
+from .loadgen import MIXES, Stage, parse_duration, run_load
+from .metrics import LatencyRecorder, percentile
+from .scenarios import TESTS_DIR
+
+DEFAULT_REPORT = TESTS_DIR / "tmp" / "soak_report.json"
+DEFAULT_SAMPLES = TESTS_DIR / "tmp" / "soak_samples.jsonl"
+MB = 2**20
+
+
+class WindowedRecorder(LatencyRecorder):
+    """``LatencyRecorder`` that also buckets samples into fixed windows."""
+
+    def __init__(self, window: float) -> None:
+        super().__init__()
+        self.window = window
+        # run_load() resets ``started`` after its setup phase; windows stay
+        # aligned with the health samples through ``origin`` instead.
+        self.origin = self.started
+        self.windows: Dict[int, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+
+    def record(self, endpoint: str, seconds: float, ok: bool = True) -> None:
+        super().record(endpoint, seconds, ok)
+        index = int((time.perf_counter() - self.origin) // self.window)
+        self.windows[index][endpoint].append(seconds)
+
+
+@dataclass
+class HealthSample:
+    t: float  # seconds since the soak started
+    birth: float  # wall clock at which the answering process started
+    heap_used: float
+    heap_total: float
+    external: float
+    cpu_user: float
+    cpu_system: float
+    latency_ms: float
+    status: int
+    ready_status: int
+    ready_ms: float
+
+
+def _regression(xs: Sequence[float], ys: Sequence[float]) -> float:
+    """Least-squares slope, 0 when undefined."""
+    if len(xs) < 2:
+        return 0.0
+    try:
+        return statistics.linear_regression(xs, ys).slope
+    except statistics.StatisticsError:
+        return 0.0
+
+
+def _correlation(xs: Sequence[float], ys: Sequence[float]) -> float:
+    if len(xs) < 3:
+        return 0.0
+    try:
+        return statistics.correlation(xs, ys)
+    except statistics.StatisticsError:
+        return 0.0
+
+
+def assign_workers(samples: Sequence[HealthSample], tolerance: float = 0.02) -> Dict[float, List[HealthSample]]:
+    """Group samples by process start time (within ``tolerance`` seconds)."""
+    workers: Dict[float, List[HealthSample]] = {}
+    for sample in samples:
+        for birth in workers:
+            if abs(birth - sample.birth) <= tolerance:
+                workers[birth].append(sample)
+                break
+        else:
+            workers[sample.birth] = [sample]
+    return workers
+
+
+def _floors(samples: Sequence[HealthSample], window: float) -> Dict[int, float]:
+    floors: Dict[int, float] = {}
+    for s in samples:
+        index = int(s.t // window)
+        floors[index] = min(floors.get(index, s.heap_used), s.heap_used)
+    return floors
+
+
+def analyze(
+    samples: Sequence[HealthSample],
+    recorder: WindowedRecorder,
+    *,
+    started_wall: float,
+    elapsed: float,
+    memory_limit_mb: float = 1024,
+    growth_mb_per_hour: float = 5.0,
+    latency_growth: float = 0.2,
+) -> Dict[str, Any]:
+    window = recorder.window
+    hour = 3600 / window  # windows per hour
+    flags: List[str] = []
+
+    workers: List[Dict[str, Any]] = []
+    growth_by_window: Dict[int, float] = defaultdict(float)
+    for birth, worker_samples in sorted(assign_workers(samples).items()):
+        floors = _floors(worker_samples, window)
+        indexes = sorted(floors)
+        slope = _regression(indexes, [floors[i] / MB for i in indexes]) * hour
+        steps = [floors[b] - floors[a] for a, b in zip(indexes, indexes[1:])]
+        rising = sum(1 for d in steps if d > 0) / len(steps) if steps else 0.0
+        for a, b in zip(indexes, indexes[1:]):
+            growth_by_window[b] += (floors[b] - floors[a]) / MB
+        last = worker_samples[-1].heap_used / MB
+        hours_to_limit = (memory_limit_mb - last) / slope if slope > 0 else None
+        restarted = birth > started_wall + 5
+        info = {
+            "started": round(birth - started_wall, 1),
+            "restart": restarted,
+            "samples": len(worker_samples),
+            "heap_first_mb": round(worker_samples[0].heap_used / MB, 1),
+            "heap_last_mb": round(last, 1),
+            "floor_slope_mb_per_hour": round(slope, 2),
+            "rising_windows": round(rising, 2),
+            "hours_to_limit": round(hours_to_limit, 1) if hours_to_limit is not None else None,
+        }
+        workers.append(info)
+        if restarted:
+            flags.append(f"worker restarted {info['started']:.0f}s into the soak")
+        if slope > growth_mb_per_hour and rising >= 0.7 and len(steps) >= 3:
+            flags.append(
+                f"worker started at {info['started']:.0f}s: heap floor grows {slope:.1f} MB/h "
+                f"in {rising:.0%} of windows"
+            )
+
+    windows = sorted(recorder.windows)
+    endpoints: Dict[str, Dict[str, Any]] = {}
+    for endpoint in recorder.endpoints():
+        points = [(i, sorted(recorder.windows[i][endpoint])) for i in windows if recorder.windows[i].get(endpoint)]
+        p95 = [(i, percentile(v, 95) * 1000) for i, v in points]
+        slope = _regression([i for i, _ in p95], [v for _, v in p95]) * hour
+        counts = [len(recorder.windows[i].get(endpoint, ())) for i in windows]
+        growth = [growth_by_window.get(i, 0.0) for i in windows]
+        first = p95[0][1] if p95 else 0.0
+        endpoints[endpoint] = {
+            "requests": sum(counts),
+            "p95_first_ms": round(first, 1),
+            "p95_last_ms": round(p95[-1][1], 1) if p95 else 0.0,
+            "p95_slope_ms_per_hour": round(slope, 2),
+            "heap_growth_correlation": round(_correlation(counts, growth), 3),
+        }
+        if first and len(p95) >= 3 and slope * elapsed / 3600 > latency_growth * first:
+            flags.append(f"{endpoint}: p95 rises {slope:.1f} ms/h (from {first:.0f} ms)")
+
+    health_ms = [(s.t, s.latency_ms) for s in samples if s.status]
+    health_slope = _regression([t for t, _ in health_ms], [v for _, v in health_ms]) * 3600
+    not_ready = sum(1 for s in samples if s.ready_status != 200)
+    if not_ready:
+        flags.append(f"/health/ready was not 200 in {not_ready} of {len(samples)} polls")
+
+    suspects = sorted(
+        ((e, v["heap_growth_correlation"]) for e, v in endpoints.items()),
+        key=lambda item: -item[1],
+    )
+    return {
+        "elapsed": round(elapsed, 1),
+        "window": window,
+        "flags": flags,
+        "workers": workers,
+        "restarts": sum(1 for w in workers if w["restart"]),
+        "health_latency_slope_ms_per_hour": round(health_slope, 2),
+        "endpoints": endpoints,
+        "heap_growth_suspects": [{"endpoint": e, "correlation": c} for e, c in suspects[:5] if c > 0.3],
+    }
+
+
+def format_analysis(analysis: Dict[str, Any]) -> str:
+    lines = [
+        f"soak {analysis['elapsed'] / 3600:.2f} h, {len(analysis['workers'])} worker(s) seen, "
+        f"{analysis['restarts']} restart(s)"
+    ]
+    for w in analysis["workers"]:
+        lines.append(
+            f"  worker @{w['started']:>8.0f}s  heap {w['heap_first_mb']:7.1f} -> {w['heap_last_mb']:7.1f} MB  "
+            f"floor {w['floor_slope_mb_per_hour']:+7.2f} MB/h  rising {w['rising_windows']:.0%}"
+        )
+    lines.append(f"{'endpoint':<40}  {'reqs':>8}  {'p95 first':>9}  {'p95 last':>8}  {'ms/h':>7}  {'r(heap)':>7}")
+    for endpoint, e in analysis["endpoints"].items():
+        lines.append(
+            f"{endpoint:<40}  {e['requests']:>8}  {e['p95_first_ms']:>9.0f}  {e['p95_last_ms']:>8.0f}  "
+            f"{e['p95_slope_ms_per_hour']:>+7.1f}  {e['heap_growth_correlation']:>+7.2f}"
+        )
+    lines.extend(f"! {flag}" for flag in analysis["flags"])
+    if not analysis["flags"]:
+        lines.append("no flags")
+    return "\n".join(lines)
+
+
+def _server_time(body: Dict[str, Any]) -> float:
+    """The handler's own ``timestamp``; taken next to ``uptime``, so free of network jitter."""
+    try:
+        return datetime.fromisoformat(body["timestamp"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, AttributeError, ValueError):
+        return time.time()
+
+
+class HealthMonitor:
+    def __init__(self, client: ApiClient, started: float, started_wall: float, samples_path: Optional[Path]):
+        self.client = client
+        self.started = started
+        self.started_wall = started_wall
+        self.samples: List[HealthSample] = []
+        self.samples_path = samples_path
+
+    async def poll(self) -> HealthSample:
+        detailed, ready = await asyncio.gather(
+            self.client.get("/health/detailed", expect=(503,)),
+            self.client.get("/health/ready", expect=(503,)),
+        )
+        body = detailed.body if isinstance(detailed.body, dict) else {}
+        memory = body.get("system", {}).get("memory", {})
+        cpu = body.get("system", {}).get("cpu", {})
+        sample = HealthSample(
+            t=time.perf_counter() - self.started,
+            birth=_server_time(body) - float(body.get("uptime", 0.0)),
+            heap_used=memory.get("used", 0),
+            heap_total=memory.get("total", 0),
+            external=memory.get("external", 0),
+            cpu_user=cpu.get("user", 0),
+            cpu_system=cpu.get("system", 0),
+            latency_ms=detailed.elapsed * 1000,
+            status=detailed.status,
+            ready_status=ready.status,
+            ready_ms=ready.elapsed * 1000,
+        )
+        if sample.status:
+            self.samples.append(sample)
+        if self.samples_path is not None:
+            with self.samples_path.open("a", encoding="utf-8") as out:
+                out.write(json.dumps(asdict(sample)) + "\n")
+        return sample
+
+
+async def run_soak(
+    duration: float,
+    *,
+    users: int,
+    mix: str = "default",
+    think: float = 1.0,
+    poll: float = 10.0,
+    window: float = 300.0,
+    memory_limit_mb: float = 1024,
+    report: Path = DEFAULT_REPORT,
+    samples_path: Optional[Path] = DEFAULT_SAMPLES,
+) -> Dict[str, Any]:
+    recorder = WindowedRecorder(window)
+    started, started_wall = recorder.origin, time.time()
+    report.parent.mkdir(parents=True, exist_ok=True)
+    if samples_path is not None:
+        samples_path.write_text("", encoding="utf-8")
+
+    def snapshot() -> Dict[str, Any]:
+        return analyze(
+            monitor.samples,
+            recorder,
+            started_wall=started_wall,
+            elapsed=time.perf_counter() - started,
+            memory_limit_mb=memory_limit_mb,
+        )
+
+    async with ApiClient(LatencyRecorder()) as health_client:
+        monitor = HealthMonitor(health_client, started, started_wall, samples_path)
+
+        async def watch() -> None:
+            next_report = window
+            while True:
+                await monitor.poll()
+                if time.perf_counter() - started >= next_report:
+                    next_report += window
+                    report.write_text(json.dumps(snapshot(), indent=2), encoding="utf-8")
+                await asyncio.sleep(poll)
+
+        watcher = asyncio.create_task(watch())
+        ramp = min(60.0, duration / 10)
+        try:
+            await run_load(
+                [Stage(ramp, users), Stage(duration - ramp, users)],
+                mix=MIXES[mix],
+                think=think,
+                recorder=recorder,
+            )
+        finally:
+            watcher.cancel()
+            await asyncio.gather(watcher, return_exceptions=True)
+    analysis = snapshot()
+    report.write_text(json.dumps(analysis, indent=2), encoding="utf-8")
+    return analysis
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.soak",
+        description="Long-running API soak that tracks backend heap, latency and restarts.",
+    )
+    parser.add_argument("--duration", default="2h")
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--mix", default="default", choices=sorted(MIXES))
+    parser.add_argument("--think", type=float, default=1.0)
+    parser.add_argument("--poll", default="10s", help="health polling interval")
+    parser.add_argument("--window", default="5m", help="aggregation window for slopes")
+    parser.add_argument("--memory-limit-mb", type=float, default=1024, help="PM2 max_memory_restart")
+    parser.add_argument("--report", type=Path, default=DEFAULT_REPORT)
+    args = parser.parse_args(argv)
+
+    try:
+        analysis = asyncio.run(
+            run_soak(
+                parse_duration(args.duration),
+                users=args.users,
+                mix=args.mix,
+                think=args.think,
+                poll=parse_duration(args.poll),
+                window=parse_duration(args.window),
+                memory_limit_mb=args.memory_limit_mb,
+                report=args.report,
+            )
+        )
+    except KeyboardInterrupt:
+        print(f"Interrupted; last window's analysis is in {args.report}", file=sys.stderr)
+        return 130
+    print(format_analysis(analysis))
+    print(f"Report written to {args.report}")
+    return 1 if analysis["flags"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,284 @@
+"""Stand-in for the backend ``/api/*`` routes, serving recorded fixtures.
+
+Scenarios that only exercise the UI (TC019 responsive layout, TC020
+loading/error states) do not need MongoDB, Redis or Clerk behind the API.
+This server answers the routes ``frontend/services/api.ts`` calls from
+``fixtures/api.json``, keyed by normalized route::
+
+    "GET /api/gigs/:id": {"status": 200, "body": {...}}
+
+Keys may also be globs (``"GET /api/users/*"``); an exact route wins.
+Latency, jitter and failures are injected per route from a profile, and
+every route draws from its own seeded RNG so a run is reproducible::
+
+    {
+      "default": {"latency_ms": 50, "jitter_ms": 20},
+      "GET /api/gigs": {"latency_ms": 1500, "error_rate": 0.1, "error_status": 503}
+    }
+
+Usage::
+
+    python -m harness.stub_backend --profile slow.json
+    python -m harness.stub_backend --latency "GET /api/gigs=2000"
+    python -m harness.stub_backend --record http://localhost:5000   # refresh fixtures
+
+Point the frontend at it with ``NEXT_PUBLIC_API_URL=http://localhost:5001/api``
+when running it beside the real backend (``--port 5001``).
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import zlib
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import aiohttp
+from aiohttp import web
+
+from .api_client import route_of
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent / "fixtures" / "api.json"
+
+
+@dataclass
+class RouteProfile:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    error_status: int = 500
+
+
+class Profile:
+    """Per-route fault settings; unknown keys fall back to ``default``."""
+
+    def __init__(self, routes: Optional[Dict[str, Dict[str, Any]]] = None, seed: int = 0):
+        routes = dict(routes or {})
+        self.default = RouteProfile(**routes.pop("default", {}))
+        self.routes = {key: RouteProfile(**{**asdict(self.default), **value}) for key, value in routes.items()}
+        self.seed = seed
+        self._rngs: Dict[str, random.Random] = {}
+
+    @classmethod
+    def load(cls, path: Path, seed: int = 0) -> "Profile":
+        return cls(json.loads(path.read_text(encoding="utf-8")), seed)
+
+    def set(self, route: str, **values: Any) -> None:
+        base = self.routes.get(route, self.default)
+        self.routes[route] = RouteProfile(**{**asdict(base), **values})
+
+    def for_route(self, route: str) -> RouteProfile:
+        if route in self.routes:
+            return self.routes[route]
+        for pattern, profile in self.routes.items():
+            if fnmatch(route, pattern):
+                return profile
+        return self.default
+
+    def rng(self, route: str) -> random.Random:
+        # crc32 rather than hash(): str hashes are salted per process.
+        if route not in self._rngs:
+            self._rngs[route] = random.Random(self.seed ^ zlib.crc32(route.encode()))
+        return self._rngs[route]
+
+
+class Fixtures:
+    def __init__(self, entries: Dict[str, Dict[str, Any]]):
+        self.entries = entries
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_FIXTURES) -> "Fixtures":
+        return cls(json.loads(path.read_text(encoding="utf-8")) if path.exists() else {})
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = json.dumps(dict(sorted(self.entries.items())), indent=2, ensure_ascii=False)
+        path.write_text(text + "\n", encoding="utf-8")
+
+    def match(self, route: str) -> Optional[Dict[str, Any]]:
+        if route in self.entries:
+            return self.entries[route]
+        for pattern, entry in self.entries.items():
+            if fnmatch(route, pattern):
+                return entry
+        return None
+
+
+def _cors(request: web.Request, response: web.StreamResponse) -> web.StreamResponse:
+    origin = request.headers.get("Origin")
+    if origin:
+        response.headers["Access-Control-Allow-Origin"] = origin
+        response.headers["Access-Control-Allow-Credentials"] = "true"
+        response.headers["Vary"] = "Origin"
+    return response
+
+
+class StubBackend:
+    """aiohttp app serving ``fixtures`` with ``profile`` applied.
+
+    With ``upstream`` set, unmatched requests are proxied there and the
+    responses recorded into ``fixtures`` (see ``--record``).
+    """
+
+    def __init__(
+        self,
+        fixtures: Fixtures,
+        profile: Optional[Profile] = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 5000,
+        upstream: Optional[str] = None,
+    ):
+        self.fixtures = fixtures
+        self.profile = profile or Profile()
+        self.host = host
+        self.port = port
+        self.upstream = upstream.rstrip("/") if upstream else None
+        self.hits: Dict[str, int] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._client: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/{tail:.*}", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.StreamResponse:
+        if request.method == "OPTIONS":
+            response = web.Response(status=204)
+            response.headers["Access-Control-Allow-Methods"] = "GET,POST,PUT,PATCH,DELETE,OPTIONS"
+            response.headers["Access-Control-Allow-Headers"] = request.headers.get(
+                "Access-Control-Request-Headers", "Content-Type,Authorization"
+            )
+            return _cors(request, response)
+
+        route = route_of(request.method, request.path)
+        self.hits[route] = self.hits.get(route, 0) + 1
+        settings = self.profile.for_route(route)
+        rng = self.profile.rng(route)
+        delay = settings.latency_ms + rng.uniform(-settings.jitter_ms, settings.jitter_ms)
+        failed = rng.random() < settings.error_rate
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if failed:
+            status, body = settings.error_status, {"success": False, "message": "Injected failure"}
+        else:
+            entry = self.fixtures.match(route)
+            if entry is None and self.upstream:
+                entry = await self._record(request, route)
+            if entry is None:
+                status, body = 404, {"success": False, "message": f"No fixture for {route}"}
+            else:
+                status, body = entry.get("status", 200), entry.get("body")
+        return _cors(request, web.json_response(body, status=status))
+
+    async def _record(self, request: web.Request, route: str) -> Dict[str, Any]:
+        assert self._client is not None
+        headers = {k: v for k, v in request.headers.items() if k.lower() in ("authorization", "content-type")}
+        async with self._client.request(
+            request.method,
+            f"{self.upstream}{request.path_qs}",
+            data=await request.read(),
+            headers=headers,
+        ) as upstream:
+            try:
+                body = await upstream.json(content_type=None)
+            except ValueError:
+                body = None
+            entry = {"status": upstream.status, "body": body}
+        self.fixtures.entries[route] = entry
+        print(f"[stub] recorded {route} -> {entry['status']}", file=sys.stderr)
+        return entry
+
+    async def start(self) -> None:
+        if self.upstream:
+            self._client = aiohttp.ClientSession()
+        self._runner = web.AppRunner(self.app())
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
+
+    async def __aenter__(self) -> "StubBackend":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.stop()
+
+
+def _parse_override(text: str) -> tuple:
+    """``"GET /api/gigs=1500"`` or ``"GET /api/gigs=1500~200"`` -> (route, latency, jitter)."""
+    route, _, value = text.rpartition("=")
+    latency, _, jitter = value.partition("~")
+    return route.strip() or "default", float(latency), float(jitter or 0)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.stub_backend",
+        description="Serve recorded /api fixtures with injected latency and failures.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--fixtures", type=Path, default=DEFAULT_FIXTURES)
+    parser.add_argument("--profile", type=Path, default=None, help="JSON file of per-route fault settings")
+    parser.add_argument(
+        "--latency",
+        action="append",
+        default=[],
+        metavar="ROUTE=MS[~JITTER]",
+        help="per-route latency; a bare MS[~JITTER] sets the default",
+    )
+    parser.add_argument("--error-rate", type=float, default=None, help="default failure probability")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--record", metavar="UPSTREAM", default=None, help="proxy misses to UPSTREAM and save them")
+    args = parser.parse_args(argv)
+
+    profile = Profile.load(args.profile, args.seed) if args.profile else Profile(seed=args.seed)
+    for override in args.latency:
+        route, latency, jitter = _parse_override(override)
+        if route == "default":
+            profile.default.latency_ms, profile.default.jitter_ms = latency, jitter
+        else:
+            profile.set(route, latency_ms=latency, jitter_ms=jitter)
+    if args.error_rate is not None:
+        profile.default.error_rate = args.error_rate
+
+    fixtures = Fixtures.load(args.fixtures)
+    stub = StubBackend(fixtures, profile, host=args.host, port=args.port, upstream=args.record)
+
+    async def serve() -> None:
+        async with stub:
+            print(f"[stub] serving {len(fixtures.entries)} routes on {stub.url}", file=sys.stderr)
+            await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.record:
+            fixtures.save(args.fixtures)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
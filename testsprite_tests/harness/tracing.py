@@ -0,0 +1,327 @@
+"""Where a scenario's time goes: Playwright traces plus CDP profiles.
+
+Opt-in with ``--trace``.  Every context a scenario opens records a
+Playwright trace (``tmp/traces/<scenario>.zip``, open with ``playwright
+show-trace``), and on Chromium every page additionally gets
+
+* ``Performance.getMetrics`` - main-thread script, layout and style time,
+* a sampling ``Profiler`` run - self time per JavaScript function,
+* ``longtask`` and ``long-animation-frame`` observers - the slow tasks
+  and frames themselves, with the script that caused them.
+
+Requests are timed from the browser's own ``request.timing``.  Per
+scenario these merge into ``extras["profile"]``, a breakdown of its wall
+time:
+
+* ``scripting_ms``  - JavaScript on the page's main thread,
+* ``rendering_ms``  - style recalculation and layout,
+* ``other_task_ms`` - the rest of the main-thread tasks (parsing, GC, ...),
+* ``network_ms``    - time with at least one request in flight,
+* ``idle_ms``       - what is left: the test's own waits and sleeps.
+
+Metrics are summed over the scenario's pages, so with parallel pages the
+parts can exceed the wall time and ``idle_ms`` bottoms out at zero.  At
+suite end the slowest frames, long tasks and hottest functions across all
+scenarios are printed and written to ``tmp/trace_report.json``::
+
+    python -m harness.runner --trace
+    python -m harness.runner TC014 --trace --trace-top 30
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+from collections import Counter, defaultdict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, CDPSession, Page, Request
+
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport
+from .scenarios import TESTS_DIR, Scenario
+
+DEFAULT_TRACE_DIR = TESTS_DIR / "tmp" / "traces"
+DEFAULT_TRACE_REPORT = TESTS_DIR / "tmp" / "trace_report.json"
+SAMPLING_INTERVAL_US = 500
+
+# Reports long tasks and long animation frames (Chrome 123+) to Python as
+# they happen, so nothing is lost when the script closes its context.
+OBSERVER_SCRIPT = """
+(() => {
+  const report = (kind, entry) => window.__traceEntry && window.__traceEntry(kind, entry);
+  const watch = (type, fn) => {
+    try { new PerformanceObserver((l) => l.getEntries().forEach(fn)).observe({ type, buffered: true }); }
+    catch (e) {}
+  };
+  watch('longtask', (e) => report('longtask', {
+    start: e.startTime, duration: e.duration,
+    source: (e.attribution && e.attribution[0] && e.attribution[0].containerSrc) || e.name,
+  }));
+  watch('long-animation-frame', (e) => {
+    const script = (e.scripts || []).slice().sort((a, b) => b.duration - a.duration)[0];
+    report('frame', {
+      start: e.startTime, duration: e.duration, blocking: e.blockingDuration || 0,
+      render_ms: e.renderStart ? e.startTime + e.duration - e.renderStart : 0,
+      layout_ms: e.styleAndLayoutStart ? e.startTime + e.duration - e.styleAndLayoutStart : 0,
+      source: script ? `${script.invoker || script.name} ${script.sourceURL || ''}`.trim() : '',
+    });
+  });
+})();
+"""
+
+_CHUNK = re.compile(r"/_next/static/chunks/(?:app/)?")
+
+
+@dataclass
+class Breakdown:
+    wall_ms: float = 0.0
+    scripting_ms: float = 0.0
+    rendering_ms: float = 0.0
+    other_task_ms: float = 0.0
+    network_ms: float = 0.0
+    idle_ms: float = 0.0
+    pages: int = 0
+    requests: int = 0
+
+
+@dataclass
+class SlowEntry:
+    scenario: str
+    kind: str  # "longtask" or "frame"
+    url: str
+    duration: float
+    source: str
+    blocking: float = 0.0
+    render_ms: float = 0.0
+    layout_ms: float = 0.0
+
+
+@dataclass
+class _ScenarioTrace:
+    metrics: Counter = field(default_factory=Counter)
+    intervals: List[Tuple[float, float]] = field(default_factory=list)
+    slow: List[SlowEntry] = field(default_factory=list)
+    functions: Counter = field(default_factory=Counter)
+    pages: int = 0
+    contexts: int = 0
+
+
+def union_ms(intervals: Sequence[Tuple[float, float]]) -> float:
+    """Length of the union of ``(start, end)`` intervals."""
+    total, end = 0.0, float("-inf")
+    for start, stop in sorted(intervals):
+        if stop <= end:
+            continue
+        total += stop - max(start, end)
+        end = stop
+    return total
+
+
+def self_time(profile: Dict[str, Any]) -> Counter:
+    """Self time in ms per ``function (script)`` of a CDP ``Profiler`` profile."""
+    nodes = {node["id"]: node for node in profile.get("nodes", [])}
+    out: Counter = Counter()
+    for node_id, delta in zip(profile.get("samples", []), profile.get("timeDeltas", [])):
+        frame = nodes[node_id]["callFrame"]
+        name = frame.get("functionName") or "(anonymous)"
+        if name in ("(idle)", "(program)", "(root)"):
+            continue
+        script = _CHUNK.sub("", urlsplit(frame.get("url", "")).path).lstrip("/")
+        out[f"{name} ({script}:{frame.get('lineNumber', 0) + 1})" if script else name] += delta / 1000
+    return out
+
+
+class Tracing(RunnerPlugin):
+    def __init__(
+        self,
+        *,
+        trace_dir: Optional[Path] = DEFAULT_TRACE_DIR,
+        report: Optional[Path] = DEFAULT_TRACE_REPORT,
+        top: int = 15,
+    ):
+        self.trace_dir = trace_dir
+        self.report = report
+        self.top = top
+        self._traces: Dict[str, _ScenarioTrace] = defaultdict(_ScenarioTrace)
+        self._breakdowns: Dict[str, Breakdown] = {}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        trace = self._traces[scenario.name]
+        sessions: Dict[Page, CDPSession] = {}
+        profiling: Dict[Page, asyncio.Future] = {}
+        index = trace.contexts  # distinguishes the zips of a scenario's contexts
+        trace.contexts += 1
+
+        def entry(source: Dict[str, Any], kind: str, data: Dict[str, Any]) -> None:
+            trace.slow.append(
+                SlowEntry(
+                    scenario=scenario.name,
+                    kind=kind,
+                    url=source["frame"].url,
+                    duration=data.get("duration", 0.0),
+                    source=data.get("source") or "",
+                    blocking=data.get("blocking", 0.0),
+                    render_ms=data.get("render_ms", 0.0),
+                    layout_ms=data.get("layout_ms", 0.0),
+                )
+            )
+
+        async def collect(page: Page) -> None:
+            if page in profiling:
+                await profiling[page]
+            cdp = sessions.pop(page, None)
+            if cdp is None:
+                return
+            try:
+                metrics = await cdp.send("Performance.getMetrics")
+                trace.metrics.update({m["name"]: m["value"] for m in metrics["metrics"]})
+                profile = await cdp.send("Profiler.stop")
+                trace.functions.update(self_time(profile["profile"]))
+                await cdp.detach()
+            except async_api.Error:
+                pass  # the page went away first
+
+        async def profile(page: Page) -> None:
+            trace.pages += 1
+            try:
+                cdp = await context.new_cdp_session(page)
+                await cdp.send("Performance.enable", {"timeDomain": "threadTicks"})
+                await cdp.send("Profiler.enable")
+                await cdp.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+                await cdp.send("Profiler.start")
+            except async_api.Error:
+                return  # not Chromium, or the page closed already
+            sessions[page] = cdp
+            close_page = page.close
+
+            async def closing_page(**kwargs: Any) -> None:
+                await collect(page)
+                await close_page(**kwargs)
+
+            page.close = closing_page  # type: ignore[method-assign]
+
+        def on_page(page: Page) -> asyncio.Future:
+            if page not in profiling:
+                profiling[page] = asyncio.ensure_future(profile(page))
+            return profiling[page]
+
+        def finished(request: Request) -> None:
+            timing = request.timing
+            if timing.get("responseEnd", -1) >= 0:
+                start = timing["startTime"]
+                trace.intervals.append((start, start + timing["responseEnd"]))
+
+        await context.expose_binding("__traceEntry", entry)
+        await context.add_init_script(OBSERVER_SCRIPT)
+        context.on("page", on_page)
+        context.on("requestfinished", finished)
+        context.on("requestfailed", finished)
+        # Without this the profiler starts whenever the "page" event gets
+        # round to it, after the script's first navigation is under way.
+        new_page = context.new_page
+
+        async def profiled_page() -> Page:
+            page = await new_page()
+            await on_page(page)
+            return page
+
+        context.new_page = profiled_page  # type: ignore[method-assign]
+        if self.trace_dir is not None:
+            await context.tracing.start(screenshots=True, snapshots=True)
+
+        # The lease closes contexts before ``on_result``; collect first.
+        close_context = context.close
+
+        async def closing(**kwargs: Any) -> None:
+            for page in list(sessions):
+                await collect(page)
+            if self.trace_dir is not None:
+                suffix = f"-{index}" if index else ""
+                self.trace_dir.mkdir(parents=True, exist_ok=True)
+                try:
+                    await context.tracing.stop(path=self.trace_dir / f"{scenario.name}{suffix}.zip")
+                except async_api.Error:
+                    pass
+            await close_context(**kwargs)
+
+        context.close = closing  # type: ignore[method-assign]
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        trace = self._traces.get(scenario.name)
+        if trace is None:
+            return
+        m = trace.metrics
+        scripting = m["ScriptDuration"] * 1000
+        rendering = (m["LayoutDuration"] + m["RecalcStyleDuration"]) * 1000
+        task = m["TaskDuration"] * 1000
+        network = union_ms(trace.intervals)
+        wall = result.duration * 1000
+        breakdown = Breakdown(
+            wall_ms=round(wall, 1),
+            scripting_ms=round(scripting, 1),
+            rendering_ms=round(rendering, 1),
+            other_task_ms=round(max(0.0, task - scripting - rendering), 1),
+            network_ms=round(network, 1),
+            idle_ms=round(max(0.0, wall - max(task, scripting + rendering) - network), 1),
+            pages=trace.pages,
+            requests=len(trace.intervals),
+        )
+        self._breakdowns[scenario.name] = breakdown
+        result.extras["profile"] = asdict(breakdown)
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        if not self._breakdowns:
+            return
+        data = aggregate(self._breakdowns, self._traces.values(), self.top)
+        print(format_report(data))
+        if self.report is not None:
+            self.report.parent.mkdir(parents=True, exist_ok=True)
+            self.report.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            print(f"Trace report written to {self.report}")
+
+
+def aggregate(breakdowns: Dict[str, Breakdown], traces: Sequence[_ScenarioTrace], top: int) -> Dict[str, Any]:
+    slow = [entry for trace in traces for entry in trace.slow]
+    functions: Counter = Counter()
+    for trace in traces:
+        functions.update(trace.functions)
+    frames = sorted((e for e in slow if e.kind == "frame"), key=lambda e: e.duration, reverse=True)
+    tasks = sorted((e for e in slow if e.kind == "longtask"), key=lambda e: e.duration, reverse=True)
+    return {
+        "scenarios": {name: asdict(b) for name, b in sorted(breakdowns.items())},
+        "slow_frames": [asdict(e) for e in frames[:top]],
+        "long_tasks": [asdict(e) for e in tasks[:top]],
+        "hot_functions": [{"function": name, "self_ms": round(ms, 1)} for name, ms in functions.most_common(top)],
+        "totals": {
+            "long_tasks": len(tasks),
+            "long_task_ms": round(sum(e.duration for e in tasks), 1),
+            "slow_frames": len(frames),
+        },
+    }
+
+
+def format_report(data: Dict[str, Any]) -> str:
+    header = (
+        f"{'scenario':<48}  {'wall':>8}  {'script':>8}  {'render':>8}  {'other':>8}  {'network':>8}  {'idle':>8}"
+    )
+    lines = [header, "-" * len(header)]
+    for name, b in data["scenarios"].items():
+        lines.append(
+            f"{name[:48]:<48}  {b['wall_ms']:>8.0f}  {b['scripting_ms']:>8.0f}  {b['rendering_ms']:>8.0f}  "
+            f"{b['other_task_ms']:>8.0f}  {b['network_ms']:>8.0f}  {b['idle_ms']:>8.0f}"
+        )
+    for title, key in (("slowest frames", "slow_frames"), ("longest tasks", "long_tasks")):
+        if data[key]:
+            lines.append(f"\n{title}:")
+        for e in data[key]:
+            lines.append(f"  {e['duration']:>7.0f} ms  {e['scenario'][:32]:<32}  {e['url'][:50]:<50}  {e['source'][:60]}")
+    if data["hot_functions"]:
+        lines.append("\nhottest functions (self time):")
+    for f in data["hot_functions"]:
+        lines.append(f"  {f['self_ms']:>7.0f} ms  {f['function'][:110]}")
+    return "\n".join(lines)
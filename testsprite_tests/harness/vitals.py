@@ -0,0 +1,378 @@
+"""Web-vitals measurements for the key frontend pages.
+
+Each page in ``vitals_pages.json`` is loaded in a fresh context under
+every selected throttling profile (CPU slowdown and network conditions
+applied through CDP, so Chromium only).  Per load we collect:
+
+* Navigation Timing - ``ttfb_ms``, ``dcl_ms``, ``load_ms``, ``fcp_ms``
+* ``lcp_ms`` - last ``largest-contentful-paint`` entry
+* ``cls`` - sum of ``layout-shift`` values without recent input
+* ``tbt_ms`` - long-task time over 50 ms after first contentful paint
+* ``heap_mb`` - ``JSHeapUsedSize`` from the CDP ``Performance`` domain
+
+With ``--runs N`` the median of each metric is kept.  Pages fail when a
+median exceeds its threshold (page ``thresholds`` over ``defaults``).
+Path placeholders ``{teacher_id}`` and ``{booking_id}`` are resolved from
+the backend unless given with ``--param``::
+
+    python -m harness.vitals                          # all pages, "none"
+    python -m harness.vitals browse class -p mid-mobile -p slow-3g --runs 3
+
+Every run is written to ``tmp/vitals/<build>-<time>.json`` and appended
+to ``tmp/vitals/history.jsonl`` for charting across builds; the build
+label is ``$BUILD_ID`` or the current git revision.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import urlparse
+
+from playwright import async_api
+from playwright.async_api import Browser, BrowserContext, Page
+
+from .config import API_URL, FRONTEND_URL, bearer
+from .runner import launch
+from .scenarios import TESTS_DIR
+from .sessions import SessionCache
+
+DEFAULT_PAGES = Path(__file__).resolve().parent / "vitals_pages.json"
+VITALS_DIR = TESTS_DIR / "tmp" / "vitals"
+
+METRICS = ("ttfb_ms", "dcl_ms", "load_ms", "fcp_ms", "lcp_ms", "cls", "tbt_ms", "heap_mb", "transfer_kb")
+
+OBSERVER_SCRIPT = """
+(() => {
+  const v = window.__vitals = { lcp: 0, cls: 0, longTasks: [] };
+  const watch = (type, fn) => {
+    try { new PerformanceObserver((l) => l.getEntries().forEach(fn)).observe({ type, buffered: true }); }
+    catch (e) {}
+  };
+  watch('largest-contentful-paint', (e) => { v.lcp = e.renderTime || e.loadTime || e.startTime; });
+  watch('layout-shift', (e) => { if (!e.hadRecentInput) v.cls += e.value; });
+  watch('longtask', (e) => { v.longTasks.push([e.startTime, e.duration]); });
+})();
+"""
+
+COLLECT_SCRIPT = """
+() => {
+  const v = window.__vitals || { lcp: 0, cls: 0, longTasks: [] };
+  const nav = performance.getEntriesByType('navigation')[0] || {};
+  const paint = performance.getEntriesByName('first-contentful-paint')[0];
+  const fcp = paint ? paint.startTime : 0;
+  const tbt = v.longTasks
+    .filter(([start]) => start >= fcp)
+    .reduce((total, [, duration]) => total + Math.max(0, duration - 50), 0);
+  return {
+    ttfb_ms: nav.responseStart || 0,
+    dcl_ms: nav.domContentLoadedEventEnd || 0,
+    load_ms: nav.loadEventEnd || 0,
+    fcp_ms: fcp,
+    lcp_ms: v.lcp,
+    cls: v.cls,
+    tbt_ms: tbt,
+    transfer_kb: (nav.transferSize || 0) / 1024,
+  };
+}
+"""
+
+
+class RedirectedError(Exception):
+    """The page navigated somewhere else (e.g. a role page bounced to /sign-in)."""
+
+
+@dataclass(frozen=True)
+class ThrottleProfile:
+    name: str
+    cpu: float = 1.0
+    latency_ms: float = 0.0
+    download_kbps: float = -1.0  # -1 disables network throttling
+    upload_kbps: float = -1.0
+
+    async def apply(self, cdp: Any) -> None:
+        if self.cpu > 1:
+            await cdp.send("Emulation.setCPUThrottlingRate", {"rate": self.cpu})
+        if self.latency_ms or self.download_kbps >= 0 or self.upload_kbps >= 0:
+            await cdp.send("Network.enable")
+            await cdp.send(
+                "Network.emulateNetworkConditions",
+                {
+                    "offline": False,
+                    "latency": self.latency_ms,
+                    "downloadThroughput": _bytes_per_second(self.download_kbps),
+                    "uploadThroughput": _bytes_per_second(self.upload_kbps),
+                },
+            )
+
+
+def _bytes_per_second(kbps: float) -> float:
+    return kbps * 1024 / 8 if kbps >= 0 else -1
+
+
+@dataclass
+class PageSpec:
+    name: str
+    path: str
+    role: Optional[str] = None
+    thresholds: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class VitalsConfig:
+    profiles: Dict[str, ThrottleProfile]
+    defaults: Dict[str, float]
+    pages: List[PageSpec]
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_PAGES) -> "VitalsConfig":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(
+            profiles={name: ThrottleProfile(name, **spec) for name, spec in data.get("profiles", {}).items()},
+            defaults=data.get("defaults", {}),
+            pages=[PageSpec(**spec) for spec in data["pages"]],
+        )
+
+    def thresholds(self, page: PageSpec) -> Dict[str, float]:
+        return {**self.defaults, **page.thresholds}
+
+
+@dataclass
+class Measurement:
+    page: str
+    profile: str
+    url: str
+    runs: int
+    metrics: Dict[str, float]
+    samples: List[Dict[str, float]]
+    violations: List[str]
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return not self.violations and self.error is None
+
+
+def check(metrics: Dict[str, float], thresholds: Dict[str, float]) -> List[str]:
+    return [
+        f"{key} {metrics[key]:.3g} > {limit:.3g}"
+        for key, limit in thresholds.items()
+        if key in metrics and metrics[key] > limit
+    ]
+
+
+def median_metrics(samples: Sequence[Dict[str, float]]) -> Dict[str, float]:
+    return {key: statistics.median(s[key] for s in samples) for key in METRICS if all(key in s for s in samples)}
+
+
+class ParamResolver:
+    """Fills ``{teacher_id}`` / ``{booking_id}`` from the backend, once."""
+
+    def __init__(self, sessions: SessionCache, given: Optional[Dict[str, str]] = None):
+        self.sessions = sessions
+        self.values: Dict[str, str] = dict(given or {})
+
+    async def _fetch(self, context: BrowserContext, path: str, role: Optional[str] = None) -> Any:
+        headers = bearer((await self.sessions.get(role)).token) if role else {}
+        response = await context.request.get(f"{API_URL}{path}", headers=headers, fail_on_status_code=True)
+        return (await response.json()).get("data") or []
+
+    async def resolve(self, context: BrowserContext, path: str) -> str:
+        if "{teacher_id}" in path and "teacher_id" not in self.values:
+            gigs = await self._fetch(context, "/api/gigs?limit=1")
+            if not gigs:
+                raise LookupError("no gigs to take a teacher id from")
+            teacher = gigs[0]["teacher"]
+            self.values["teacher_id"] = teacher["_id"] if isinstance(teacher, dict) else teacher
+        if "{booking_id}" in path and "booking_id" not in self.values:
+            bookings = await self._fetch(context, "/api/bookings", role="student")
+            if not bookings:
+                raise LookupError("the student account has no bookings")
+            self.values["booking_id"] = bookings[0]["_id"]
+        return path.format_map(self.values)
+
+
+class VitalsRunner:
+    def __init__(
+        self,
+        config: VitalsConfig,
+        *,
+        runs: int = 1,
+        settle_ms: float = 1_500,
+        params: Optional[Dict[str, str]] = None,
+    ):
+        self.config = config
+        self.runs = max(1, runs)
+        self.settle_ms = settle_ms
+        self.sessions = SessionCache()
+        self.params = ParamResolver(self.sessions, params)
+
+    async def _context(self, browser: Browser, page: PageSpec) -> BrowserContext:
+        if page.role:
+            return await self.sessions.new_context(browser, page.role)
+        return await browser.new_context()
+
+    async def measure_once(self, browser: Browser, spec: PageSpec, profile: ThrottleProfile) -> Dict[str, Any]:
+        context = await self._context(browser, spec)
+        try:
+            url = FRONTEND_URL + await self.params.resolve(context, spec.path)
+            await context.add_init_script(OBSERVER_SCRIPT)
+            page: Page = await context.new_page()
+            cdp = await context.new_cdp_session(page)
+            await profile.apply(cdp)
+            await cdp.send("Performance.enable")
+            await page.goto(url, wait_until="load", timeout=60_000)
+            try:
+                await page.wait_for_load_state("networkidle", timeout=15_000)
+            except async_api.TimeoutError:
+                pass
+            # LCP and layout shifts keep arriving while client components hydrate.
+            await page.wait_for_timeout(self.settle_ms)
+            # Role pages bounce to /sign-in client-side when the session is gone.
+            landed = urlparse(page.url).path
+            if landed != urlparse(url).path:
+                raise RedirectedError(f"redirected to {landed}")
+            metrics = await page.evaluate(COLLECT_SCRIPT)
+            perf = {m["name"]: m["value"] for m in (await cdp.send("Performance.getMetrics"))["metrics"]}
+            metrics["heap_mb"] = perf.get("JSHeapUsedSize", 0) / 2**20
+            return {"url": url, "metrics": metrics}
+        finally:
+            await context.close()
+
+    async def measure(self, browser: Browser, spec: PageSpec, profile: ThrottleProfile) -> Measurement:
+        samples: List[Dict[str, float]] = []
+        url, error = spec.path, None
+        try:
+            for _ in range(self.runs):
+                sample = await self.measure_once(browser, spec, profile)
+                url = sample["url"]
+                samples.append(sample["metrics"])
+        except (async_api.Error, LookupError, RedirectedError) as exc:
+            error = str(exc).splitlines()[0]
+        metrics = median_metrics(samples) if samples else {}
+        return Measurement(
+            page=spec.name,
+            profile=profile.name,
+            url=url,
+            runs=len(samples),
+            metrics=metrics,
+            samples=samples,
+            violations=check(metrics, self.config.thresholds(spec)) if metrics else [],
+            error=error,
+        )
+
+
+def build_label() -> str:
+    if os.environ.get("BUILD_ID"):
+        return os.environ["BUILD_ID"]
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def format_table(measurements: Sequence[Measurement]) -> str:
+    header = (
+        f"{'page':<22}  {'profile':<11}  {'ttfb':>6}  {'fcp':>6}  {'lcp':>6}  "
+        f"{'cls':>6}  {'tbt':>6}  {'heap':>6}  status"
+    )
+    lines = [header, "-" * len(header)]
+    for m in measurements:
+        v = m.metrics
+        status = "ok" if m.passed else (m.error or "; ".join(m.violations))
+        lines.append(
+            f"{m.page:<22}  {m.profile:<11}  {v.get('ttfb_ms', 0):>6.0f}  {v.get('fcp_ms', 0):>6.0f}  "
+            f"{v.get('lcp_ms', 0):>6.0f}  {v.get('cls', 0):>6.3f}  {v.get('tbt_ms', 0):>6.0f}  "
+            f"{v.get('heap_mb', 0):>6.1f}  {status}"
+        )
+    return "\n".join(lines)
+
+
+def write_results(measurements: Sequence[Measurement], build: str, directory: Path = VITALS_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    stamp = time.strftime("%Y%m%dT%H%M%S")
+    record = {
+        "build": build,
+        "timestamp": stamp,
+        "results": [{**asdict(m), "passed": m.passed} for m in measurements],
+    }
+    path = directory / f"{build}-{stamp}.json"
+    path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+    with (directory / "history.jsonl").open("a", encoding="utf-8") as history:
+        for m in measurements:
+            row = {"build": build, "timestamp": stamp, "page": m.page, "profile": m.profile, **m.metrics}
+            history.write(json.dumps(row) + "\n")
+    return path
+
+
+async def run_vitals(
+    config: VitalsConfig,
+    pages: Sequence[PageSpec],
+    profiles: Sequence[ThrottleProfile],
+    *,
+    runs: int = 1,
+    headless: bool = True,
+    params: Optional[Dict[str, str]] = None,
+) -> List[Measurement]:
+    runner = VitalsRunner(config, runs=runs, params=params)
+    results: List[Measurement] = []
+    async with async_api.async_playwright() as pw:
+        browser = await launch(pw, "chromium", headless)
+        try:
+            # Sequential on purpose: concurrent loads would compete for the
+            # CPU the throttling profile is trying to model.
+            for profile in profiles:
+                for spec in pages:
+                    results.append(await runner.measure(browser, spec, profile))
+        finally:
+            await browser.close()
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.vitals",
+        description="Collect web vitals for key pages under CPU/network throttling.",
+    )
+    parser.add_argument("pages", nargs="*", help="page names from the config (default: all)")
+    parser.add_argument("--config", type=Path, default=DEFAULT_PAGES)
+    parser.add_argument("-p", "--profile", action="append", default=[], help="throttling profile (repeatable)")
+    parser.add_argument("--runs", type=int, default=1, help="loads per page; the median is reported")
+    parser.add_argument("--param", action="append", default=[], metavar="KEY=VALUE", help="path placeholder value")
+    parser.add_argument("--build", default=None, help="label stored with the results (default: $BUILD_ID or git rev)")
+    parser.add_argument("--headed", action="store_true")
+    args = parser.parse_args(argv)
+
+    config = VitalsConfig.load(args.config)
+    pages = [p for p in config.pages if not args.pages or p.name in args.pages]
+    if not pages:
+        print("No pages matched.", file=sys.stderr)
+        return 2
+    try:
+        profiles = [config.profiles[name] for name in args.profile or ["none"]]
+    except KeyError as exc:
+        parser.error(f"unknown profile {exc.args[0]!r}; choose from {', '.join(config.profiles)}")
+    params = dict(p.split("=", 1) for p in args.param)
+
+    measurements = asyncio.run(
+        run_vitals(config, pages, profiles, runs=args.runs, headless=not args.headed, params=params)
+    )
+    print(format_table(measurements))
+    path = write_results(measurements, args.build or build_label())
+    print(f"Results written to {path}")
+    return 0 if all(m.passed for m in measurements) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
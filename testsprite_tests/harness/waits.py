@@ -0,0 +1,440 @@
+"""Event-driven waits to replace the fixed sleeps in the generated scripts.
+
+The generated scenarios pause with ``asyncio.sleep(3)`` /
+``page.wait_for_timeout(3000)`` before nearly every action and with a
+trailing ``asyncio.sleep(5)``.  The helpers here wait for something that
+actually signals readiness instead:
+
+* ``wait_for_network_idle`` - DOM loaded and no requests for 500 ms
+* ``wait_for_api`` / ``expect_api`` - a specific ``/api/*`` response
+* ``wait_for_visible`` - a locator becoming visible
+* ``wait_for_url_change`` - navigation away from (or to) a URL
+
+Timeouts left as ``None`` are picked by ``AdaptiveTimeouts`` from the
+durations observed on previous runs.
+
+``EventWaits`` is a runner plugin that applies ``settle`` to the existing
+scripts unmodified: each fixed sleep becomes "wait until no request has
+been in flight for 500 ms, but never longer than the sleep asked for", and the time saved per test is
+recorded in the report::
+
+    python -m harness.runner --event-waits --report tmp/after.json
+    python -m harness.waits tmp/after.json              # saved time per test
+    python -m harness.waits tmp/before.json tmp/after.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Pattern, Sequence, Set, Union
+from urllib.parse import urlparse
+
+from playwright import async_api
+from playwright.async_api import BrowserContext, Locator, Page, Request, Response
+
+from .runner import RunnerPlugin, ScenarioResult, SuiteReport
+from .scenarios import TESTS_DIR, Scenario
+
+DEFAULT_TIMINGS = TESTS_DIR / "tmp" / "wait_timings.json"
+
+
+class AdaptiveTimeouts:
+    """Per-kind timeouts derived from previously observed wait durations.
+
+    Until ``min_samples`` observations exist the caller's default is used;
+    afterwards the timeout is ``factor`` times the observed p95, clamped to
+    ``[floor, ceiling]`` milliseconds.
+    """
+
+    def __init__(
+        self,
+        path: Optional[Path] = DEFAULT_TIMINGS,
+        *,
+        floor: float = 1_000,
+        ceiling: float = 30_000,
+        factor: float = 2.0,
+        window: int = 200,
+        min_samples: int = 5,
+    ):
+        self.path = path
+        self.floor = floor
+        self.ceiling = ceiling
+        self.factor = factor
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[str, List[float]] = {}
+        if path is not None and path.exists():
+            try:
+                self._samples = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._samples = {}
+
+    def observe(self, kind: str, elapsed_ms: float) -> None:
+        samples = self._samples.setdefault(kind, [])
+        samples.append(round(elapsed_ms, 1))
+        del samples[: -self.window]
+
+    def timeout(self, kind: str, default: float) -> float:
+        samples = self._samples.get(kind, [])
+        if len(samples) < self.min_samples:
+            return default
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return max(self.floor, min(self.ceiling, p95 * self.factor))
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self._samples, indent=2), encoding="utf-8")
+
+
+ADAPTIVE = AdaptiveTimeouts()
+
+
+class _Timer:
+    def __init__(self, kind: str, adaptive: AdaptiveTimeouts):
+        self.kind = kind
+        self.adaptive = adaptive
+
+    def __enter__(self) -> "_Timer":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, *_: Any) -> None:
+        # Only successful waits say anything about how long readiness takes.
+        if exc_type is None:
+            self.adaptive.observe(self.kind, (time.perf_counter() - self.started) * 1000)
+
+
+def _response_matcher(path: str, method: Optional[str], status: Optional[int]):
+    def matches(response: Response) -> bool:
+        if not fnmatch(urlparse(response.url).path, path):
+            return False
+        if method and response.request.method != method.upper():
+            return False
+        return status is None or response.status == status
+
+    return matches
+
+
+async def wait_for_network_idle(
+    page: Page,
+    timeout: Optional[float] = None,
+    *,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+) -> None:
+    timeout = adaptive.timeout("networkidle", 10_000) if timeout is None else timeout
+    with _Timer("networkidle", adaptive):
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        await page.wait_for_load_state("networkidle", timeout=timeout)
+
+
+async def wait_for_api(
+    page: Page,
+    path: str,
+    *,
+    method: Optional[str] = None,
+    status: Optional[int] = None,
+    timeout: Optional[float] = None,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+) -> Response:
+    """Wait for the next response whose URL path matches ``path`` (a glob).
+
+    Prefer ``expect_api`` when the request is triggered by an action you
+    are about to perform, so the response cannot slip past before waiting.
+    """
+    kind = f"api {method or '*'} {path}"
+    timeout = adaptive.timeout(kind, 10_000) if timeout is None else timeout
+    with _Timer(kind, adaptive):
+        return await page.wait_for_event(
+            "response",
+            predicate=_response_matcher(path, method, status),
+            timeout=timeout,
+        )
+
+
+def expect_api(
+    page: Page,
+    path: str,
+    *,
+    method: Optional[str] = None,
+    status: Optional[int] = None,
+    timeout: Optional[float] = None,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+):
+    """Context manager form of ``wait_for_api``::
+
+        async with expect_api(page, "/api/bookings", method="POST") as info:
+            await page.click("text=Book")
+        response = await info.value
+    """
+    kind = f"api {method or '*'} {path}"
+    timeout = adaptive.timeout(kind, 10_000) if timeout is None else timeout
+    return page.expect_response(_response_matcher(path, method, status), timeout=timeout)
+
+
+async def wait_for_visible(
+    locator: Locator,
+    timeout: Optional[float] = None,
+    *,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+) -> None:
+    timeout = adaptive.timeout("visible", 10_000) if timeout is None else timeout
+    with _Timer("visible", adaptive):
+        await locator.first.wait_for(state="visible", timeout=timeout)
+
+
+async def wait_for_url_change(
+    page: Page,
+    previous: Optional[str] = None,
+    *,
+    pattern: Union[str, Pattern[str], None] = None,
+    timeout: Optional[float] = None,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+) -> str:
+    """Wait until the URL differs from ``previous`` (default: current URL),
+    or until it matches ``pattern`` if one is given. Returns the new URL."""
+    timeout = adaptive.timeout("url", 10_000) if timeout is None else timeout
+    previous = page.url if previous is None else previous
+    target = pattern if pattern is not None else (lambda url: url != previous)
+    with _Timer("url", adaptive):
+        await page.wait_for_url(target, timeout=timeout, wait_until="commit")
+    return page.url
+
+
+class InFlight:
+    """Requests a context has started but not yet finished or failed.
+
+    ``networkidle`` only describes the initial load; the fetches a page
+    makes after it (form submits, client-side navigation) never reset it.
+    Counting ``request`` against ``requestfinished``/``requestfailed`` on
+    the context covers every page and popup it opens.
+    """
+
+    def __init__(self, context: BrowserContext, *, quiet_ms: float = 500):
+        self.quiet_ms = quiet_ms
+        self._pending: Set[Request] = set()
+        self._changed = asyncio.Event()
+        self._last_change = time.perf_counter()
+        context.on("request", self._started)
+        context.on("requestfinished", self._ended)
+        context.on("requestfailed", self._ended)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _started(self, request: Request) -> None:
+        self._pending.add(request)
+        self._touch()
+
+    def _ended(self, request: Request) -> None:
+        self._pending.discard(request)
+        self._touch()
+
+    def _touch(self) -> None:
+        self._last_change = time.perf_counter()
+        self._changed.set()
+
+    async def quiet(self, timeout: float) -> None:
+        """Wait until nothing has been in flight for ``quiet_ms``.
+
+        Raises ``asyncio.TimeoutError`` after ``timeout`` ms.
+        """
+
+        async def zero_for_window() -> None:
+            while True:
+                self._changed.clear()
+                if self._pending:
+                    await self._changed.wait()
+                    continue
+                remaining = self.quiet_ms / 1000 - (time.perf_counter() - self._last_change)
+                if remaining <= 0:
+                    return
+                try:
+                    await asyncio.wait_for(self._changed.wait(), remaining)
+                except asyncio.TimeoutError:
+                    return
+
+        await asyncio.wait_for(zero_for_window(), timeout / 1000)
+
+
+async def settle(
+    page: Page,
+    budget: float,
+    *,
+    inflight: Optional[InFlight] = None,
+    adaptive: AdaptiveTimeouts = ADAPTIVE,
+) -> float:
+    """Wait for ``page`` to settle, for at most ``budget`` ms.
+
+    With ``inflight`` (tracked on the page's context) the page has settled
+    once no request has been outstanding for its quiet window; without it
+    this falls back to the ``networkidle`` load state.  ``budget`` caps the
+    adaptive timeout rather than replacing it, so this is the drop-in for
+    a fixed sleep: never slower than the sleep it replaces, and no slower
+    than readiness has taken on previous runs. Returns the milliseconds
+    actually waited.
+    """
+    started = time.perf_counter()
+    try:
+        if inflight is None:
+            timeout = min(budget, adaptive.timeout("networkidle", 10_000))
+            await wait_for_network_idle(page, timeout=timeout, adaptive=adaptive)
+        else:
+            timeout = min(budget, adaptive.timeout("settle", 10_000))
+            with _Timer("settle", adaptive):
+                await inflight.quiet(timeout)
+    except (async_api.Error, asyncio.TimeoutError):
+        pass
+    return (time.perf_counter() - started) * 1000
+
+
+@dataclass
+class WaitStats:
+    count: int = 0
+    requested: float = 0.0
+    waited: float = 0.0
+
+    @property
+    def saved(self) -> float:
+        return max(0.0, self.requested - self.waited)
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["saved"] = self.saved
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in data.items()}
+
+
+class _AsyncioProxy:
+    """``asyncio`` as seen by a scenario, with ``sleep`` redirected."""
+
+    def __init__(self, sleep: Any):
+        self.sleep = sleep
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(asyncio, name)
+
+
+class EventWaits(RunnerPlugin):
+    """Turn the scripts' fixed sleeps into bounded ``settle`` calls."""
+
+    def __init__(self, adaptive: AdaptiveTimeouts = ADAPTIVE):
+        self.adaptive = adaptive
+        self._pages: Dict[str, List[Page]] = {}
+        self._inflight: Dict[str, InFlight] = {}
+        self._stats: Dict[str, WaitStats] = {}
+
+    def _current_page(self, scenario: Scenario) -> Optional[Page]:
+        for page in reversed(self._pages.get(scenario.name, [])):
+            if not page.is_closed():
+                return page
+        return None
+
+    async def _wait(self, scenario: Scenario, page: Optional[Page], budget_ms: float) -> None:
+        stats = self._stats.setdefault(scenario.name, WaitStats())
+        stats.count += 1
+        stats.requested += budget_ms / 1000
+        started = time.perf_counter()
+        if page is None or page.is_closed():
+            await asyncio.sleep(budget_ms / 1000)
+        else:
+            inflight = self._inflight.get(scenario.name)
+            await settle(page, budget_ms, inflight=inflight, adaptive=self.adaptive)
+        stats.waited += time.perf_counter() - started
+
+    async def namespace(self, scenario: Scenario) -> Dict[str, Any]:
+        async def sleep(delay: float, result: Any = None) -> Any:
+            await self._wait(scenario, self._current_page(scenario), delay * 1000)
+            return result
+
+        return {"asyncio": _AsyncioProxy(sleep)}
+
+    async def on_context(self, scenario: Scenario, context: BrowserContext) -> None:
+        pages = self._pages.setdefault(scenario.name, [])
+        self._inflight[scenario.name] = InFlight(context)
+
+        def track(page: Page) -> None:
+            pages.append(page)
+
+            async def wait_for_timeout(timeout: float) -> None:
+                await self._wait(scenario, page, timeout)
+
+            page.wait_for_timeout = wait_for_timeout  # type: ignore[method-assign]
+
+        context.on("page", track)
+
+    async def on_result(self, scenario: Scenario, result: ScenarioResult) -> None:
+        self._pages.pop(scenario.name, None)
+        self._inflight.pop(scenario.name, None)
+        result.extras["waits"] = self._stats.pop(scenario.name, WaitStats()).as_dict()
+
+    async def on_suite_end(self, report: SuiteReport) -> None:
+        self.adaptive.save()
+
+
+def _load_results(path: Path) -> Dict[str, Dict[str, Any]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    return {r["name"]: r for r in data["results"]}
+
+
+def format_savings(after: Path, before: Optional[Path] = None) -> str:
+    """Per-test timing table.
+
+    With one report, shows fixed-sleep time requested vs. actually waited.
+    With two, compares scenario durations between the runs.
+    """
+    current = _load_results(after)
+    width = max([len(n) for n in current] + [8])
+    rows: List[str] = []
+    total_before = total_after = 0.0
+    if before is None:
+        rows.append(f"{'scenario':<{width}}  {'fixed s':>8}  {'waited s':>8}  {'saved s':>8}")
+        for name in sorted(current):
+            waits = current[name].get("extras", {}).get("waits")
+            if not waits:
+                continue
+            total_before += waits["requested"]
+            total_after += waits["waited"]
+            rows.append(
+                f"{name:<{width}}  {waits['requested']:>8.2f}  {waits['waited']:>8.2f}  {waits['saved']:>8.2f}"
+            )
+    else:
+        previous = _load_results(before)
+        rows.append(f"{'scenario':<{width}}  {'before s':>8}  {'after s':>8}  {'saved s':>8}")
+        for name in sorted(set(current) & set(previous)):
+            b, a = previous[name]["duration"], current[name]["duration"]
+            total_before += b
+            total_after += a
+            rows.append(f"{name:<{width}}  {b:>8.2f}  {a:>8.2f}  {b - a:>8.2f}")
+    rows.insert(1, "-" * len(rows[0]))
+    rows.append("-" * len(rows[0]))
+    rows.append(
+        f"{'total':<{width}}  {total_before:>8.2f}  {total_after:>8.2f}  {total_before - total_after:>8.2f}"
+    )
+    return "\n".join(rows)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.waits",
+        description="Show time saved by event-driven waits.",
+    )
+    parser.add_argument("reports", nargs="+", type=Path, help="[before.json] after.json")
+    args = parser.parse_args(argv)
+    if len(args.reports) > 2:
+        parser.error("expected one or two reports")
+    before = args.reports[0] if len(args.reports) == 2 else None
+    print(format_savings(args.reports[-1], before))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
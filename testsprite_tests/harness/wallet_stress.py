@@ -0,0 +1,525 @@
+"""Concurrency stress for teacher wallet credits and withdrawals.
+
+``WalletService.creditWallet`` and ``approveWithdrawal`` read the wallet,
+change ``balance`` in JavaScript and ``save()`` it inside a session, so
+two writers on one wallet can lose an update or abort on a write
+conflict.  This tool fires a mix of concurrent operations at a handful of
+teachers, so every wallet sees heavy contention:
+
+* ``credit``   - ``POST /api/payments/success/:tran_id`` for a ``PENDING``
+  Payment inserted straight into MongoDB.  ``/api/wallet`` has no credit
+  route; the gateway callback is the only HTTP path to ``creditWallet``.
+  ``--replay`` re-sends a fraction of already used ``tran_id``s, as a
+  duplicated gateway redirect would.
+* ``withdraw`` - ``POST /api/wallet/withdraw`` as the teacher.
+* ``approve``  - ``PUT /api/wallet/admin/withdrawals/:id/approve`` as the
+  admin; ``--double-approve`` sends a fraction of them twice at once.
+
+Write conflicts of withdrawals and approvals (5xx mentioning
+``WriteConflict`` or a transient transaction error) are retried up to
+``--retries`` times.  Credits are sent once: ``handleSuccess`` swallows
+every ``creditWallet`` error and the callback always answers 302, so a
+conflict never reaches the client.  Credit failures are instead counted
+from the ``wallet-credit-failed`` events this run adds to the backend's
+payment log (``--payment-log``).  Afterwards MongoDB is checked directly:
+
+* every wallet's ``balance`` equals its completed ``CREDIT`` ``netAmount``
+  minus its completed ``WITHDRAWAL`` amounts (the service stores
+  withdrawals with a positive ``netAmount``), and ``totalEarned`` /
+  ``totalWithdrawn`` agree with the same ledger;
+* every successful Payment has exactly one ``CREDIT`` (``creditWallet``
+  errors are swallowed by the callback, so a lost credit shows up only
+  here and as ``wallet-credit-failed`` in the payment log);
+* no teacher holds more than one ``PENDING`` withdrawal.
+
+Transaction aborts come from the ``serverStatus`` counters, so the
+server has to be a replica set (transactions are rejected on a
+standalone ``mongod``)::
+
+    python -m harness.wallet_stress --uri mongodb://localhost:27017/educonnect?replicaSet=rs0 \\
+        --teachers 3 --ops 600 -c 64
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from collections import Counter
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from bson import ObjectId
+from pymongo import MongoClient
+from pymongo.database import Database
+from pymongo.errors import OperationFailure
+
+from .api_client import ApiClient, ApiResponse
+from .config import credentials
+from .loadgen import Account, World, register
+from .metrics import LatencyRecorder
+from .scenarios import TESTS_DIR
+
+DEFAULT_OUTPUT = TESTS_DIR / "tmp" / "wallet_stress.json"
+DEFAULT_PAYMENT_LOG = TESTS_DIR.parent / "backend" / "logs" / "payment-callbacks.log"
+DEFAULT_MIX = {"credit": 0.6, "withdraw": 0.25, "approve": 0.15}
+PRICES = (300, 500, 800, 1200)
+CENT = 0.005  # amounts are rounded to 2 decimals by the service
+
+_TRANSIENT = re.compile(r"WriteConflict|TransientTransactionError|Write conflict|Please retry", re.I)
+
+
+@dataclass
+class OpStats:
+    attempts: int = 0
+    ok: int = 0
+    rejected: int = 0  # 4xx or a business-rule 5xx, not retried
+    failed: int = 0  # transient errors left after the last retry
+    retries: int = 0
+    conflicts: int = 0  # write conflicts seen (credits: from the payment log)
+    skipped: int = 0
+
+
+@dataclass
+class WalletCheck:
+    teacher: str
+    balance: float
+    ledger: float
+    total_earned: float
+    credited: float
+    total_withdrawn: float
+    withdrawn: float
+    pending_withdrawals: int
+
+    @property
+    def violations(self) -> List[str]:
+        out = []
+        if abs(self.balance - self.ledger) > CENT:
+            out.append(f"balance {self.balance:.2f} != ledger {self.ledger:.2f}")
+        if abs(self.total_earned - self.credited) > CENT:
+            out.append(f"totalEarned {self.total_earned:.2f} != credits {self.credited:.2f}")
+        if abs(self.total_withdrawn - self.withdrawn) > CENT:
+            out.append(f"totalWithdrawn {self.total_withdrawn:.2f} != withdrawals {self.withdrawn:.2f}")
+        if self.pending_withdrawals > 1:
+            out.append(f"{self.pending_withdrawals} pending withdrawals")
+        return out
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """``credit=0.6,withdraw=0.3,approve=0.1`` -> weights by operation."""
+    mix = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"unknown operation {name!r}; known: {', '.join(DEFAULT_MIX)}")
+        mix[name] = float(weight or 1)
+    return mix or dict(DEFAULT_MIX)
+
+
+def transaction_counters(db: Database) -> Optional[Dict[str, int]]:
+    """``serverStatus().transactions`` counters, or None without the privilege."""
+    try:
+        status = db.client.admin.command("serverStatus")
+    except OperationFailure:
+        return None
+    tx = status.get("transactions", {})
+    keys = ("totalStarted", "totalCommitted", "totalAborted", "retriedCommandsCount", "retriedStatementsCount")
+    return {k: int(tx.get(k, 0)) for k in keys}
+
+
+class WalletStress:
+    def __init__(
+        self,
+        client: ApiClient,
+        db: Database,
+        teachers: Sequence[Account],
+        admin_token: str,
+        rng: random.Random,
+        *,
+        retries: int = 3,
+        replay: float = 0.0,
+        double_approve: float = 0.0,
+    ):
+        self.client = client
+        self.db = db
+        self.teachers = list(teachers)
+        self.admin_token = admin_token
+        self.rng = rng
+        self.retries = retries
+        self.replay = replay
+        self.double_approve = double_approve
+        self.run_id = uuid.uuid4().hex[:8]
+        self.stats: Dict[str, OpStats] = {name: OpStats() for name in DEFAULT_MIX}
+        self.pending: "asyncio.Queue[str]" = asyncio.Queue()
+        self.tran_ids: List[str] = []
+        self._unused: List[str] = []
+        self._used: List[str] = []
+
+    def prepare_payments(self, count: int) -> None:
+        """Insert ``count`` PENDING payments spread over the teachers."""
+        now = datetime.now(timezone.utc)
+        docs = []
+        for n in range(count):
+            teacher = self.teachers[n % len(self.teachers)]
+            tran_id = f"stress-{self.run_id}-{n}"
+            docs.append(
+                {
+                    "gigId": ObjectId(),
+                    "studentId": ObjectId(),
+                    "teacherId": ObjectId(teacher.user_id),
+                    "amount": self.rng.choice(PRICES),
+                    "status": "PENDING",
+                    "transactionId": tran_id,
+                    "statusHistory": [{"status": "PENDING", "at": now}],
+                    "createdAt": now,
+                    "updatedAt": now,
+                    "__v": 0,
+                }
+            )
+            self.tran_ids.append(tran_id)
+        if docs:
+            self.db.payments.insert_many(docs, ordered=False)
+        self._unused = list(self.tran_ids)
+        self.rng.shuffle(self._unused)
+
+    async def _send(  # type: ignore[no-untyped-def]
+        self, kind: str, call, retries: Optional[int] = None
+    ) -> Optional[ApiResponse]:
+        stats = self.stats[kind]
+        stats.attempts += 1
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            resp = await call()
+            message = str((resp.body or {}).get("message", "")) if isinstance(resp.body, dict) else ""
+            transient = resp.status == 0 or (resp.status >= 500 and bool(_TRANSIENT.search(message)))
+            if resp.status and resp.status < 400:
+                stats.ok += 1
+                return resp
+            if not transient:
+                stats.rejected += 1
+                return resp
+            stats.conflicts += resp.status != 0
+            if attempt < retries:
+                stats.retries += 1
+                await asyncio.sleep(0.01 * 2**attempt * (1 + self.rng.random()))
+        stats.failed += 1
+        return None
+
+    async def credit(self) -> None:
+        if self._used and self.rng.random() < self.replay:
+            tran_id = self.rng.choice(self._used)
+        elif self._unused:
+            tran_id = self._unused.pop()
+            self._used.append(tran_id)
+        else:
+            self.stats["credit"].skipped += 1
+            return
+        path = f"/api/payments/success/{tran_id}"
+        # The callback redirects to the frontend whatever creditWallet did,
+        # so there is nothing to retry on; see credit_failures().
+        await self._send(
+            "credit",
+            lambda: self.client.post(path, allow_redirects=False, name="POST /api/payments/success/:tran_id"),
+            retries=0,
+        )
+
+    def credit_failures(self, log: Path, offset: int) -> Optional[Dict[str, int]]:
+        """``wallet-credit-failed`` events of this run in the payment log after ``offset``."""
+        try:
+            with log.open("rb") as fh:
+                fh.seek(offset)
+                lines = fh.read().decode("utf-8", "replace").splitlines()
+        except OSError:
+            return None
+        prefix = f"stress-{self.run_id}-"
+        failed = conflicts = 0
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            payload = entry.get("payload") or {}
+            if entry.get("event") != "wallet-credit-failed" or not str(payload.get("tran_id", "")).startswith(prefix):
+                continue
+            failed += 1
+            conflicts += bool(_TRANSIENT.search(str(payload.get("error", ""))))
+        self.stats["credit"].conflicts = conflicts
+        return {"failed": failed, "conflicts": conflicts}
+
+    async def withdraw(self) -> None:
+        teacher = self.rng.choice(self.teachers)
+        body = {
+            "amount": self.rng.choice([10, 25, 50, 100]),
+            "withdrawalMethod": "MOBILE_BANKING",
+            "withdrawalDetails": {"mobileNumber": "01700000000"},
+        }
+        resp = await self._send(
+            "withdraw", lambda: self.client.post("/api/wallet/withdraw", token=teacher.token, json=body)
+        )
+        if resp is not None and resp.status == 201:
+            self.pending.put_nowait(str(resp.data["_id"]))
+
+    async def approve(self) -> None:
+        try:
+            transaction_id = self.pending.get_nowait()
+        except asyncio.QueueEmpty:
+            self.stats["approve"].skipped += 1
+            return
+        path = f"/api/wallet/admin/withdrawals/{transaction_id}/approve"
+        copies = 2 if self.rng.random() < self.double_approve else 1
+        await asyncio.gather(
+            *(self._send("approve", lambda: self.client.put(path, token=self.admin_token)) for _ in range(copies))
+        )
+
+    def verify(self) -> Dict[str, Any]:
+        teacher_ids = [ObjectId(t.user_id) for t in self.teachers]
+        ledger: Dict[ObjectId, Dict[str, float]] = {t: Counter() for t in teacher_ids}
+        for row in self.db.wallettransactions.aggregate(
+            [
+                {"$match": {"teacher": {"$in": teacher_ids}}},
+                {
+                    "$group": {
+                        "_id": {"teacher": "$teacher", "type": "$type", "status": "$status"},
+                        "net": {"$sum": "$netAmount"},
+                        "amount": {"$sum": "$amount"},
+                        "count": {"$sum": 1},
+                    }
+                },
+            ]
+        ):
+            key, sums = row["_id"], ledger[row["_id"]["teacher"]]
+            if key["status"] == "COMPLETED":
+                if key["type"] == "CREDIT":
+                    sums["credited"] += row["net"]
+                else:
+                    sums["withdrawn"] += row["amount"]
+            elif key["status"] == "PENDING" and key["type"] == "WITHDRAWAL":
+                sums["pending"] += row["count"]
+
+        wallets = {w["teacher"]: w for w in self.db.wallets.find({"teacher": {"$in": teacher_ids}})}
+        checks = []
+        for teacher in teacher_ids:
+            wallet, sums = wallets.get(teacher, {}), ledger[teacher]
+            checks.append(
+                WalletCheck(
+                    teacher=str(teacher),
+                    balance=float(wallet.get("balance", 0)),
+                    ledger=round(sums["credited"] - sums["withdrawn"], 2),
+                    total_earned=float(wallet.get("totalEarned", 0)),
+                    credited=round(sums["credited"], 2),
+                    total_withdrawn=float(wallet.get("totalWithdrawn", 0)),
+                    withdrawn=round(sums["withdrawn"], 2),
+                    pending_withdrawals=int(sums["pending"]),
+                )
+            )
+
+        succeeded = [
+            p["_id"]
+            for p in self.db.payments.find({"transactionId": {"$in": self.tran_ids}, "status": "SUCCESS"}, {"_id": 1})
+        ]
+        per_payment = Counter(
+            t["payment"]
+            for t in self.db.wallettransactions.find({"payment": {"$in": succeeded}, "type": "CREDIT"}, {"payment": 1})
+        )
+        return {
+            "wallets": [{**asdict(c), "violations": c.violations} for c in checks],
+            "payments_succeeded": len(succeeded),
+            "lost_credits": sum(1 for p in succeeded if per_payment[p] == 0),
+            "double_credits": sum(1 for p in succeeded if per_payment[p] > 1),
+        }
+
+
+def _delta(before: Optional[Dict[str, int]], after: Optional[Dict[str, int]]) -> Optional[Dict[str, Any]]:
+    if before is None or after is None:
+        return None
+    delta: Dict[str, Any] = {k: after[k] - before[k] for k in after}
+    started = delta["totalStarted"]
+    delta["abort_rate"] = delta["totalAborted"] / started if started else 0.0
+    return delta
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        f"{'operation':<10}  {'attempts':>8}  {'ok':>6}  {'rejected':>8}  {'failed':>6}  "
+        f"{'retries':>7}  {'conflicts':>9}  {'skipped':>7}  {'ops/s':>7}"
+    ]
+    lines.append("-" * len(lines[0]))
+    elapsed = report["elapsed_s"] or 1.0
+    for name, s in report["operations"].items():
+        retried = "-" if name == "credit" else s["retries"]  # sent once, see module docstring
+        lines.append(
+            f"{name:<10}  {s['attempts']:>8}  {s['ok']:>6}  {s['rejected']:>8}  {s['failed']:>6}  "
+            f"{retried:>7}  {s['conflicts']:>9}  {s['skipped']:>7}  {s['attempts'] / elapsed:>7.1f}"
+        )
+    attempts = sum(s["attempts"] for s in report["operations"].values())
+    retryable_ops = [s for k, s in report["operations"].items() if k != "credit"]
+    retryable = sum(s["attempts"] for s in retryable_ops)
+    retries = sum(s["retries"] for s in retryable_ops)
+    lines.append(
+        f"throughput {attempts / elapsed:.1f} ops/s over {elapsed:.1f}s, "
+        f"retry rate {retries / retryable if retryable else 0.0:.1%} (withdraw/approve; credits are not retried)"
+    )
+    credits = report["credit_failures"]
+    if credits is None:
+        lines.append("credits: payment log not readable; creditWallet failures unknown (see lost credits)")
+    else:
+        lines.append(
+            f"credits: {credits['failed']} wallet-credit-failed in the payment log "
+            f"({credits['conflicts']} write conflicts)"
+        )
+    tx = report["transactions"]
+    if tx is None:
+        lines.append("transactions: serverStatus not permitted; abort rate unknown")
+    else:
+        lines.append(
+            f"transactions: {tx['totalStarted']} started, {tx['totalCommitted']} committed, "
+            f"{tx['totalAborted']} aborted ({tx['abort_rate']:.1%})"
+        )
+    check = report["invariants"]
+    lines.append(
+        f"payments: {check['payments_succeeded']} succeeded, {check['lost_credits']} without a credit, "
+        f"{check['double_credits']} credited more than once"
+    )
+    for wallet in check["wallets"]:
+        state = "; ".join(wallet["violations"]) or "ok"
+        lines.append(f"wallet {wallet['teacher']}: balance {wallet['balance']:.2f}  {state}")
+    return "\n".join(lines)
+
+
+async def run_stress(
+    db: Database,
+    *,
+    teachers: int = 3,
+    ops: int = 500,
+    concurrency: int = 32,
+    mix: Optional[Dict[str, float]] = None,
+    retries: int = 3,
+    replay: float = 0.0,
+    double_approve: float = 0.0,
+    seed: Optional[int] = None,
+    payment_log: Path = DEFAULT_PAYMENT_LOG,
+) -> Dict[str, Any]:
+    mix = mix or dict(DEFAULT_MIX)
+    rng = random.Random(seed)
+    recorder = LatencyRecorder()
+    async with ApiClient(recorder, connections=concurrency) as client:
+        world = World(run_id=uuid.uuid4().hex[:6])
+        accounts = [a for a in [await register(client, world, "teacher") for _ in range(teachers)] if a]
+        if not accounts:
+            raise RuntimeError("could not register stress teachers; is the backend reachable?")
+        email, password = credentials("admin")
+        login = await client.post("/api/auth/login", json={"email": email, "password": password})
+        if login.status != 200:
+            raise RuntimeError(f"admin login as {email} failed with HTTP {login.status}")
+
+        stress = WalletStress(
+            client,
+            db,
+            accounts,
+            login.body["token"],
+            rng,
+            retries=retries,
+            replay=replay,
+            double_approve=double_approve,
+        )
+        kinds, weights = zip(*mix.items())
+        plan = rng.choices(kinds, weights, k=ops)
+        stress.prepare_payments(plan.count("credit"))
+
+        gate = asyncio.Semaphore(concurrency)
+
+        async def one(kind: str) -> None:
+            async with gate:
+                await getattr(stress, kind)()
+
+        before = transaction_counters(db)
+        log_offset = payment_log.stat().st_size if payment_log.exists() else 0
+        started = time.perf_counter()
+        recorder.started = started
+        await asyncio.gather(*(one(kind) for kind in plan))
+        elapsed = time.perf_counter() - started
+        after = transaction_counters(db)
+        credit_failures = stress.credit_failures(payment_log, log_offset)
+
+    return {
+        "teachers": [a.user_id for a in accounts],
+        "ops": ops,
+        "concurrency": concurrency,
+        "elapsed_s": elapsed,
+        "operations": {name: asdict(s) for name, s in stress.stats.items()},
+        "latency": recorder.summary(elapsed),
+        "transactions": _delta(before, after),
+        "credit_failures": credit_failures,
+        "invariants": stress.verify(),
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m harness.wallet_stress",
+        description="Hammer wallet credits, withdrawals and approvals and check the ledger.",
+    )
+    parser.add_argument(
+        "--uri",
+        default=os.environ.get("MONGODB_URI", "mongodb://localhost:27017/educonnect?replicaSet=rs0"),
+        help="connection string of the backend's database (must be a replica set)",
+    )
+    parser.add_argument("--teachers", type=int, default=3, help="wallets to spread the load over")
+    parser.add_argument("--ops", type=int, default=500)
+    parser.add_argument("-c", "--concurrency", type=int, default=32)
+    parser.add_argument("--mix", type=parse_mix, default=dict(DEFAULT_MIX), help="e.g. credit=0.6,withdraw=0.4")
+    parser.add_argument("--retries", type=int, default=3, help="retries per write conflict")
+    parser.add_argument("--replay", type=float, default=0.0, help="fraction of credits re-sending a used tran_id")
+    parser.add_argument("--double-approve", type=float, default=0.0, help="fraction of approvals sent twice")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--payment-log",
+        type=Path,
+        default=DEFAULT_PAYMENT_LOG,
+        help="the backend's payment log, for creditWallet failures the callback hides",
+    )
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    args = parser.parse_args(argv)
+
+    mongo = MongoClient(args.uri)
+    try:
+        if not mongo.admin.command("hello").get("setName"):
+            print("wallet_stress needs a replica set; the backend's transactions fail on a standalone mongod")
+            return 2
+        report = asyncio.run(
+            run_stress(
+                mongo.get_default_database(),
+                teachers=args.teachers,
+                ops=args.ops,
+                concurrency=args.concurrency,
+                mix=args.mix,
+                retries=args.retries,
+                replay=args.replay,
+                double_approve=args.double_approve,
+                seed=args.seed,
+                payment_log=args.payment_log,
+            )
+        )
+    finally:
+        mongo.close()
+
+    print(format_report(report))
+    output: Path = args.output
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Report written to {output}")
+    check = report["invariants"]
+    broken = check["lost_credits"] or check["double_credits"] or any(w["violations"] for w in check["wallets"])
+    return 1 if broken else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())